@@ -4,17 +4,36 @@ Dependencies:
 - The graph runner can be replaced with `langgraph` if available. The backend
   already lists `langgraph` in `backend/requirements.txt`; ensure it is
   installed for production deployments.
+
+Nodes declare their dependencies and run as soon as those complete, so
+mission latency follows the critical path rather than the sum of all agent
+calls. Per-node defaults can be tuned with ``MISSION_NODE_TIMEOUT`` (seconds)
+and ``MISSION_NODE_RETRIES``. Agent calls are not idempotent (each one logs to
+the Pinkas and records history), so node retries default to 0; transient
+agent failures are retried per call with ``MISSION_AGENT_RETRIES`` instead.
 """
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+import time
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, List
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
 from app.agents.protocols import AgentRequest, AgentResponse
 from app.agents.registry import get_agent
 
+logger = logging.getLogger(__name__)
+
 StepHandler = Callable[["FlowContext"], Awaitable["FlowContext"]]
 
+MISSION_NODE_TIMEOUT = float(os.getenv("MISSION_NODE_TIMEOUT", "120"))
+MISSION_NODE_RETRIES = int(os.getenv("MISSION_NODE_RETRIES", "0"))
+MISSION_AGENT_RETRIES = int(os.getenv("MISSION_AGENT_RETRIES", "0"))
+MISSION_RETRY_BACKOFF = float(os.getenv("MISSION_RETRY_BACKOFF", "0.5"))
+
 
 @dataclass
 class FlowContext:
@@ -30,6 +49,8 @@ class FlowContext:
     final_message: str | None = None
     history: List[Dict[str, Any]] = field(default_factory=list)
     results: Dict[str, AgentResponse] = field(default_factory=dict)
+    # Per-node timings; kept out of ``history``, which is agent input.
+    timings: List[Dict[str, Any]] = field(default_factory=list)
 
 
 @dataclass
@@ -38,25 +59,133 @@ class GraphNode:
 
     name: str
     handler: StepHandler
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = MISSION_NODE_TIMEOUT
+    retries: int = MISSION_NODE_RETRIES
+    retry_backoff: float = MISSION_RETRY_BACKOFF
 
     async def __call__(self, context: FlowContext) -> FlowContext:  # pragma: no cover - thin wrapper
         return await self.handler(context)
 
 
 class SimpleMissionGraph:
-    """Minimal linear graph runner (can be swapped with LangGraph)."""
+    """Dependency-aware DAG runner (can be swapped with LangGraph).
+
+    Handlers share and mutate a single :class:`FlowContext`; nodes that run
+    concurrently must write to distinct fields.
+    """
 
     def __init__(self) -> None:
         self.nodes: List[GraphNode] = []
 
-    def add_node(self, name: str, handler: StepHandler) -> None:
-        self.nodes.append(GraphNode(name=name, handler=handler))
+    def add_node(
+        self,
+        name: str,
+        handler: StepHandler,
+        *,
+        depends_on: Optional[Sequence[str]] = None,
+        timeout: Optional[float] = MISSION_NODE_TIMEOUT,
+        retries: int = MISSION_NODE_RETRIES,
+    ) -> None:
+        """Register a node.
+
+        ``depends_on`` defaults to the previously added node, preserving linear
+        execution for callers that do not declare dependencies; pass ``()`` for
+        a root node. Dependencies must already be registered, which keeps the
+        graph acyclic.
+        """
+
+        known = {node.name for node in self.nodes}
+        if name in known:
+            raise ValueError(f"Duplicate graph node: {name}")
+        if depends_on is None:
+            depends_on = (self.nodes[-1].name,) if self.nodes else ()
+        missing = [dep for dep in depends_on if dep not in known]
+        if missing:
+            raise ValueError(f"Node {name} depends on unknown nodes: {missing}")
+        self.nodes.append(
+            GraphNode(
+                name=name,
+                handler=handler,
+                depends_on=tuple(depends_on),
+                timeout=timeout,
+                retries=max(0, retries),
+            )
+        )
 
     async def run(self, context: FlowContext) -> FlowContext:
-        for node in self.nodes:
-            context = await node(context)
+        pending = {node.name: node for node in self.nodes}
+        completed: set[str] = set()
+        running: Dict[asyncio.Task, str] = {}
+
+        while pending or running:
+            for name, node in list(pending.items()):
+                if all(dep in completed for dep in node.depends_on):
+                    running[asyncio.create_task(self._run_node(node, context))] = name
+                    del pending[name]
+
+            if not running:  # pragma: no cover - prevented by add_node validation
+                raise RuntimeError(f"Unschedulable graph nodes: {sorted(pending)}")
+
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                name = running.pop(task)
+                error = task.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+                    raise error
+                completed.add(name)
         return context
 
+    async def _run_node(self, node: GraphNode, context: FlowContext) -> None:
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await asyncio.wait_for(node(context), timeout=node.timeout)
+                break
+            except Exception as exc:
+                if attempt > node.retries:
+                    context.timings.append(
+                        _timing_entry(node, started_at, started, attempt, status="failed", error=exc)
+                    )
+                    raise
+                logger.warning(
+                    "Mission node %s failed (attempt %d/%d): %r",
+                    node.name,
+                    attempt,
+                    node.retries + 1,
+                    exc,
+                )
+                await asyncio.sleep(node.retry_backoff * 2 ** (attempt - 1))
+        context.timings.append(_timing_entry(node, started_at, started, attempt, status="ok"))
+
+
+def _timing_entry(
+    node: GraphNode,
+    started_at: datetime,
+    started: float,
+    attempts: int,
+    *,
+    status: str,
+    error: Exception | None = None,
+) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {
+        "stage": f"graph/{node.name}",
+        "node": node.name,
+        "status": status,
+        "attempts": attempts,
+        "started_at": started_at.isoformat(),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    if error is not None:
+        entry["error"] = repr(error)
+    return entry
+
 
 def _log_agent_interaction(agent_name: str, action: str, detail: str | None = None) -> None:
     agent = get_agent(agent_name)
@@ -71,19 +200,43 @@ def _log_agent_interaction(agent_name: str, action: str, detail: str | None = No
     )
 
 
-async def _call_agent(agent_name: str, context: FlowContext, payload: Any, stage: str) -> AgentResponse:
+async def _call_agent(
+    agent_name: str,
+    context: FlowContext,
+    payload: Any,
+    stage: str,
+    *,
+    retries: int = MISSION_AGENT_RETRIES,
+) -> AgentResponse:
     agent = get_agent(agent_name)
-    _log_agent_interaction(agent_name, "start", detail=f"stage={stage}")
-    response = await agent.run(
-        AgentRequest(
-            payload=payload,
-            metadata={
-                "user_id": context.user_id,
-                "mission_type": context.mission_type,
-                "stage": stage,
-            },
-        )
+    request = AgentRequest(
+        payload=payload,
+        metadata={
+            "user_id": context.user_id,
+            "mission_type": context.mission_type,
+            "stage": stage,
+        },
     )
+    _log_agent_interaction(agent_name, "start", detail=f"stage={stage}")
+    # Only the agent call is retried, so the Pinkas and history see it once.
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = await agent.run(request)
+            break
+        except Exception as exc:
+            if attempt > retries:
+                raise
+            logger.warning(
+                "Agent %s failed at %s (attempt %d/%d): %r",
+                agent_name,
+                stage,
+                attempt,
+                retries + 1,
+                exc,
+            )
+            await asyncio.sleep(MISSION_RETRY_BACKOFF * 2 ** (attempt - 1))
     _log_agent_interaction(agent_name, "complete", detail=f"stage={stage}")
     normalized_name = agent_name.lower()
     context.history.append({"stage": stage, "agent": normalized_name, "result": response.result})
@@ -91,12 +244,21 @@ async def _call_agent(agent_name: str, context: FlowContext, payload: Any, stage
     return response
 
 
+async def _gather_agents(*calls: Awaitable[AgentResponse]) -> List[AgentResponse]:
+    """Run agent calls concurrently; if one fails, cancel the others and re-raise it."""
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(call) for call in calls]
+    except BaseExceptionGroup as errors:
+        raise errors.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
 async def analyze_request(context: FlowContext) -> FlowContext:
-    strategist_response = await _call_agent(
-        "strategist", context, context.payload, stage="analyze_request/strategist"
-    )
-    scholar_response = await _call_agent(
-        "scholar", context, context.payload, stage="analyze_request/scholar"
+    strategist_response, scholar_response = await _gather_agents(
+        _call_agent("strategist", context, context.payload, stage="analyze_request/strategist"),
+        _call_agent("scholar", context, context.payload, stage="analyze_request/scholar"),
     )
     context.analysis = {
         "strategist": strategist_response.result,
@@ -106,11 +268,10 @@ async def analyze_request(context: FlowContext) -> FlowContext:
 
 
 async def plan_actions(context: FlowContext) -> FlowContext:
-    ceo_response = await _call_agent(
-        "chief_executive_officer", context, context.analysis or context.payload, stage="plan_actions/ceo"
-    )
-    cto_response = await _call_agent(
-        "chief_technology_officer", context, context.analysis or context.payload, stage="plan_actions/cto"
+    planning_input = context.analysis or context.payload
+    ceo_response, cto_response = await _gather_agents(
+        _call_agent("chief_executive_officer", context, planning_input, stage="plan_actions/ceo"),
+        _call_agent("chief_technology_officer", context, planning_input, stage="plan_actions/cto"),
     )
     context.plan = {
         "ceo": ceo_response.result,
@@ -155,10 +316,12 @@ async def finalize_message(context: FlowContext) -> FlowContext:
 
 def build_simple_graph() -> SimpleMissionGraph:
     graph = SimpleMissionGraph()
-    graph.add_node("analyze_request", analyze_request)
-    graph.add_node("plan_actions", plan_actions)
-    graph.add_node("execute_core_agent", execute_core_agent)
-    graph.add_node("finalize_message", finalize_message)
+    graph.add_node("analyze_request", analyze_request, depends_on=())
+    graph.add_node("plan_actions", plan_actions, depends_on=("analyze_request",))
+    graph.add_node(
+        "execute_core_agent", execute_core_agent, depends_on=("analyze_request", "plan_actions")
+    )
+    graph.add_node("finalize_message", finalize_message, depends_on=("execute_core_agent",))
     return graph
 
 
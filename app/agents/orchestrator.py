@@ -71,6 +71,7 @@ async def run_mission(task: MissionTask) -> Dict[str, Any]:
             "summary": summary,
             "data": {
                 "history": context.history,
+                "timings": context.timings,
                 "analysis": context.analysis,
                 "plan": context.plan,
                 "execution": context.execution,
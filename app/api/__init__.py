@@ -1,11 +1,14 @@
 """API router assembly for the core service."""
 from fastapi import APIRouter
 
-from app.api.routes import auth, commands, health, missions, pinkas, rag
+from app.api.routes import auth, commands, halacha, health, metrics, missions, moderation, pinkas, rag
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
 api_router.include_router(health.router)
+api_router.include_router(halacha.router)
+api_router.include_router(metrics.router)
+api_router.include_router(moderation.router)
 api_router.include_router(pinkas.router)
 api_router.include_router(commands.router)
 api_router.include_router(missions.router)
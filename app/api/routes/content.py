@@ -4,14 +4,15 @@ from __future__ import annotations
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from sqlalchemy.sql import Select
 
 from app.api.deps import get_db_session
 from app.models.content import ContentCategory, ContentItem
-from app.schemas.content import ContentCategoryRead, ContentItemRead
+from app.schemas.content import ContentCategoryRead, ContentItemRead, ContentSearchHit
+from app.services.hybrid_search import HybridRetriever, lexical_condition
 
 router = APIRouter(prefix="/content", tags=["content"])
 
@@ -41,16 +42,8 @@ def _apply_filters(
         stmt = stmt.where(ContentItem.is_active == is_active)
 
     if search:
-        pattern = f"%{search}%"
-        stmt = stmt.where(
-            or_(
-                ContentItem.body_he.ilike(pattern),
-                ContentItem.body_en.ilike(pattern),
-                ContentItem.title_he.ilike(pattern),
-                ContentItem.title_en.ilike(pattern),
-                ContentItem.source.ilike(pattern),
-            )
-        )
+        # Served by the trigram/full-text GIN indexes on the normalized columns.
+        stmt = stmt.where(lexical_condition(search))
 
     return stmt
 
@@ -90,6 +83,33 @@ async def list_content_items(
     return result.scalars().unique().all()
 
 
+@router.get("/search", response_model=List[ContentSearchHit])
+async def search_content(
+    *,
+    db: AsyncSession = Depends(get_db_session),
+    q: str = Query(..., min_length=1, description="Free-text query in Hebrew or English"),
+    category_slug: str | None = None,
+    collection: str = Query("torah", description="RAG collection used for the vector side"),
+    rerank: bool = Query(False, description="Rerank fused candidates with a local cross-encoder"),
+    limit: int = Query(10, ge=1, le=50),
+) -> List[ContentSearchHit]:
+    """Hybrid lexical + vector search fused with reciprocal rank fusion."""
+
+    retriever = HybridRetriever(db, collection=collection)
+    hits = await retriever.search(q, top_k=limit, category_slug=category_slug, rerank=rerank)
+    return [
+        ContentSearchHit(
+            item=ContentItemRead.model_validate(hit.item),
+            score=hit.score,
+            lexical_rank=hit.lexical_rank,
+            vector_rank=hit.vector_rank,
+            rerank_score=hit.rerank_score,
+            sources=hit.sources,
+        )
+        for hit in hits
+    ]
+
+
 @router.get("/items/{item_id}", response_model=ContentItemRead)
 async def get_content_item(
     item_id: int, *, db: AsyncSession = Depends(get_db_session)
@@ -1,30 +1,39 @@
 """HTTP endpoints exposing halachic time awareness."""
 from __future__ import annotations
 
-from datetime import date, datetime
+import asyncio
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
 
-from app.core.halachic_time import HalachicTimeService, get_halachic_service
+from app.core.halachic_time import HalachicTimeService, get_halachic_service, get_location_service
 
 router = APIRouter(prefix="/halacha", tags=["halacha"])
 
+LAT_QUERY = Query(None, ge=-90, le=90, description="Latitude override")
+LON_QUERY = Query(None, ge=-180, le=180, description="Longitude override")
+
 
 def _build_service(lat: Optional[float], lon: Optional[float], tz: Optional[str]) -> HalachicTimeService:
     if lat is not None and lon is not None and tz:
-        return HalachicTimeService(latitude=lat, longitude=lon, timezone=tz)
+        try:
+            return get_location_service(lat, lon, tz)
+        except (KeyError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=f"Unknown timezone: {tz}") from exc
     return get_halachic_service()
 
 
 @router.get("/now")
 async def halacha_now(
-    lat: Optional[float] = Query(None, description="Latitude override"),
-    lon: Optional[float] = Query(None, description="Longitude override"),
+    lat: Optional[float] = LAT_QUERY,
+    lon: Optional[float] = LON_QUERY,
     tz: Optional[str] = Query(None, description="Timezone override"),
 ) -> dict:
     service = _build_service(lat, lon, tz)
     now = datetime.now(service.timezone)
+    # The first check for a location/year builds its index; keep that off the loop.
+    await asyncio.to_thread(service.window_index, now.year)
     return {
         "now": now.isoformat(),
         "is_shabbat": service.is_shabbat(now),
@@ -33,16 +42,44 @@ async def halacha_now(
     }
 
 
+@router.get("/windows")
+async def halacha_windows(
+    days: int = Query(14, ge=1, le=370, description="How far ahead to list windows"),
+    lat: Optional[float] = LAT_QUERY,
+    lon: Optional[float] = LON_QUERY,
+    tz: Optional[str] = Query(None, description="Timezone override"),
+) -> dict:
+    """List upcoming Shabbat/Yom Tov windows so clients can check locally."""
+
+    service = _build_service(lat, lon, tz)
+    now = datetime.now(timezone.utc)
+    valid_until = now + timedelta(days=days)
+    windows = await asyncio.to_thread(service.restricted_windows, now, valid_until)
+    return {
+        "generated_at": now.isoformat(),
+        "valid_until": valid_until.isoformat(),
+        "timezone": str(service.timezone),
+        "windows": [
+            {
+                "begins": window.begins.isoformat(),
+                "ends": window.ends.isoformat(),
+                "kinds": sorted(window.kinds),
+            }
+            for window in windows
+        ],
+    }
+
+
 @router.get("/zmanim")
 async def halacha_zmanim(
     day: Optional[date] = Query(None, description="Date for zmanim (YYYY-MM-DD)"),
-    lat: Optional[float] = Query(None, description="Latitude override"),
-    lon: Optional[float] = Query(None, description="Longitude override"),
+    lat: Optional[float] = LAT_QUERY,
+    lon: Optional[float] = LON_QUERY,
     tz: Optional[str] = Query(None, description="Timezone override"),
 ) -> dict:
     service = _build_service(lat, lon, tz)
     target_day = day or datetime.now(service.timezone).date()
-    zmanim = service.get_zmanim(target_day)
+    zmanim = await asyncio.to_thread(service.get_zmanim, target_day)
     if not zmanim:
         raise HTTPException(status_code=501, detail="Zmanim lookup unavailable in this environment")
 
@@ -0,0 +1,53 @@
+"""Prometheus scrape endpoint."""
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db_session
+from app.core.metrics import render_latest
+from app.services.rag_pipeline import refresh_backlog_metrics
+
+logger = logging.getLogger(__name__)
+
+# Scrapes inside this window reuse the last backlog gauges instead of querying.
+METRICS_BACKLOG_TTL_SECONDS = float(os.getenv("METRICS_BACKLOG_TTL_SECONDS", "15"))
+
+router = APIRouter(tags=["metrics"])
+
+_backlog_refreshed_at = float("-inf")
+_backlog_failing = False
+
+
+async def _refresh_backlog(db: AsyncSession) -> None:
+    """Refresh the backlog gauges at most once per TTL, logging each outage once."""
+
+    global _backlog_refreshed_at, _backlog_failing
+
+    now = time.monotonic()
+    if now - _backlog_refreshed_at < METRICS_BACKLOG_TTL_SECONDS:
+        return
+    _backlog_refreshed_at = now
+    try:
+        await refresh_backlog_metrics(db)
+    except Exception:  # pragma: no cover - still serve the other metrics
+        if not _backlog_failing:
+            logger.exception("Could not refresh RAG index backlog metrics")
+        _backlog_failing = True
+        return
+    if _backlog_failing:
+        logger.info("RAG index backlog metrics are refreshing again")
+    _backlog_failing = False
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(db: AsyncSession = Depends(get_db_session)) -> PlainTextResponse:
+    """Expose in-process counters and gauges in Prometheus text format."""
+
+    await _refresh_backlog(db)
+    return PlainTextResponse(render_latest(), media_type="text/plain; version=0.0.4")
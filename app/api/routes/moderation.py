@@ -0,0 +1,33 @@
+"""HTTP endpoints for moderating user and generated text."""
+from __future__ import annotations
+
+from typing import Dict, List
+
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+
+from app.services.moderation import get_moderation_engine
+
+router = APIRouter(prefix="/moderation", tags=["moderation"])
+
+
+class ModerationRequest(BaseModel):
+    text: str
+
+
+class BulkModerationRequest(BaseModel):
+    texts: List[str] = Field(..., max_length=1000)
+
+
+@router.post("/assess")
+async def assess_text(request: ModerationRequest) -> Dict[str, object]:
+    """Assess a single text for toxicity and halachic speech violations."""
+
+    return await get_moderation_engine().assess(request.text)
+
+
+@router.post("/assess-many")
+async def assess_texts(request: BulkModerationRequest) -> List[Dict[str, object]]:
+    """Assess many texts in batched inference calls (bulk content moderation)."""
+
+    return await get_moderation_engine().assess_many(request.texts)
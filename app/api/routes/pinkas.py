@@ -1,24 +1,43 @@
-"""Read-only access to Pinkas log entries."""
+"""Read-only access to Pinkas log entries.
+
+Listing uses keyset pagination on ``(timestamp, id)``: each page returns an
+opaque ``next_cursor`` and the following page seeks straight to it through the
+composite indexes, so page 10,000 costs the same as page 1. ``/pinkas/export``
+streams a filtered range as NDJSON or CSV from a server-side cursor without
+materializing it in memory. ``/pinkas/stats`` serves hourly per-agent/status
+counts from the rollup table, which outlives the raw monthly partitions.
+"""
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import base64
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import desc, select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
 from app.api.deps import get_db_session
-from app.models.pinkas import Pinkas
+from app.core.database import AsyncSessionLocal
+from app.models.pinkas import Pinkas, PinkasHourlyRollup
 
 router = APIRouter(prefix="/pinkas", tags=["pinkas"])
 
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_COLUMNS = ("id", "timestamp", "agent", "status", "action", "thought", "payload")
+
 
 class PinkasEntry(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    id: int
+    id: UUID
     agent: str
     thought: Optional[str] = None
     action: Optional[str] = None
@@ -27,35 +46,183 @@ class PinkasEntry(BaseModel):
     timestamp: datetime
 
 
-@router.get("", response_model=List[PinkasEntry])
-async def list_pinkas(
-    limit: int = 50,
-    offset: int = 0,
+class PinkasPage(BaseModel):
+    items: List[PinkasEntry]
+    limit: int
+    next_cursor: Optional[str] = None
+
+
+class PinkasStatsBucket(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    bucket: datetime
+    agent: str
+    status: str
+    entries: int
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC to match the ``timestamp`` columns."""
+
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def encode_cursor(timestamp: datetime, entry_id: UUID) -> str:
+    raw = f"{timestamp.isoformat()}|{entry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, entry_id = raw.split("|", 1)
+        return _naive_utc(datetime.fromisoformat(timestamp)), UUID(entry_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _apply_filters(
+    stmt: Select,
+    *,
     agent: Optional[str] = None,
     status: Optional[str] = None,
-    db: AsyncSession = Depends(get_db_session),
-) -> List[PinkasEntry]:
-    """Return paginated Pinkas entries ordered by recency."""
-
-    stmt = select(Pinkas).order_by(desc(Pinkas.timestamp)).limit(limit).offset(offset)
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Select:
+    # Equality filters lead the composite (agent|status, timestamp, id) indexes.
+    since, until = _naive_utc(since), _naive_utc(until)
     if agent:
         stmt = stmt.where(Pinkas.agent == agent)
     if status:
         stmt = stmt.where(Pinkas.status == status)
+    if since:
+        stmt = stmt.where(Pinkas.timestamp >= since)
+    if until:
+        stmt = stmt.where(Pinkas.timestamp < until)
+    return stmt
+
+
+@router.get("", response_model=PinkasPage)
+async def list_pinkas(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    agent: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound (UTC)"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound (UTC)"),
+    db: AsyncSession = Depends(get_db_session),
+) -> PinkasPage:
+    """Return Pinkas entries newest first, one keyset page at a time."""
+
+    stmt = _apply_filters(select(Pinkas), agent=agent, status=status, since=since, until=until)
+    if cursor:
+        timestamp, entry_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Pinkas.timestamp, Pinkas.id) < tuple_(timestamp, entry_id))
+    stmt = stmt.order_by(Pinkas.timestamp.desc(), Pinkas.id.desc()).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    entries = list(result.scalars().all())
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1].timestamp, entries[-1].id)
+    return PinkasPage(items=entries, limit=limit, next_cursor=next_cursor)
+
+
+@router.get("/export")
+async def export_pinkas(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    agent: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound (UTC)"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound (UTC)"),
+) -> StreamingResponse:
+    """Stream matching entries oldest first as NDJSON or CSV."""
+
+    stmt = _apply_filters(
+        select(*(getattr(Pinkas, column) for column in EXPORT_COLUMNS)),
+        agent=agent,
+        status=status,
+        since=since,
+        until=until,
+    ).order_by(Pinkas.timestamp, Pinkas.id)
+
+    async def rows() -> AsyncIterator[Dict[str, Any]]:
+        # The request-scoped session is closed before the body streams, so the
+        # export owns its session for the lifetime of the server-side cursor.
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+            async for partition in result.mappings().partitions():
+                for row in partition:
+                    yield dict(row)
 
+    if format == "csv":
+        body = _csv_lines(rows())
+        media_type = "text/csv"
+    else:
+        body = _ndjson_lines(rows())
+        media_type = "application/x-ndjson"
+
+    filename = f"pinkas-export.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _ndjson_lines(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for row in rows:
+        yield json.dumps(row, default=str, ensure_ascii=False) + "\n"
+
+
+async def _csv_lines(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for row in rows:
+        row["payload"] = json.dumps(row.get("payload") or {}, default=str, ensure_ascii=False)
+        writer.writerow(row)
+        if buffer.tell() > 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/stats", response_model=List[PinkasStatsBucket])
+async def pinkas_stats(
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound (UTC)"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound (UTC)"),
+    agent: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db_session),
+) -> List[PinkasStatsBucket]:
+    """Return hourly entry counts per agent and status, newest bucket first."""
+
+    since, until = _naive_utc(since), _naive_utc(until)
+    stmt = select(PinkasHourlyRollup)
+    if since:
+        stmt = stmt.where(PinkasHourlyRollup.bucket >= since)
+    if until:
+        stmt = stmt.where(PinkasHourlyRollup.bucket < until)
+    if agent:
+        stmt = stmt.where(PinkasHourlyRollup.agent == agent)
+    stmt = stmt.order_by(PinkasHourlyRollup.bucket.desc()).limit(limit)
     result = await db.execute(stmt)
-    entries = result.scalars().all()
-    return list(entries)
+    return list(result.scalars().all())
 
 
 @router.get("/{entry_id}", response_model=PinkasEntry)
 async def get_pinkas_entry(
-    entry_id: int,
+    entry_id: UUID,
     db: AsyncSession = Depends(get_db_session),
 ) -> PinkasEntry:
     """Return a single Pinkas record or 404 if missing."""
 
-    entry = await db.get(Pinkas, entry_id)
+    entry = await db.scalar(select(Pinkas).where(Pinkas.id == entry_id))
     if not entry:
         raise HTTPException(status_code=404, detail="Pinkas entry not found")
     return entry
@@ -7,13 +7,18 @@ Integration tips:
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, constr
 
 from app.services import rag_client
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/rag", tags=["rag"])
 
 
@@ -74,3 +79,38 @@ async def query_rag(payload: QueryRequest) -> RAGAnswer:
     )
     sources = [Source(**source) for source in result.get("sources", [])]
     return RAGAnswer(answer=result.get("answer", ""), sources=sources)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/query/stream")
+async def query_rag_stream(payload: QueryRequest) -> StreamingResponse:
+    """Stream a RAG answer as Server-Sent Events.
+
+    Emits a ``sources`` event first, then ``token`` events as Ollama generates,
+    and a final ``done`` event with the full answer, or an ``error`` event if
+    generation fails or stalls. When the client
+    disconnects the response task is cancelled, which closes the upstream
+    Ollama stream and stops generation.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        stream = rag_client.rag_answer_stream(
+            payload.collection, payload.question, top_k=payload.top_k
+        )
+        try:
+            async for event in stream:
+                yield _sse(event["type"], event)
+        except Exception as exc:  # pragma: no cover - depends on upstream availability
+            logger.exception("RAG stream failed")
+            yield _sse("error", {"type": "error", "detail": str(exc)})
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,12 @@
 """Agent discovery and orchestration endpoints."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from app.core.orchestrator import SanhedrinOrchestrator
 from app.core.registry import list_agents
@@ -20,6 +22,7 @@ class DebateRequest(BaseModel):
     agent_names: Optional[List[str]] = None
     tiers: Optional[List[AgentTier]] = None
     include_specialists: bool = False
+    quorum: Optional[float] = Field(default=None, gt=0, le=1)
 
 
 class DebateResponse(BaseModel):
@@ -27,6 +30,7 @@ class DebateResponse(BaseModel):
     participants: List[str]
     transcripts: List[Dict[str, str]]
     summary: str
+    missing: List[str] = Field(default_factory=list)
 
 
 @router.get("", response_model=List[AgentProfile])
@@ -37,16 +41,59 @@ def get_agents(tier: Optional[AgentTier] = Query(default=None)) -> List[AgentPro
 
 
 @router.post("/debate", response_model=DebateResponse)
-def start_debate(payload: DebateRequest) -> DebateResponse:
+async def start_debate(payload: DebateRequest) -> DebateResponse:
     """Kick off a Sanhedrin round-table debate on a topic."""
 
     try:
-        result = orchestrator.debate(
+        result = await orchestrator.adebate(
             task=payload.task,
             agent_names=payload.agent_names,
             tiers=payload.tiers,
             include_specialists=payload.include_specialists,
+            quorum=payload.quorum,
         )
         return DebateResponse(**result)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/debate/stream")
+async def stream_debate(payload: DebateRequest) -> StreamingResponse:
+    """Stream a debate as Server-Sent Events.
+
+    Emits ``participants``, then one ``turn`` event per agent as it answers,
+    then a final ``summary`` event.
+    """
+
+    if not orchestrator.select_agents(
+        agent_names=payload.agent_names,
+        tiers=payload.tiers,
+        include_specialists=payload.include_specialists,
+    ):
+        raise HTTPException(
+            status_code=400, detail="No agents available for the requested debate configuration."
+        )
+
+    async def events() -> AsyncIterator[str]:
+        stream = orchestrator.stream_debate(
+            payload.task,
+            agent_names=payload.agent_names,
+            tiers=payload.tiers,
+            include_specialists=payload.include_specialists,
+            quorum=payload.quorum,
+        )
+        try:
+            async for event in stream:
+                yield _sse(event["type"], event)
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,134 @@
+"""Minimal five-field cron expressions for mission templates.
+
+Supports ``*``, lists, ranges, steps, month/day names and the ``@hourly``,
+``@daily``, ``@weekly``, ``@monthly`` and ``@yearly`` aliases. Expressions are
+parsed once into sets so computing the next fire time is a handful of field
+jumps rather than a minute-by-minute scan. Standard cron semantics apply: when
+both day-of-month and day-of-week are restricted, either may match.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+MONTH_NAMES = {
+    name: index
+    for index, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+    )
+}
+DAY_NAMES = {name: index for index, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))}
+
+# Upper bound on the search; no valid expression needs more than ~4 years (Feb 29).
+_MAX_YEARS = 5
+
+
+class CronError(ValueError):
+    """Raised for malformed cron expressions."""
+
+
+def _parse_field(spec: str, low: int, high: int, names: dict | None = None) -> FrozenSet[int]:
+    values: set[int] = set()
+    for part in spec.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) < 1:
+                raise CronError(f"Invalid step in '{spec}'")
+            step = int(step_text)
+        if part in ("*", ""):
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = _value(start_text, names), _value(end_text, names)
+        else:
+            start = _value(part, names)
+            end = high if step > 1 else start
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise CronError(f"Value out of range in '{spec}' (expected {low}-{high})")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def _value(text: str, names: dict | None) -> int:
+    if names and text in names:
+        return names[text]
+    if not text.isdigit():
+        raise CronError(f"Invalid cron value '{text}'")
+    return int(text)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """A parsed cron expression evaluated against naive local wall-clock time."""
+
+    expression: str
+    minutes: FrozenSet[int]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]  # cron numbering: Sunday == 0
+    restricted: Tuple[bool, bool]  # (day-of-month, day-of-week)
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        text = ALIASES.get(expression.strip().lower(), expression.strip())
+        fields = text.split()
+        if len(fields) != 5:
+            raise CronError(f"Expected 5 cron fields, got {len(fields)}: '{expression}'")
+        minute, hour, day, month, weekday = fields
+        weekdays = _parse_field(weekday, 0, 7, DAY_NAMES)
+        if 7 in weekdays:
+            weekdays = (weekdays - {7}) | {0}
+        return cls(
+            expression=expression,
+            minutes=_parse_field(minute, 0, 59),
+            hours=_parse_field(hour, 0, 23),
+            days=_parse_field(day, 1, 31),
+            months=_parse_field(month, 1, 12, MONTH_NAMES),
+            weekdays=frozenset(weekdays),
+            restricted=(not day.startswith("*"), not weekday.startswith("*")),
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if all(self.restricted):
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first matching minute strictly after ``moment``."""
+
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate.replace(year=candidate.year + _MAX_YEARS)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise CronError(f"Cron expression never fires: '{self.expression}'")
+
+
+__all__ = ["CronError", "CronSchedule"]
@@ -0,0 +1,198 @@
+"""Precomputed Shabbat/Yom Tov interval index.
+
+Astronomical calculations (sunset, tzais) and Hebrew calendar lookups are
+expensive relative to how often the guard is checked: every broadcast, mission
+and campaign asks "is it Shabbat now?". :class:`HalachicWindowIndex` holds one
+year of windows as sorted arrays of epoch seconds, so a check is a single
+``bisect`` with no calendar objects on the hot path.
+
+:class:`HalachicIndexStore` builds an index per (location, year) on first use,
+keeps it in memory and persists it as a small JSON file under
+``HALACHA_INDEX_CACHE_DIR`` so restarts skip the build entirely. Builds made
+without the astronomical/calendar libraries are approximations and are kept
+in memory only, so installing the libraries takes effect on the next start.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+HALACHA_INDEX_CACHE_DIR = os.getenv("HALACHA_INDEX_CACHE_DIR", ".cache/halachic")
+
+# Bump when the window computation changes so stale cache files are rebuilt.
+INDEX_VERSION = 1
+
+RawWindow = Tuple[datetime, datetime, str]
+
+
+@dataclass(frozen=True)
+class HalachicWindow:
+    """A contiguous restricted span; ``kinds`` lists what it covers."""
+
+    begins: datetime
+    ends: datetime
+    kinds: FrozenSet[str]
+
+
+def _timestamp(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _as_datetime(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+class HalachicWindowIndex:
+    """Merged, sorted restricted windows with ``O(log n)`` membership checks.
+
+    Overlapping or touching windows (e.g. Yom Tov running into Shabbat) are
+    merged for the combined check; per-kind checks use their own arrays so
+    ``contains(moment, "shabbat")`` keeps exact Shabbat boundaries.
+    """
+
+    def __init__(self, windows: Iterable[Tuple[float, float, str]]) -> None:
+        self._raw = sorted((float(begins), float(ends), kind) for begins, ends, kind in windows if ends > begins)
+        self._starts, self._ends, self._kinds = self._merge(self._raw)
+        self._by_kind: Dict[str, Tuple[List[float], List[float]]] = {}
+        for kind in {kind for _, _, kind in self._raw}:
+            starts, ends, _ = self._merge([window for window in self._raw if window[2] == kind])
+            self._by_kind[kind] = (starts, ends)
+
+    @classmethod
+    def from_datetimes(cls, windows: Iterable[RawWindow]) -> "HalachicWindowIndex":
+        return cls((_timestamp(begins), _timestamp(ends), kind) for begins, ends, kind in windows)
+
+    @staticmethod
+    def _merge(
+        windows: Sequence[Tuple[float, float, str]],
+    ) -> Tuple[List[float], List[float], List[FrozenSet[str]]]:
+        starts: List[float] = []
+        ends: List[float] = []
+        kinds: List[FrozenSet[str]] = []
+        for begins, finishes, kind in windows:
+            if starts and begins <= ends[-1]:
+                ends[-1] = max(ends[-1], finishes)
+                kinds[-1] = kinds[-1] | {kind}
+            else:
+                starts.append(begins)
+                ends.append(finishes)
+                kinds.append(frozenset({kind}))
+        return starts, ends, kinds
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def contains(self, moment: datetime, kind: Optional[str] = None) -> bool:
+        """Return True if ``moment`` (naive means UTC) falls inside a window."""
+
+        starts, ends = (self._starts, self._ends) if kind is None else self._by_kind.get(kind, ([], []))
+        value = _timestamp(moment)
+        index = bisect.bisect_right(starts, value) - 1
+        return index >= 0 and value < ends[index]
+
+    def window_at(self, moment: datetime) -> Optional[HalachicWindow]:
+        value = _timestamp(moment)
+        index = bisect.bisect_right(self._starts, value) - 1
+        if index >= 0 and value < self._ends[index]:
+            return self._window(index)
+        return None
+
+    def next_window(self, moment: datetime) -> Optional[HalachicWindow]:
+        """Return the first window that has not ended by ``moment``."""
+
+        index = bisect.bisect_right(self._ends, _timestamp(moment))
+        return self._window(index) if index < len(self._starts) else None
+
+    def between(self, start: datetime, end: datetime) -> List[HalachicWindow]:
+        """Return merged windows overlapping ``[start, end)``."""
+
+        first = bisect.bisect_right(self._ends, _timestamp(start))
+        last = bisect.bisect_left(self._starts, _timestamp(end))
+        return [self._window(index) for index in range(first, last)]
+
+    def _window(self, index: int) -> HalachicWindow:
+        return HalachicWindow(
+            begins=_as_datetime(self._starts[index]),
+            ends=_as_datetime(self._ends[index]),
+            kinds=self._kinds[index],
+        )
+
+    def to_payload(self) -> List[List[object]]:
+        return [[begins, ends, kind] for begins, ends, kind in self._raw]
+
+
+class HalachicIndexStore:
+    """Per-location cache of yearly indexes, in memory and on disk."""
+
+    def __init__(
+        self,
+        key: str,
+        builder: Callable[[int], Iterable[RawWindow]],
+        *,
+        cache_dir: Optional[str] = HALACHA_INDEX_CACHE_DIR,
+        persist: bool = True,
+    ) -> None:
+        self.key = key
+        self.builder = builder
+        self.cache_dir = Path(cache_dir) if cache_dir and persist else None
+        self._indexes: Dict[int, HalachicWindowIndex] = {}
+        self._lock = threading.Lock()
+
+    def for_year(self, year: int) -> HalachicWindowIndex:
+        index = self._indexes.get(year)
+        if index is not None:
+            return index
+        with self._lock:
+            index = self._indexes.get(year)
+            if index is None:
+                index = self._load(year)
+                if index is None:
+                    index = HalachicWindowIndex.from_datetimes(self.builder(year))
+                    self._save(year, index)
+                self._indexes[year] = index
+        return index
+
+    def _path(self, year: int) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{self.key}-{year}.json"
+
+    def _load(self, year: int) -> Optional[HalachicWindowIndex]:
+        path = self._path(year)
+        if path is None or not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable halachic index cache %s: %s", path, exc)
+            return None
+        if payload.get("version") != INDEX_VERSION or payload.get("key") != self.key:
+            return None
+        return HalachicWindowIndex(tuple(window) for window in payload.get("windows", []))
+
+    def _save(self, year: int, index: HalachicWindowIndex) -> None:
+        path = self._path(year)
+        if path is None:
+            return
+        payload = {"version": INDEX_VERSION, "key": self.key, "year": year, "windows": index.to_payload()}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload))
+            tmp.replace(path)
+        except OSError as exc:
+            logger.warning("Could not persist halachic index cache %s: %s", path, exc)
+
+
+__all__ = ["HalachicIndexStore", "HalachicWindow", "HalachicWindowIndex"]
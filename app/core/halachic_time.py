@@ -11,15 +11,28 @@ variables, e.g. for Jerusalem:
     HALACHA_LATITUDE=31.7857
     HALACHA_LONGITUDE=35.2007
     HALACHA_TIMEZONE=Asia/Jerusalem
+    HALACHA_ISRAEL=1          # one-day Yom Tov; defaults to true for Asia/Jerusalem
+
+Checks are answered from a per-year :class:`~app.core.halachic_index.HalachicWindowIndex`
+(bisect over precomputed windows, cached on disk); zmanim and the Hebrew
+calendar are only consulted when a year's index is first built.
 """
 from __future__ import annotations
 
 import os
 from datetime import date, datetime, timedelta
 from functools import lru_cache
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
+from app.core.halachic_index import (
+    HALACHA_INDEX_CACHE_DIR,
+    HalachicIndexStore,
+    HalachicWindow,
+    HalachicWindowIndex,
+    RawWindow,
+)
+
 try:  # pragma: no cover - import guarded for environments missing dependency
     from zmanim.util.geo_location import GeoLocation
     from zmanim.zmanim_calendar import ZmanimCalendar
@@ -27,19 +40,43 @@ except Exception:  # pragma: no cover - defensive fallback
     GeoLocation = None
     ZmanimCalendar = None
 
+try:  # pragma: no cover - import guarded for environments missing dependency
+    from pyluach import dates as hebrew_dates
+except Exception:  # pragma: no cover - defensive fallback
+    hebrew_dates = None
+
 
 class HalachicTimeService:
     """Provide Shabbat/Yom Tov awareness for a specific location."""
 
-    def __init__(self, latitude: float, longitude: float, timezone: str):
+    def __init__(
+        self,
+        latitude: float,
+        longitude: float,
+        timezone: str,
+        *,
+        israel: Optional[bool] = None,
+        index_cache_dir: Optional[str] = HALACHA_INDEX_CACHE_DIR,
+    ):
         self.latitude = latitude
         self.longitude = longitude
         self.timezone = ZoneInfo(timezone)
+        self.israel = timezone == "Asia/Jerusalem" if israel is None else israel
         self._location = (
             GeoLocation("HalachaLocation", latitude, longitude, self.timezone)
             if GeoLocation is not None
             else None
         )
+        location_key = "{:.4f}_{:.4f}_{}_{}".format(
+            latitude, longitude, timezone.replace("/", "-"), "il" if self.israel else "diaspora"
+        )
+        # Fallback builds approximate sunset/holidays; never persist them.
+        self._index_store = HalachicIndexStore(
+            location_key,
+            self.build_windows,
+            cache_dir=index_cache_dir,
+            persist=ZmanimCalendar is not None and hebrew_dates is not None,
+        )
 
     def _calendar_for(self, dt: datetime) -> tuple[datetime, Optional[ZmanimCalendar]]:
         base_dt = dt
@@ -54,8 +91,12 @@ class HalachicTimeService:
         cal.set_date(tz_dt)
         return tz_dt, cal
 
-    def is_shabbat(self, dt: datetime) -> bool:
-        """Return True if the datetime falls within local Shabbat."""
+    def compute_is_shabbat(self, dt: datetime) -> bool:
+        """Return True if the datetime falls within local Shabbat, computed directly.
+
+        Builds a calendar per call; kept as the reference implementation for
+        verifying and benchmarking the window index.
+        """
 
         tz_dt, cal = self._calendar_for(dt)
 
@@ -81,18 +122,109 @@ class HalachicTimeService:
             return True
         return False
 
-    def is_yom_tov(self, dt: datetime) -> bool:
-        """Return True if the datetime falls on Yom Tov.
+    def window_index(self, year: int) -> HalachicWindowIndex:
+        """Return the precomputed window index for a local calendar year."""
 
-        TODO: replace with real Yom Tov calculation using PyLuach or an external API.
-        """
+        return self._index_store.for_year(year)
 
-        return False
+    def _index_for(self, dt: datetime) -> HalachicWindowIndex:
+        # Each yearly index spans a few days either side of the year, so the
+        # wall-clock year of ``dt`` in any timezone is close enough.
+        return self.window_index(dt.year)
+
+    def is_shabbat(self, dt: datetime) -> bool:
+        """Return True if the datetime falls within local Shabbat."""
+
+        return self._index_for(dt).contains(dt, "shabbat")
+
+    def is_yom_tov(self, dt: datetime) -> bool:
+        """Return True if the datetime falls on Yom Tov (erev at sunset until tzais)."""
+
+        return self._index_for(dt).contains(dt, "yom_tov")
 
     def is_shabbat_or_yom_tov(self, dt: datetime) -> bool:
         """Convenience helper for composite guard."""
 
-        return self.is_shabbat(dt) or self.is_yom_tov(dt)
+        return self._index_for(dt).contains(dt)
+
+    def _local_midnight(self, day: date) -> datetime:
+        return datetime.combine(day, datetime.min.time()).replace(tzinfo=self.timezone)
+
+    def _sunset(self, day: date) -> datetime:
+        fallback = self._local_midnight(day).replace(hour=18)
+        if ZmanimCalendar is None or self._location is None:
+            return fallback
+        cal = ZmanimCalendar(self._location)
+        cal.set_date(self._local_midnight(day))
+        return cal.sunset() or fallback
+
+    def _nightfall(self, day: date) -> datetime:
+        fallback = self._local_midnight(day).replace(hour=20)
+        if ZmanimCalendar is None or self._location is None:
+            return fallback
+        cal = ZmanimCalendar(self._location)
+        cal.set_date(self._local_midnight(day))
+        tzais = cal.tzais()
+        if tzais:
+            return tzais
+        sunset = cal.sunset()
+        return sunset + timedelta(minutes=40) if sunset else fallback
+
+    def shabbat_window(self, friday: date) -> Tuple[datetime, datetime]:
+        """Return the (sunset, tzais) span of the Shabbat starting on ``friday``."""
+
+        return self._sunset(friday), self._nightfall(friday + timedelta(days=1))
+
+    def yom_tov_days(self, start: date, end: date) -> List[date]:
+        """Return the non-working festival days in ``[start, end]`` (needs pyluach)."""
+
+        if hebrew_dates is None:
+            return []
+        days: List[date] = []
+        day = start
+        while day <= end:
+            hebrew_day = hebrew_dates.GregorianDate(day.year, day.month, day.day).to_heb()
+            if hebrew_day.festival(israel=self.israel, include_working_days=False):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def build_windows(self, year: int) -> List[RawWindow]:
+        """Compute every Shabbat and Yom Tov window touching local ``year``."""
+
+        start = date(year, 1, 1) - timedelta(days=3)
+        end = date(year, 12, 31) + timedelta(days=3)
+        windows: List[RawWindow] = []
+
+        friday = start + timedelta(days=(4 - start.weekday()) % 7)
+        while friday <= end:
+            begins, ends = self.shabbat_window(friday)
+            windows.append((begins, ends, "shabbat"))
+            friday += timedelta(days=7)
+
+        for day in self.yom_tov_days(start, end):
+            windows.append((self._sunset(day - timedelta(days=1)), self._nightfall(day), "yom_tov"))
+        return windows
+
+    def restricted_windows(self, start: datetime, end: datetime) -> List[HalachicWindow]:
+        """Return merged Shabbat/Yom Tov windows overlapping ``[start, end)``, oldest first."""
+
+        utc = ZoneInfo("UTC")
+        start = start if start.tzinfo else start.replace(tzinfo=utc)
+        end = end if end.tzinfo else end.replace(tzinfo=utc)
+
+        spans: Dict[datetime, HalachicWindow] = {}
+        for year in range(start.astimezone(self.timezone).year, end.astimezone(self.timezone).year + 1):
+            for window in self.window_index(year).between(start, end):
+                current = spans.get(window.begins)
+                if current is None or window.ends > current.ends:
+                    spans[window.begins] = window
+        return [spans[begins] for begins in sorted(spans)]
+
+    def blackout_windows(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Return sorted UTC ``(begins, ends)`` Shabbat/Yom Tov windows overlapping ``[start, end)``."""
+
+        return [(window.begins, window.ends) for window in self.restricted_windows(start, end)]
 
     def get_zmanim(self, day: date) -> Dict[str, datetime]:
         """Return key zmanim for a given day (experimental)."""
@@ -112,6 +244,34 @@ class HalachicTimeService:
         return zmanim
 
 
+# Per-request location overrides are snapped to a grid (0.1 degrees is ~11 km,
+# well under a minute of sunset drift) and served from a bounded LRU, so
+# arbitrary coordinates cannot trigger unbounded index builds.
+HALACHA_OVERRIDE_GRID = float(os.getenv("HALACHA_OVERRIDE_GRID", "0.1"))
+HALACHA_OVERRIDE_CACHE_SIZE = int(os.getenv("HALACHA_OVERRIDE_CACHE_SIZE", "32"))
+
+
+def _snap(value: float) -> float:
+    return round(round(value / HALACHA_OVERRIDE_GRID) * HALACHA_OVERRIDE_GRID, 4)
+
+
+@lru_cache(maxsize=HALACHA_OVERRIDE_CACHE_SIZE)
+def _location_service(latitude: float, longitude: float, timezone: str) -> HalachicTimeService:
+    # Overrides are kept in memory only; the disk cache is for configured locations.
+    return HalachicTimeService(
+        latitude=latitude, longitude=longitude, timezone=timezone, index_cache_dir=None
+    )
+
+
+def get_location_service(latitude: float, longitude: float, timezone: str) -> HalachicTimeService:
+    """Return a cached service for an ad-hoc location, snapped to the override grid.
+
+    Raises ``ValueError`` for an unknown timezone.
+    """
+
+    return _location_service(_snap(latitude), _snap(longitude), timezone)
+
+
 @lru_cache(maxsize=1)
 def get_halachic_service() -> HalachicTimeService:
     """Return a cached HalachicTimeService configured via environment variables."""
@@ -122,4 +282,4 @@ def get_halachic_service() -> HalachicTimeService:
     return HalachicTimeService(latitude=latitude, longitude=longitude, timezone=timezone)
 
 
-__all__ = ["HalachicTimeService", "get_halachic_service"]
+__all__ = ["HalachicTimeService", "get_halachic_service", "get_location_service"]
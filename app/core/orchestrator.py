@@ -1,21 +1,42 @@
-"""Simple orchestration layer for the Digital Sanhedrin agents."""
+"""Simple orchestration layer for the Digital Sanhedrin agents.
+
+Agent turns run concurrently (capped by ``DEBATE_MAX_CONCURRENCY``) and the
+facilitator summary can start once a quorum of turns is in
+(``DEBATE_QUORUM``, a fraction of participants), so debate latency follows
+the slowest agent rather than the number of agents.
+"""
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import math
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
-from litellm import completion
+from litellm import acompletion, completion
 
 from app.core.engine import Engine
 from app.core.registry import REGISTRY
 from app.models import AgentProfile, AgentTier
 
+DEBATE_MAX_CONCURRENCY = int(os.getenv("DEBATE_MAX_CONCURRENCY", "4"))
+DEBATE_QUORUM = float(os.getenv("DEBATE_QUORUM", "1.0"))
+
 
 class SanhedrinOrchestrator:
     """Coordinate a round-table style debate across registered agents."""
 
-    def __init__(self, *, engine: Optional[Engine] = None, registry: Optional[Dict[str, AgentProfile]] = None) -> None:
+    def __init__(
+        self,
+        *,
+        engine: Optional[Engine] = None,
+        registry: Optional[Dict[str, AgentProfile]] = None,
+        max_concurrency: int = DEBATE_MAX_CONCURRENCY,
+        quorum: float = DEBATE_QUORUM,
+    ) -> None:
         self.engine = engine or Engine()
         self.registry = registry or REGISTRY
+        self.max_concurrency = max(1, max_concurrency)
+        self.quorum = quorum
 
     def select_agents(
         self,
@@ -54,9 +75,71 @@ class SanhedrinOrchestrator:
         agent_names: Optional[List[str]] = None,
         tiers: Optional[List[AgentTier]] = None,
         include_specialists: bool = False,
+    ) -> Dict[str, Any]:
+        """Synchronous wrapper around :meth:`adebate` for non-async callers."""
+
+        return asyncio.run(
+            self.adebate(
+                task,
+                agent_names=agent_names,
+                tiers=tiers,
+                include_specialists=include_specialists,
+            )
+        )
+
+    async def adebate(
+        self,
+        task: str,
+        *,
+        agent_names: Optional[List[str]] = None,
+        tiers: Optional[List[AgentTier]] = None,
+        include_specialists: bool = False,
+        quorum: Optional[float] = None,
     ) -> Dict[str, Any]:
         """Simulate a round-table discussion and return the synthesized outcome."""
 
+        participants: List[str] = []
+        turns: List[Dict[str, str]] = []
+        result: Dict[str, Any] = {}
+        async for event in self.stream_debate(
+            task,
+            agent_names=agent_names,
+            tiers=tiers,
+            include_specialists=include_specialists,
+            quorum=quorum,
+        ):
+            if event["type"] == "participants":
+                participants = event["participants"]
+            elif event["type"] == "turn":
+                turns.append(event["turn"])
+            elif event["type"] == "summary":
+                result = event
+
+        return {
+            "task": task,
+            "participants": participants,
+            "transcripts": turns,
+            "summary": result.get("summary", ""),
+            "missing": result.get("missing", []),
+        }
+
+    async def stream_debate(
+        self,
+        task: str,
+        *,
+        agent_names: Optional[List[str]] = None,
+        tiers: Optional[List[AgentTier]] = None,
+        include_specialists: bool = False,
+        quorum: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``participants``, then each ``turn`` as it arrives, then the ``summary``.
+
+        Turns fan out concurrently under a semaphore. Once ``quorum`` (a
+        fraction of participants) have answered, summarization starts; turns
+        that land before the summary finishes are still streamed, and any
+        stragglers are cancelled and reported as ``missing``.
+        """
+
         participants = self.select_agents(
             agent_names=agent_names,
             tiers=tiers,
@@ -64,21 +147,51 @@ class SanhedrinOrchestrator:
         )
         if not participants:
             raise ValueError("No agents available for the requested debate configuration.")
+        yield {"type": "participants", "participants": [agent.name for agent in participants]}
 
-        turns = [self._ask_agent(agent, task) for agent in participants]
-        summary = self._summarize(task, turns)
+        fraction = self.quorum if quorum is None else quorum
+        needed = min(len(participants), max(1, math.ceil(len(participants) * fraction)))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending = {
+            asyncio.create_task(self._aask_agent(agent, task, semaphore)): agent
+            for agent in participants
+        }
+        turns: List[Dict[str, str]] = []
+        summarized_from: List[str] = []
+        summary_task: Optional[asyncio.Task] = None
 
-        return {
-            "task": task,
-            "participants": [agent.name for agent in participants],
-            "transcripts": turns,
+        try:
+            while pending:
+                waiting = set(pending) | ({summary_task} if summary_task else set())
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    if finished is summary_task:
+                        continue
+                    pending.pop(finished)
+                    turn = finished.result()
+                    turns.append(turn)
+                    yield {"type": "turn", "turn": turn}
+                if summary_task is None and len(turns) >= needed:
+                    summarized_from = [turn["agent"] for turn in turns]
+                    summary_task = asyncio.create_task(self._asummarize(task, list(turns)))
+                if summary_task is not None and summary_task in done:
+                    break
+            summary = await summary_task  # type: ignore[misc]
+        finally:
+            for straggler in pending:
+                straggler.cancel()
+            if summary_task is not None and not summary_task.done():
+                summary_task.cancel()
+
+        yield {
+            "type": "summary",
             "summary": summary,
+            "summarized_from": summarized_from,
+            "missing": [agent.name for agent in pending.values()],
         }
 
-    def _ask_agent(self, agent: AgentProfile, task: str) -> Dict[str, str]:
-        """Collect a single agent opinion using the configured LLM."""
-
-        messages = [
+    def _turn_messages(self, agent: AgentProfile, task: str) -> List[Dict[str, str]]:
+        return [
             {"role": "system", "content": agent.system_prompt},
             {
                 "role": "user",
@@ -88,16 +201,12 @@ class SanhedrinOrchestrator:
                 ),
             },
         ]
-        content = self._complete(messages)
-        return {"agent": agent.name, "role": agent.role, "content": content}
-
-    def _summarize(self, task: str, turns: List[Dict[str, str]]) -> str:
-        """Summarize the debate into an actionable outcome."""
 
+    def _summary_messages(self, task: str, turns: List[Dict[str, str]]) -> List[Dict[str, str]]:
         debate_digest = "\n".join(
             f"{turn['agent']}: {turn['content']}" for turn in turns
         )
-        messages = [
+        return [
             {
                 "role": "system",
                 "content": (
@@ -107,7 +216,27 @@ class SanhedrinOrchestrator:
             },
             {"role": "user", "content": f"Task: {task}\nDebate:\n{debate_digest}"},
         ]
-        return self._complete(messages)
+
+    def _ask_agent(self, agent: AgentProfile, task: str) -> Dict[str, str]:
+        """Collect a single agent opinion using the configured LLM."""
+
+        content = self._complete(self._turn_messages(agent, task))
+        return {"agent": agent.name, "role": agent.role, "content": content}
+
+    async def _aask_agent(
+        self, agent: AgentProfile, task: str, semaphore: asyncio.Semaphore
+    ) -> Dict[str, str]:
+        async with semaphore:
+            content = await self._acomplete(self._turn_messages(agent, task))
+        return {"agent": agent.name, "role": agent.role, "content": content}
+
+    def _summarize(self, task: str, turns: List[Dict[str, str]]) -> str:
+        """Summarize the debate into an actionable outcome."""
+
+        return self._complete(self._summary_messages(task, turns))
+
+    async def _asummarize(self, task: str, turns: List[Dict[str, str]]) -> str:
+        return await self._acomplete(self._summary_messages(task, turns))
 
     def _complete(self, messages: List[Dict[str, str]]) -> str:
         """Invoke LiteLLM with a safe fallback when the model is unavailable."""
@@ -122,7 +251,26 @@ class SanhedrinOrchestrator:
             choice = response["choices"][0]["message"]["content"]
             return choice.strip()
         except Exception:
-            # Offline fallback: combine the messages into a readable note.
-            user_message = next((msg["content"] for msg in messages if msg["role"] == "user"), "")
-            system_message = next((msg["content"] for msg in messages if msg["role"] == "system"), "")
-            return f"[Simulated Response] {system_message}\n{user_message}"
+            return self._simulated_response(messages)
+
+    async def _acomplete(self, messages: List[Dict[str, str]]) -> str:
+        """Async LiteLLM call sharing the offline fallback of :meth:`_complete`."""
+
+        try:
+            response = await acompletion(
+                model=self.engine.model,
+                api_base=self.engine.ollama_base_url,
+                api_key=self.engine.api_key or None,
+                messages=messages,
+            )
+            choice = response["choices"][0]["message"]["content"]
+            return choice.strip()
+        except Exception:
+            return self._simulated_response(messages)
+
+    @staticmethod
+    def _simulated_response(messages: List[Dict[str, str]]) -> str:
+        # Offline fallback: combine the messages into a readable note.
+        user_message = next((msg["content"] for msg in messages if msg["role"] == "user"), "")
+        system_message = next((msg["content"] for msg in messages if msg["role"] == "system"), "")
+        return f"[Simulated Response] {system_message}\n{user_message}"
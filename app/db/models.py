@@ -1,12 +1,11 @@
 from datetime import datetime
-import asyncio
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
-from app.core.database import AsyncSessionLocal, Base
-from app.models.pinkas import Pinkas
+from app.core.database import Base
+from app.db.pinkas_writer import get_pinkas_writer
 
 
 class Agent(Base):
@@ -41,14 +40,17 @@ class AgentTask(Base):
 class AgentLog(Base):
     __tablename__ = "agent_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = {"postgresql_partition_by": "RANGE (timestamp)"}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
     agent_id = Column(Integer, ForeignKey("agents.id", ondelete="SET NULL"))
     agent_name = Column(String, index=True)
     action = Column(String)
     input_data = Column(JSONB)
     output_data = Column(JSONB)
     embedding = Column(Vector(384), nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    # Partition key (monthly ranges, see app.db.partitions), hence in the PK.
+    timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True)
     status = Column(String)
 
     agent = relationship("Agent", back_populates="logs")
@@ -63,24 +65,13 @@ class AgentLog(Base):
         }
 
 
-async def _persist_pinkas_entry_async(
-    *,
-    agent_name: str,
-    thought: str | None = None,
-    action: str | None = None,
-    payload: dict | None = None,
-    status: str | None = None,
-) -> None:
-    async with AsyncSessionLocal() as session:
-        entry = Pinkas(
-            agent=agent_name,
-            thought=thought,
-            action=action,
-            payload=payload or {},
-            status=status or "ok",
-        )
-        session.add(entry)
-        await session.commit()
+class AgentLogHourlyRollup(Base):
+    __tablename__ = "agent_log_hourly_rollups"
+
+    bucket = Column(DateTime, primary_key=True)
+    agent = Column(String, primary_key=True)
+    status = Column(String, primary_key=True)
+    entries = Column(Integer, nullable=False, default=0)
 
 
 def persist_pinkas_entry(
@@ -91,21 +82,16 @@ def persist_pinkas_entry(
     payload: dict | None = None,
     status: str | None = None,
 ) -> None:
-    """Persist a Pinkas log entry, handling sync and async contexts."""
-
-    async def _runner() -> None:
-        await _persist_pinkas_entry_async(
-            agent_name=agent_name,
-            thought=thought,
-            action=action,
-            payload=payload,
-            status=status,
-        )
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        asyncio.run(_runner())
-        return
-
-    loop.create_task(_runner())
+    """Buffer a Pinkas log entry; safe to call from sync and async contexts.
+
+    Entries are written in batches by :mod:`app.db.pinkas_writer`, so callers
+    never wait on the database.
+    """
+
+    get_pinkas_writer().enqueue(
+        agent=agent_name,
+        thought=thought,
+        action=action,
+        payload=payload,
+        status=status,
+    )
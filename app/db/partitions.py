@@ -0,0 +1,279 @@
+"""Monthly partition maintenance and hourly rollups for audit tables.
+
+``pinkas`` and ``agent_logs`` are range-partitioned by month on their
+timestamp column (see migration ``0006_partition_audit_tables``). Partitions
+are named ``<table>_YYYY_MM``. :func:`run_maintenance` is meant to run hourly
+(Celery beat ``maintenance.audit_partitions`` or
+``scripts/audit_maintenance.py``) and:
+
+1. creates partitions ``PARTITION_MONTHS_AHEAD`` months into the future;
+2. upserts hourly per-agent/status counts into ``*_hourly_rollups`` for the
+   last ``ROLLUP_LOOKBACK_HOURS`` (late buffered writes are absorbed);
+3. for partitions older than the table's retention, finalizes their rollups,
+   exports them to ``PARTITION_ARCHIVE_DIR/<partition>.ndjson.gz``, then
+   detaches and drops them.
+
+There is no DEFAULT partition, so a row for a month without a partition fails
+to insert. After each pass the number of consecutive future months covered is
+exported as ``audit_partition_months_ahead`` and :class:`PartitionRunwayError`
+is raised when it falls below ``PARTITION_MIN_MONTHS_AHEAD``. The Pinkas
+writer also creates the current and upcoming partitions when it starts and at
+each month change, so inserts keep working while beat is down.
+
+Dashboards read the rollup tables, which outlive the raw partitions.
+"""
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.metrics import gauge
+
+logger = logging.getLogger(__name__)
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+PARTITION_MIN_MONTHS_AHEAD = int(os.getenv("PARTITION_MIN_MONTHS_AHEAD", "1"))
+PARTITION_ARCHIVE_DIR = os.getenv("PARTITION_ARCHIVE_DIR", "archive")
+PINKAS_RETENTION_MONTHS = int(os.getenv("PINKAS_RETENTION_MONTHS", "12"))
+AGENT_LOG_RETENTION_MONTHS = int(os.getenv("AGENT_LOG_RETENTION_MONTHS", "6"))
+ROLLUP_LOOKBACK_HOURS = int(os.getenv("ROLLUP_LOOKBACK_HOURS", "3"))
+
+_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+
+PARTITION_RUNWAY = gauge(
+    "audit_partition_months_ahead",
+    "Consecutive future months with an attached partition (-1 if the current month is missing)",
+    ("table",),
+)
+
+
+class PartitionRunwayError(RuntimeError):
+    """Raised when too few future partitions exist for inserts to keep succeeding."""
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """A month-partitioned table and the rollup it feeds."""
+
+    name: str
+    column: str
+    agent_column: str
+    rollup_table: str
+    retention_months: int
+
+    def partition_name(self, month: date) -> str:
+        return f"{self.name}_{month:%Y_%m}"
+
+
+PINKAS = PartitionedTable("pinkas", "timestamp", "agent", "pinkas_hourly_rollups", PINKAS_RETENTION_MONTHS)
+AGENT_LOGS = PartitionedTable(
+    "agent_logs", "timestamp", "agent_name", "agent_log_hourly_rollups", AGENT_LOG_RETENTION_MONTHS
+)
+PARTITIONED_TABLES = (PINKAS, AGENT_LOGS)
+
+
+@dataclass
+class MaintenanceReport:
+    created: List[str] = field(default_factory=list)
+    archived: Dict[str, str] = field(default_factory=dict)
+    dropped: List[str] = field(default_factory=list)
+    rollup_rows: int = 0
+    runway: Dict[str, int] = field(default_factory=dict)
+
+
+def month_start(moment: datetime | date) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_covered(partitions: Dict[date, str] | set[date], now: datetime | date) -> int:
+    """Count consecutive months after ``now``'s month that have a partition.
+
+    Returns ``-1`` when the current month itself has no partition.
+    """
+
+    current = month_start(now)
+    if current not in partitions:
+        return -1
+    covered = 0
+    while add_months(current, covered + 1) in partitions:
+        covered += 1
+    return covered
+
+
+async def list_partitions(conn: AsyncConnection, table: PartitionedTable) -> Dict[date, str]:
+    """Return ``{month: partition_name}`` for the attached monthly partitions."""
+
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table.name},
+    )
+    partitions: Dict[date, str] = {}
+    for (name,) in result:
+        match = _SUFFIX.search(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    table: PartitionedTable,
+    *,
+    now: Optional[datetime] = None,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+) -> List[str]:
+    """Create any missing partitions from this month to ``months_ahead`` ahead."""
+
+    current = month_start(now or datetime.utcnow())
+    existing = await list_partitions(conn, table)
+    created: List[str] = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        name = table.partition_name(month)
+        await conn.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table.name}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def refresh_rollups(
+    conn: AsyncConnection, table: PartitionedTable, since: datetime, until: datetime
+) -> int:
+    """Recompute hourly counts for ``[since, until)`` and upsert them."""
+
+    result = await conn.execute(
+        text(
+            f'INSERT INTO "{table.rollup_table}" (bucket, agent, status, entries) '
+            f"SELECT date_trunc('hour', \"{table.column}\"), coalesce(\"{table.agent_column}\", 'unknown'), "
+            f"coalesce(status, 'unknown'), count(*) "
+            f'FROM "{table.name}" '
+            f'WHERE "{table.column}" >= :since AND "{table.column}" < :until '
+            f"GROUP BY 1, 2, 3 "
+            f"ON CONFLICT (bucket, agent, status) DO UPDATE SET entries = EXCLUDED.entries"
+        ),
+        {"since": since, "until": until},
+    )
+    return result.rowcount or 0
+
+
+async def export_partition(conn: AsyncConnection, partition: str, archive_dir: Path) -> Path:
+    """Stream a partition to ``<archive_dir>/<partition>.ndjson.gz``."""
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    target = archive_dir / f"{partition}.ndjson.gz"
+    partial = target.with_suffix(".gz.partial")
+    result = await conn.stream(
+        text(f'SELECT row_to_json(t)::text FROM "{partition}" t').execution_options(yield_per=5000)
+    )
+    rows = 0
+    with gzip.open(partial, "wt", encoding="utf-8") as handle:
+        async for (line,) in result:
+            handle.write(line)
+            handle.write("\n")
+            rows += 1
+    partial.replace(target)
+    logger.info("Archived %s rows from %s to %s", rows, partition, target)
+    return target
+
+
+async def retire_expired(
+    engine: AsyncEngine,
+    table: PartitionedTable,
+    *,
+    now: Optional[datetime] = None,
+    archive_dir: Path = Path(PARTITION_ARCHIVE_DIR),
+    report: Optional[MaintenanceReport] = None,
+) -> MaintenanceReport:
+    """Roll up, archive, detach and drop partitions past the retention window."""
+
+    report = report or MaintenanceReport()
+    cutoff = add_months(month_start(now or datetime.utcnow()), -table.retention_months)
+    async with engine.connect() as conn:
+        partitions = await list_partitions(conn, table)
+
+    for month, name in sorted(partitions.items()):
+        if month >= cutoff:
+            continue
+        start = datetime.combine(month, datetime.min.time())
+        end = datetime.combine(add_months(month, 1), datetime.min.time())
+        async with engine.begin() as conn:
+            report.rollup_rows += await refresh_rollups(conn, table, start, end)
+        async with engine.connect() as conn:
+            report.archived[name] = str(await export_partition(conn, name, archive_dir))
+        async with engine.begin() as conn:
+            await conn.execute(text(f'ALTER TABLE "{table.name}" DETACH PARTITION "{name}"'))
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+        report.dropped.append(name)
+        logger.info("Dropped expired partition %s", name)
+    return report
+
+
+async def run_maintenance(
+    engine: AsyncEngine,
+    *,
+    now: Optional[datetime] = None,
+    archive_dir: Path = Path(PARTITION_ARCHIVE_DIR),
+) -> MaintenanceReport:
+    """Create future partitions, refresh recent rollups and retire old partitions."""
+
+    now = now or datetime.utcnow()
+    report = MaintenanceReport()
+    until = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    since = until - timedelta(hours=ROLLUP_LOOKBACK_HOURS + 1)
+    for table in PARTITIONED_TABLES:
+        async with engine.begin() as conn:
+            report.created.extend(await ensure_partitions(conn, table, now=now))
+            report.rollup_rows += await refresh_rollups(conn, table, since, until)
+        await retire_expired(engine, table, now=now, archive_dir=archive_dir, report=report)
+        async with engine.connect() as conn:
+            covered = months_covered(await list_partitions(conn, table), now)
+        report.runway[table.name] = covered
+        PARTITION_RUNWAY.set(covered, table=table.name)
+
+    short = {name: covered for name, covered in report.runway.items() if covered < PARTITION_MIN_MONTHS_AHEAD}
+    if short:
+        logger.error("Audit partitions run out soon (months ahead per table): %s", short)
+        raise PartitionRunwayError(f"Fewer than {PARTITION_MIN_MONTHS_AHEAD} future partitions for {short}")
+    return report
+
+
+__all__ = [
+    "AGENT_LOGS",
+    "MaintenanceReport",
+    "PARTITIONED_TABLES",
+    "PINKAS",
+    "PartitionRunwayError",
+    "PartitionedTable",
+    "ensure_partitions",
+    "export_partition",
+    "list_partitions",
+    "months_covered",
+    "refresh_rollups",
+    "retire_expired",
+    "run_maintenance",
+]
@@ -0,0 +1,319 @@
+"""Buffered, non-blocking writer for Pinkas audit entries.
+
+Tracing spans, Celery signals and the missions runner all write Pinkas rows.
+Doing that with a session and commit per entry puts a database round trip on
+every traced operation, and sync callers had to spin up an event loop per row.
+
+:class:`PinkasWriter` decouples the two: :meth:`~PinkasWriter.enqueue` is a
+plain, thread-safe call that stamps the entry and puts it on a bounded queue;
+a daemon thread with its own event loop and small connection pool drains the
+queue and writes multi-row ``INSERT`` statements whenever
+``PINKAS_BATCH_SIZE`` entries are waiting or ``PINKAS_FLUSH_INTERVAL`` seconds
+have passed.
+
+Backpressure: when the queue (``PINKAS_QUEUE_SIZE``) is full, sync callers
+wait up to ``PINKAS_ENQUEUE_TIMEOUT`` seconds; callers on a running event loop
+never block. Entries that still do not fit are dropped and counted in
+``pinkas_writer_dropped_total``. Pending entries are flushed on
+:func:`close_pinkas_writer` and at interpreter exit.
+
+Payloads are made JSON-safe when enqueued (unknown objects become strings), so
+one odd payload cannot poison a batch. If a batch insert still fails with a
+data error, it is split and retried in halves until only the bad rows are
+left; only those are dropped.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.metrics import counter, gauge
+from app.db.partitions import PINKAS, ensure_partitions, month_start
+from app.models.pinkas import Pinkas
+
+logger = logging.getLogger(__name__)
+
+PINKAS_BATCH_SIZE = int(os.getenv("PINKAS_BATCH_SIZE", "500"))
+PINKAS_FLUSH_INTERVAL = float(os.getenv("PINKAS_FLUSH_INTERVAL", "1.0"))
+PINKAS_QUEUE_SIZE = int(os.getenv("PINKAS_QUEUE_SIZE", "10000"))
+PINKAS_ENQUEUE_TIMEOUT = float(os.getenv("PINKAS_ENQUEUE_TIMEOUT", "0.5"))
+PINKAS_WRITE_RETRIES = int(os.getenv("PINKAS_WRITE_RETRIES", "3"))
+
+WRITER_ENQUEUED = counter("pinkas_writer_enqueued_total", "Pinkas entries accepted by the buffered writer.")
+WRITER_WRITTEN = counter("pinkas_writer_written_total", "Pinkas entries persisted by the buffered writer.")
+WRITER_DROPPED = counter(
+    "pinkas_writer_dropped_total", "Pinkas entries the buffered writer had to discard.", ["reason"]
+)
+WRITER_QUEUE_DEPTH = gauge("pinkas_writer_queue_depth", "Pinkas entries waiting to be written.")
+
+_STOP = object()
+
+
+class _FlushRequest:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class PinkasWriter:
+    """Queue-backed batch writer for :class:`~app.models.pinkas.Pinkas` rows."""
+
+    def __init__(
+        self,
+        database_url: Any = None,
+        *,
+        batch_size: int = PINKAS_BATCH_SIZE,
+        flush_interval: float = PINKAS_FLUSH_INTERVAL,
+        max_queue: int = PINKAS_QUEUE_SIZE,
+        enqueue_timeout: float = PINKAS_ENQUEUE_TIMEOUT,
+        retries: int = PINKAS_WRITE_RETRIES,
+    ) -> None:
+        if database_url is None:
+            from app.core.database import DATABASE_URL
+
+            database_url = DATABASE_URL
+        self.database_url = database_url
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.retries = retries
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(target=self._run, name="pinkas-writer", daemon=True)
+            self._thread.start()
+
+    def enqueue(
+        self,
+        *,
+        agent: str,
+        thought: Optional[str] = None,
+        action: Optional[str] = None,
+        payload: Optional[dict] = None,
+        status: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> bool:
+        """Buffer one entry; return False if it had to be dropped."""
+
+        if self._closed:
+            WRITER_DROPPED.inc(reason="closed")
+            return False
+        self.start()
+        row = {
+            "id": uuid4(),
+            "agent": agent,
+            "thought": thought,
+            "action": action,
+            "payload": _json_safe(payload or {}),
+            "status": status or "ok",
+            "timestamp": timestamp or datetime.utcnow(),
+        }
+        try:
+            if _on_event_loop():
+                self._queue.put_nowait(row)
+            else:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            WRITER_DROPPED.inc(reason="queue_full")
+            logger.warning("Pinkas writer queue full; dropping entry from %s", agent)
+            return False
+        WRITER_ENQUEUED.inc()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything enqueued so far is written (sync callers only)."""
+
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush pending entries and stop the writer thread."""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Pinkas writer queue still full at shutdown")
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        asyncio.run(self._drain())
+
+    async def _drain(self) -> None:
+        engine = create_async_engine(self.database_url, pool_size=2, max_overflow=0, pool_pre_ping=True)
+        partitioned_month: Optional[date] = None
+        try:
+            stopping = False
+            while not stopping:
+                batch, waiters, stopping = await asyncio.to_thread(self._collect)
+                if month_start(datetime.utcnow()) != partitioned_month:
+                    partitioned_month = await self._ensure_partitions(engine)
+                if batch:
+                    await self._write(engine, batch)
+                for waiter in waiters:
+                    waiter.done.set()
+                WRITER_QUEUE_DEPTH.set(self._queue.qsize())
+        finally:
+            await engine.dispose()
+
+    def _collect(self) -> tuple[List[Dict[str, Any]], List[_FlushRequest], bool]:
+        """Gather up to ``batch_size`` rows, waiting at most ``flush_interval``."""
+
+        batch: List[Dict[str, Any]] = []
+        waiters: List[_FlushRequest] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(remaining, 0.0)) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Drain whatever is left so shutdown loses nothing already accepted.
+                while True:
+                    try:
+                        rest = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(rest, _FlushRequest):
+                        waiters.append(rest)
+                    elif rest is not _STOP:
+                        batch.append(rest)
+                return batch, waiters, True
+            if isinstance(item, _FlushRequest):
+                waiters.append(item)
+                break
+            batch.append(item)
+        return batch, waiters, False
+
+    async def _ensure_partitions(self, engine: AsyncEngine) -> Optional[date]:
+        """Create this month's and upcoming partitions; returns the month covered."""
+
+        try:
+            async with engine.begin() as conn:
+                created = await ensure_partitions(conn, PINKAS)
+        except Exception as exc:  # pragma: no cover - depends on database availability
+            logger.warning("Could not ensure Pinkas partitions, retrying on the next batch: %s", exc)
+            return None
+        if created:
+            logger.warning("Pinkas writer created missing partitions: %s", ", ".join(created))
+        return month_start(datetime.utcnow())
+
+    async def _write(self, engine: AsyncEngine, batch: List[Dict[str, Any]]) -> None:
+        for offset in range(0, len(batch), self.batch_size):
+            await self._write_chunk(engine, batch[offset : offset + self.batch_size], self.retries)
+
+    async def _write_chunk(self, engine: AsyncEngine, chunk: List[Dict[str, Any]], retries: int) -> None:
+        for attempt in range(1, max(1, retries) + 1):
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(insert(Pinkas), chunk)
+                WRITER_WRITTEN.inc(len(chunk))
+                return
+            except (OperationalError, InterfaceError, OSError) as exc:  # pragma: no cover - database down
+                error: Exception = exc
+                if attempt < retries:
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+            except Exception as exc:  # pragma: no cover - depends on row contents
+                # Bad data does not improve with retries; isolate it instead.
+                error = exc
+                break
+        else:
+            WRITER_DROPPED.inc(len(chunk), reason="write_failed")
+            logger.error("Dropping %s Pinkas entries after %s attempts: %s", len(chunk), retries, error)
+            return
+
+        if len(chunk) == 1:
+            WRITER_DROPPED.inc(reason="bad_row")
+            logger.error("Dropping unwritable Pinkas entry from %s: %s", chunk[0].get("agent"), error)
+            return
+        middle = len(chunk) // 2
+        await self._write_chunk(engine, chunk[:middle], 1)
+        await self._write_chunk(engine, chunk[middle:], 1)
+
+
+def _json_safe(payload: Any) -> Any:
+    """Round-trip through JSON, stringifying anything JSON cannot represent."""
+
+    try:
+        return json.loads(json.dumps(payload, default=str))
+    except (TypeError, ValueError):  # e.g. circular references
+        return {"repr": repr(payload)}
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+_writer: Optional[PinkasWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_pinkas_writer() -> PinkasWriter:
+    """Return the process-wide writer, creating it on first use."""
+
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = PinkasWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+def _reset_after_fork() -> None:
+    # A forked child (e.g. a Celery prefork worker) inherits the parent's
+    # writer object but not its thread; start fresh on first use.
+    global _writer
+    _writer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def close_pinkas_writer(timeout: float = 10.0) -> None:
+    """Flush and stop the process-wide writer if one was started."""
+
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout)
+
+
+__all__ = ["PinkasWriter", "close_pinkas_writer", "get_pinkas_writer"]
@@ -1,6 +1,8 @@
 """Async database session and engine management."""
 from __future__ import annotations
 
+import asyncio
+import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
@@ -10,6 +12,8 @@ from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class Base(DeclarativeBase):
     """Declarative base for ORM models."""
@@ -35,11 +39,28 @@ async def get_session() -> AsyncIterator[AsyncSession]:
         yield session
 
 
+async def ensure_audit_partitions() -> None:
+    """Make sure the partitioned audit tables can accept this month's writes."""
+
+    from app.db.partitions import PARTITIONED_TABLES, ensure_partitions
+
+    try:
+        async with engine.begin() as conn:
+            for table in PARTITIONED_TABLES:
+                await ensure_partitions(conn, table)
+    except Exception as exc:  # pragma: no cover - depends on database availability
+        logger.warning("Could not ensure audit table partitions: %s", exc)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
-    """FastAPI lifespan handler to cleanly close the engine."""
+    """FastAPI lifespan handler to flush buffered audit entries and close the engine."""
 
+    await ensure_audit_partitions()
     try:
         yield
     finally:
+        from app.db.pinkas_writer import close_pinkas_writer
+
+        await asyncio.to_thread(close_pinkas_writer)
         await engine.dispose()
@@ -1,12 +1,37 @@
 """FastAPI application entrypoint for core services."""
 from __future__ import annotations
 
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import APIRouter, FastAPI
 
 from app.api import api_router
 from app.api.v1 import agents, logs
 from app.core.database import engine
 from app.db.models import Base
+from app.db.session import lifespan as db_lifespan
+from app.services.moderation import get_moderation_engine
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Preload the moderation model and pool, then run the database lifespan."""
+
+    moderation = get_moderation_engine()
+    try:
+        await moderation.warm_up()
+    except Exception:  # pragma: no cover - the model loads lazily on first use instead
+        logger.exception("Moderation warm-up failed")
+    try:
+        async with db_lifespan(app):
+            yield
+    finally:
+        await moderation.close()
+
 
 app = FastAPI(title="SOD Agency Core API", version="0.1.0", lifespan=lifespan)
 
@@ -5,11 +5,20 @@ from datetime import datetime, timezone
 from typing import Any, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, String, Text, func, or_
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from langgraph_core.text import search_text_sql
+
+# Normalized concatenation of the searchable columns. search_text_sql is the
+# SQL twin of langgraph_core.text.normalize_search_text, so query
+# strings normalized in Python match the indexed expression.
+SEARCH_TEXT_SQL = search_text_sql(
+    "coalesce(title_he, '') || ' ' || coalesce(title_en, '') || ' ' || "
+    "coalesce(source, '') || ' ' || body_he || ' ' || coalesce(body_en, '')"
+)
 
 
 class ContentCategory(Base):
@@ -45,9 +54,18 @@ class ContentItem(Base):
     tags: Mapped[list[str]] = mapped_column(JSONB, default=list)
     metadata: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    search_text: Mapped[str | None] = mapped_column(
+        Text, Computed(SEARCH_TEXT_SQL, persisted=True), nullable=True
+    )
+    search_tsv: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('simple'::regconfig, {SEARCH_TEXT_SQL})", persisted=True),
+        nullable=True,
+    )
     indexed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -60,4 +78,23 @@ class ContentItem(Base):
     __table_args__ = (
         Index("idx_content_category", category_id),
         Index("idx_content_tags", tags),
+        Index(
+            "uq_content_source",
+            source,
+            unique=True,
+            postgresql_where=source.isnot(None),
+        ),
+        Index(
+            "idx_content_search_trgm",
+            search_text,
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index("idx_content_search_tsv", search_tsv, postgresql_using="gin"),
+        Index(
+            "idx_content_index_pending",
+            updated_at,
+            id,
+            postgresql_where=or_(indexed_at.is_(None), updated_at > indexed_at),
+        ),
     )
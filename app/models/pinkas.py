@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Any, Dict
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, Index, String, Text
+from sqlalchemy import DateTime, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -25,14 +25,19 @@ class Pinkas(Base):
     action: Mapped[str | None] = mapped_column(String, nullable=True)
     payload: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
     status: Mapped[str] = mapped_column(String, default="ok")
+    # The table is range-partitioned by month on ``timestamp`` (see
+    # app.db.partitions), so the partition key is part of the primary key.
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False
+        DateTime, primary_key=True, default=datetime.utcnow, nullable=False
     )
 
+    # Keyset pagination orders by (timestamp, id); each filter column leads
+    # its own composite index so filtered pages seek instead of scanning.
     __table_args__ = (
-        Index("idx_pinkas_timestamp", timestamp.desc()),
-        Index("idx_pinkas_agent", agent),
-        Index("idx_pinkas_status", status),
+        Index("idx_pinkas_timestamp", timestamp.desc(), id.desc()),
+        Index("idx_pinkas_agent_timestamp", agent, timestamp.desc(), id.desc()),
+        Index("idx_pinkas_status_timestamp", status, timestamp.desc(), id.desc()),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
 
     def as_dict(self) -> Dict[str, Any]:
@@ -45,3 +50,14 @@ class Pinkas(Base):
             "status": self.status,
             "timestamp": self.timestamp.isoformat() if self.timestamp else None,
         }
+
+
+class PinkasHourlyRollup(Base):
+    """Hourly Pinkas entry counts per agent and status, kept past retention."""
+
+    __tablename__ = "pinkas_hourly_rollups"
+
+    bucket: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    agent: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[str] = mapped_column(String, primary_key=True)
+    entries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,188 @@
+"""Approximate nearest-neighbour index management for pgvector tables.
+
+Without a vector index every similarity query is a sequential scan. This
+module creates and maintains HNSW or IVFFlat indexes and exposes the
+per-query knobs (``hnsw.ef_search`` / ``ivfflat.probes``) that trade recall
+for latency.
+
+The operator class must match the distance operator used in ``ORDER BY`` or
+Postgres silently ignores the index: pgvector queries in this repo use L2
+(``<->``), while the Qdrant collections use cosine. :func:`distance` builds the
+ordering expression that matches a spec's metric.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+OPCLASSES = {
+    "l2": "vector_l2_ops",
+    "cosine": "vector_cosine_ops",
+    "ip": "vector_ip_ops",
+}
+
+ANN_EF_SEARCH = int(os.getenv("ANN_EF_SEARCH", "40"))
+ANN_PROBES = int(os.getenv("ANN_PROBES", "10"))
+
+
+@dataclass(frozen=True)
+class AnnIndexSpec:
+    """Description of a vector index on ``table.column``."""
+
+    table: str
+    column: str = "embedding"
+    method: str = "hnsw"
+    metric: str = "l2"
+    m: int = 16
+    ef_construction: int = 64
+    lists: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.method not in ("hnsw", "ivfflat"):
+            raise ValueError(f"Unsupported ANN method: {self.method}")
+        if self.metric not in OPCLASSES:
+            raise ValueError(f"Unsupported distance metric: {self.metric}")
+
+    @property
+    def name(self) -> str:
+        return f"idx_{self.table}_{self.column}_{self.method}_{self.metric}"
+
+    @property
+    def opclass(self) -> str:
+        return OPCLASSES[self.metric]
+
+
+TORAH_CHUNKS_INDEX = AnnIndexSpec(table="torah_chunks")
+DOCUMENT_EMBEDDINGS_INDEX = AnnIndexSpec(table="document_embeddings")
+
+
+def recommended_lists(row_count: int) -> int:
+    """pgvector guidance: rows/1000 up to 1M rows, sqrt(rows) beyond."""
+
+    if row_count <= 1_000_000:
+        return max(1, row_count // 1000)
+    return int(math.sqrt(row_count))
+
+
+def create_index_sql(spec: AnnIndexSpec, *, row_count: int = 0, concurrently: bool = False) -> str:
+    """Render the ``CREATE INDEX`` statement for ``spec``."""
+
+    if spec.method == "hnsw":
+        options = f"m = {spec.m}, ef_construction = {spec.ef_construction}"
+    else:
+        options = f"lists = {spec.lists or recommended_lists(row_count)}"
+    keyword = "CONCURRENTLY " if concurrently else ""
+    return (
+        f"CREATE INDEX {keyword}IF NOT EXISTS {spec.name} ON {spec.table} "
+        f"USING {spec.method} ({spec.column} {spec.opclass}) WITH ({options})"
+    )
+
+
+def ensure_index(engine: Engine, spec: AnnIndexSpec, *, concurrently: bool = True) -> None:
+    """Create the index if missing without blocking writers when ``concurrently``.
+
+    IVFFlat centroids are trained on existing rows, so the ``lists`` value is
+    derived from the current table size unless fixed on the spec.
+
+    A failed or interrupted concurrent build leaves an INVALID index behind
+    that ``IF NOT EXISTS`` would keep forever; such an index is dropped and
+    built again.
+    """
+
+    with engine.connect() as conn:
+        if concurrently:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        if _index_is_valid(conn, spec.name) is False:
+            logger.warning("ANN index %s is invalid; dropping it before rebuilding", spec.name)
+            keyword = "CONCURRENTLY " if concurrently else ""
+            conn.execute(text(f"DROP INDEX {keyword}IF EXISTS {spec.name}"))
+        row_count = _row_count(conn, spec.table) if spec.method == "ivfflat" else 0
+        statement = create_index_sql(spec, row_count=row_count, concurrently=concurrently)
+        logger.info("Ensuring ANN index: %s", statement)
+        conn.execute(text(statement))
+        if not concurrently:
+            conn.commit()
+
+
+def rebuild_index(engine: Engine, spec: AnnIndexSpec) -> None:
+    """Rebuild an index in place, e.g. after IVFFlat data drift."""
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"REINDEX INDEX CONCURRENTLY {spec.name}"))
+
+
+def drop_index(engine: Engine, spec: AnnIndexSpec) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {spec.name}"))
+
+
+def apply_search_params(
+    session: Session | Connection,
+    *,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> None:
+    """Set per-transaction recall knobs before running a similarity query."""
+
+    if ef_search is not None:
+        session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    if probes is not None:
+        session.execute(text(f"SET LOCAL ivfflat.probes = {int(probes)}"))
+
+
+def distance(column: Any, metric: str, vector: Sequence[float]) -> Any:
+    """Return the ordering expression whose operator matches ``metric``'s opclass."""
+
+    if metric == "l2":
+        return column.l2_distance(vector)
+    if metric == "cosine":
+        return column.cosine_distance(vector)
+    if metric == "ip":
+        return column.max_inner_product(vector)
+    raise ValueError(f"Unsupported distance metric: {metric}")
+
+
+def _index_is_valid(conn: Connection, name: str) -> Optional[bool]:
+    """Return ``pg_index.indisvalid`` for ``name``, or ``None`` if it does not exist."""
+
+    return conn.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"
+        ),
+        {"name": name},
+    ).scalar()
+
+
+def _row_count(conn: Connection, table: str) -> int:
+    # Planner estimate is good enough for sizing and avoids a full COUNT(*).
+    estimate = conn.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"), {"table": table}
+    ).scalar()
+    return max(int(estimate or 0), 0)
+
+
+__all__ = [
+    "ANN_EF_SEARCH",
+    "ANN_PROBES",
+    "AnnIndexSpec",
+    "DOCUMENT_EMBEDDINGS_INDEX",
+    "TORAH_CHUNKS_INDEX",
+    "apply_search_params",
+    "create_index_sql",
+    "distance",
+    "drop_index",
+    "ensure_index",
+    "rebuild_index",
+    "recommended_lists",
+]
@@ -0,0 +1,197 @@
+"""Bulk writers for Torah chunk and content library ingestion.
+
+ORM ``session.add`` per row spends most of a full-Tanakh import in flush
+overhead. This module offers two faster paths:
+
+* :func:`write_torah_chunks` streams rows into ``torah_chunks`` with
+  Postgres binary ``COPY`` (via asyncpg), including the pgvector column.
+* :func:`insert_content_items` writes ``content_items`` with multi-row
+  ``INSERT ... ON CONFLICT DO NOTHING`` so re-imports dedupe on ``source``.
+
+Both return a :class:`BulkWriteReport` with a rows/sec figure. Batch size is
+configurable per call or via ``BULK_WRITE_BATCH_SIZE``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+from uuid import UUID, uuid4
+
+import asyncpg
+from pgvector.asyncpg import register_vector
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.content import ContentItem
+
+logger = logging.getLogger(__name__)
+
+BULK_WRITE_BATCH_SIZE = int(os.getenv("BULK_WRITE_BATCH_SIZE", "2000"))
+
+TORAH_CHUNK_COLUMNS = ("reference", "book", "chunk_index", "content", "embedding")
+
+# asyncpg encodes the bind-parameter count as an int16, so a single statement
+# can carry at most 32767 parameters.
+MAX_QUERY_PARAMETERS = 32767
+
+T = TypeVar("T")
+
+
+@dataclass
+class BulkWriteReport:
+    """Summary of a bulk write operation."""
+
+    table: str
+    rows: int = 0
+    skipped: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    inserted_ids: List[UUID] = field(default_factory=list, repr=False)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "table": self.table,
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "batches": self.batches,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def _batched(rows: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, max(1, size))):
+        yield batch
+
+
+def _max_insert_rows(table: Any) -> int:
+    """Rows per multi-row INSERT that stay under the bind-parameter limit."""
+
+    return max(1, MAX_QUERY_PARAMETERS // max(1, len(table.columns)))
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """Convert a SQLAlchemy URL (any Postgres driver) into a plain asyncpg DSN."""
+
+    url = make_url(database_url)
+    if url.drivername == "postgres" or url.drivername.startswith("postgresql"):
+        url = url.set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+async def copy_torah_chunks(
+    conn: asyncpg.Connection,
+    rows: Iterable[Tuple[str, str, int, str, Sequence[float]]],
+    *,
+    batch_size: int = BULK_WRITE_BATCH_SIZE,
+) -> BulkWriteReport:
+    """Stream ``(reference, book, chunk_index, content, embedding)`` rows via binary COPY."""
+
+    await register_vector(conn)
+    report = BulkWriteReport(table="torah_chunks")
+    started = time.perf_counter()
+    for batch in _batched(rows, batch_size):
+        await conn.copy_records_to_table(
+            "torah_chunks", records=batch, columns=list(TORAH_CHUNK_COLUMNS)
+        )
+        report.rows += len(batch)
+        report.batches += 1
+    report.seconds = time.perf_counter() - started
+    logger.info("COPY torah_chunks: %s", report.as_dict())
+    return report
+
+
+async def write_torah_chunks(
+    database_url: str,
+    reference: str,
+    book: str,
+    chunks: Sequence[str],
+    embeddings: Sequence[Sequence[float]],
+    *,
+    batch_size: int = BULK_WRITE_BATCH_SIZE,
+) -> BulkWriteReport:
+    """Bulk-load embedded chunks for one reference into ``torah_chunks``."""
+
+    rows = (
+        (reference, book, idx, content, list(vector))
+        for idx, (content, vector) in enumerate(zip(chunks, embeddings))
+    )
+    conn = await asyncpg.connect(asyncpg_dsn(database_url))
+    try:
+        async with conn.transaction():
+            return await copy_torah_chunks(conn, rows, batch_size=batch_size)
+    finally:
+        await conn.close()
+
+
+async def insert_content_items(
+    session: AsyncSession,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    batch_size: int = BULK_WRITE_BATCH_SIZE,
+) -> BulkWriteReport:
+    """Insert content item dicts in multi-row batches, skipping known ``source`` refs.
+
+    Each row accepts the ``ContentItem`` column names (``category_id``,
+    ``title_he``, ``body_he``, ``source``, ``tags``, ``metadata`` ...) and may
+    carry its own ``id``. The ids of newly inserted rows are collected on the
+    report so callers can limit follow-up work (e.g. RAG indexing) to fresh
+    content, including rows without a ``source``.
+
+    ``batch_size`` is capped so one statement never binds more parameters
+    than asyncpg allows.
+    """
+
+    table = ContentItem.__table__
+    batch_size = min(batch_size, _max_insert_rows(table))
+    report = BulkWriteReport(table=table.name)
+    started = time.perf_counter()
+    for batch in _batched(rows, batch_size):
+        values = [
+            {
+                "id": uuid4(),
+                "is_active": True,
+                **row,
+                "tags": list(row.get("tags") or []),
+                "metadata": dict(row.get("metadata") or {}),
+            }
+            for row in batch
+        ]
+        stmt = (
+            pg_insert(table)
+            .values(values)
+            .on_conflict_do_nothing(
+                index_elements=[table.c.source], index_where=table.c.source.isnot(None)
+            )
+            .returning(table.c.id)
+        )
+        result = await session.execute(stmt)
+        inserted = [row_id for (row_id,) in result.all()]
+        await session.commit()
+
+        report.rows += len(inserted)
+        report.skipped += len(values) - len(inserted)
+        report.batches += 1
+        report.inserted_ids.extend(inserted)
+    report.seconds = time.perf_counter() - started
+    logger.info("INSERT content_items: %s", report.as_dict())
+    return report
+
+
+__all__ = [
+    "BulkWriteReport",
+    "asyncpg_dsn",
+    "copy_torah_chunks",
+    "insert_content_items",
+    "write_torah_chunks",
+]
@@ -13,7 +13,8 @@ class SefariaClient:
 
     This client exposes a single method, :meth:`fetch_text`, which returns the
     raw JSON document for a given reference. It can be used as an async context
-    manager to reuse the same HTTP connection pool.
+    manager to reuse the same HTTP connection pool, or be handed an existing
+    ``client`` (e.g. a worker's shared pool), which it then never closes.
     """
 
     def __init__(
@@ -21,17 +22,21 @@ class SefariaClient:
         base_url: str | None = None,
         *,
         timeout: float = 30.0,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> None:
         self.base_url = (base_url or config.sefaria_base_url).rstrip("/")
         self.timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[httpx.AsyncClient] = client
+        self._owns_client = client is None
 
     async def __aenter__(self) -> "SefariaClient":
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._owns_client = True
         return self
 
     async def __aexit__(self, *_exc_info: object) -> None:
-        if self._client is not None:
+        if self._client is not None and self._owns_client:
             await self._client.aclose()
             self._client = None
 
@@ -61,7 +66,7 @@ class SefariaClient:
 
         url = f"{self.base_url}/texts/{reference}"
         params = {"lang": language, "commentary": int(bool(commentary)), "context": 0}
-        response = await self._client.get(url, params=params)
+        response = await self._client.get(url, params=params, timeout=self.timeout)
         response.raise_for_status()
         return response.json()
 
@@ -12,6 +12,15 @@ from sqlmodel import Field, SQLModel, create_engine, select
 
 from app.core.config import config
 from app.core.engine import Engine
+from app.rag.ann_index import (
+    ANN_EF_SEARCH,
+    ANN_PROBES,
+    TORAH_CHUNKS_INDEX,
+    apply_search_params,
+    distance,
+    ensure_index,
+)
+from app.services.embedding_cache import get_embedding_cache
 
 
 class TorahChunk(SQLModel, table=True):
@@ -54,11 +63,10 @@ def ensure_vector_tables() -> None:
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         conn.commit()
     SQLModel.metadata.create_all(engine)
+    ensure_index(engine, TORAH_CHUNKS_INDEX)
 
 
-def embed_texts(texts: Sequence[str]) -> List[List[float]]:
-    """Generate embeddings for a sequence of texts using LiteLLM."""
-
+def _embed_uncached(texts: List[str]) -> List[List[float]]:
     # Ensure LiteLLM is configured for the local Ollama/OpenAI endpoint.
     Engine()
     vectors: List[List[float]] = []
@@ -68,6 +76,17 @@ def embed_texts(texts: Sequence[str]) -> List[List[float]]:
     return vectors
 
 
+def embed_texts(texts: Sequence[str]) -> List[List[float]]:
+    """Generate embeddings for a sequence of texts using LiteLLM.
+
+    Previously embedded texts are served from the shared embedding cache.
+    """
+
+    if not texts:
+        return []
+    return get_embedding_cache().embed(config.embedding_model, texts, _embed_uncached)
+
+
 def store_chunks(
     reference: str,
     book: str,
@@ -97,15 +116,26 @@ def store_chunks(
     return inserted
 
 
-def search_halacha(query: str, limit: int = 5) -> List[TorahChunk]:
-    """Return the most relevant halachic chunks for a given query."""
+def search_halacha(
+    query: str,
+    limit: int = 5,
+    *,
+    ef_search: Optional[int] = ANN_EF_SEARCH,
+    probes: Optional[int] = ANN_PROBES,
+) -> List[TorahChunk]:
+    """Return the most relevant halachic chunks for a given query.
+
+    ``ef_search``/``probes`` tune recall of the HNSW/IVFFlat index on
+    ``torah_chunks``; higher values are slower but closer to exact search.
+    """
 
     query_embedding = embed_texts([query])[0]
     session_factory = get_session_factory()
     with session_factory() as session:
+        apply_search_params(session, ef_search=ef_search, probes=probes)
         stmt = (
             select(TorahChunk)
-            .order_by(TorahChunk.embedding.l2_distance(query_embedding))
+            .order_by(distance(TorahChunk.embedding, TORAH_CHUNKS_INDEX.metric, query_embedding))
             .limit(limit)
         )
         return list(session.exec(stmt).all())
@@ -40,3 +40,14 @@ class ContentItemRead(ContentItemBase):
     updated_at: datetime
     indexed_at: datetime | None = None
     category: ContentCategoryRead
+
+
+class ContentSearchHit(BaseModel):
+    """Hybrid search result with fusion diagnostics."""
+
+    item: ContentItemRead
+    score: float
+    lexical_rank: Optional[int] = None
+    vector_rank: Optional[int] = None
+    rerank_score: Optional[float] = None
+    sources: list[str] = Field(default_factory=list)
@@ -0,0 +1,167 @@
+"""Semantic answer cache for retrieval-augmented generation.
+
+Questions are stored with their embedding in a companion Qdrant collection
+(``<collection>__answers``). A new question whose embedding is within the
+similarity threshold of a cached one reuses that answer and its sources,
+skipping retrieval and generation entirely. Entries expire after a TTL and the
+whole companion collection is dropped whenever documents are upserted into the
+source collection, so answers never outlive the context they were built from.
+
+Configuration (environment variables):
+    RAG_ANSWER_CACHE_ENABLED=1
+    RAG_ANSWER_CACHE_THRESHOLD=0.92   # cosine similarity
+    RAG_ANSWER_CACHE_TTL=86400        # seconds
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.core.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+RAG_ANSWER_CACHE_ENABLED = os.getenv("RAG_ANSWER_CACHE_ENABLED", "1") not in ("0", "false", "False")
+RAG_ANSWER_CACHE_THRESHOLD = float(os.getenv("RAG_ANSWER_CACHE_THRESHOLD", "0.92"))
+RAG_ANSWER_CACHE_TTL = int(os.getenv("RAG_ANSWER_CACHE_TTL", "86400"))
+
+CACHE_HITS = counter("rag_answer_cache_hits_total", "Semantic answer cache hits.", ["collection"])
+CACHE_MISSES = counter("rag_answer_cache_misses_total", "Semantic answer cache misses.", ["collection"])
+CACHE_SECONDS_SAVED = counter(
+    "rag_answer_cache_seconds_saved_total",
+    "Generation latency avoided by serving cached answers.",
+    ["collection"],
+)
+CACHE_INVALIDATIONS = counter(
+    "rag_answer_cache_invalidations_total",
+    "Answer cache drops caused by document upserts.",
+    ["collection"],
+)
+
+
+class SemanticAnswerCache:
+    """Nearest-neighbour lookup of previously generated answers in Qdrant."""
+
+    def __init__(
+        self,
+        vector_db_url: str,
+        *,
+        threshold: float = RAG_ANSWER_CACHE_THRESHOLD,
+        ttl_seconds: int = RAG_ANSWER_CACHE_TTL,
+        enabled: bool = RAG_ANSWER_CACHE_ENABLED,
+    ) -> None:
+        self.vector_db_url = vector_db_url.rstrip("/")
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+    @staticmethod
+    def cache_collection(collection: str) -> str:
+        return f"{collection}__answers"
+
+    async def lookup(self, collection: str, vector: Sequence[float]) -> Optional[Dict[str, Any]]:
+        """Return the cached ``{"answer", "sources"}`` for a similar question, if any."""
+
+        if not self.enabled or not vector:
+            return None
+
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.post(
+                    f"{self.vector_db_url}/collections/{self.cache_collection(collection)}/points/search",
+                    json={
+                        "vector": list(vector),
+                        "limit": 1,
+                        "with_payload": True,
+                        "score_threshold": self.threshold,
+                        "filter": {"must": [{"key": "expires_at", "range": {"gt": time.time()}}]},
+                    },
+                )
+            if response.status_code == 404:
+                CACHE_MISSES.inc(collection=collection)
+                return None
+            response.raise_for_status()
+            points: List[Dict[str, Any]] = response.json().get("result", [])
+        except httpx.HTTPError as exc:
+            logger.warning("Answer cache lookup failed for %s: %s", collection, exc)
+            return None
+
+        if not points:
+            CACHE_MISSES.inc(collection=collection)
+            return None
+
+        payload = points[0].get("payload", {})
+        CACHE_HITS.inc(collection=collection)
+        CACHE_SECONDS_SAVED.inc(float(payload.get("generation_seconds", 0.0)), collection=collection)
+        return {"answer": payload.get("answer", ""), "sources": payload.get("sources", [])}
+
+    async def store(
+        self,
+        collection: str,
+        question: str,
+        vector: Sequence[float],
+        result: Dict[str, Any],
+        *,
+        generation_seconds: float,
+    ) -> None:
+        """Cache a generated answer keyed by its question embedding."""
+
+        if not self.enabled or not vector:
+            return
+
+        name = self.cache_collection(collection)
+        now = time.time()
+        point = {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{collection}:{question.strip().casefold()}")),
+            "vector": list(vector),
+            "payload": {
+                "question": question,
+                "answer": result.get("answer", ""),
+                "sources": result.get("sources", []),
+                "generation_seconds": round(generation_seconds, 3),
+                "created_at": now,
+                "expires_at": now + self.ttl_seconds,
+            },
+        }
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                info = await client.get(f"{self.vector_db_url}/collections/{name}")
+                if info.status_code == 404:
+                    create = await client.put(
+                        f"{self.vector_db_url}/collections/{name}",
+                        json={"vectors": {"size": len(vector), "distance": "Cosine"}},
+                    )
+                    create.raise_for_status()
+                elif info.status_code != 200:
+                    info.raise_for_status()
+                response = await client.put(
+                    f"{self.vector_db_url}/collections/{name}/points", json={"points": [point]}
+                )
+                response.raise_for_status()
+        except httpx.HTTPError as exc:
+            logger.warning("Answer cache store failed for %s: %s", collection, exc)
+
+    async def invalidate(self, collection: str) -> None:
+        """Drop every cached answer for ``collection`` (called after upserts)."""
+
+        if not self.enabled:
+            return
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.delete(
+                    f"{self.vector_db_url}/collections/{self.cache_collection(collection)}"
+                )
+            if response.status_code not in (200, 404):
+                response.raise_for_status()
+        except httpx.HTTPError as exc:
+            logger.warning("Answer cache invalidation failed for %s: %s", collection, exc)
+            return
+        CACHE_INVALIDATIONS.inc(collection=collection)
+
+
+__all__ = ["SemanticAnswerCache"]
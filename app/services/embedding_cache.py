@@ -0,0 +1,286 @@
+"""Content-addressed embedding cache shared by the RAG vector stores.
+
+Embeddings are keyed by ``sha256(model + normalized text)`` so the same
+Sefaria segment or popular question is only ever embedded once per model.
+Lookups go through an in-process LRU tier first and then a SQLite file on
+disk; both tiers are bounded and evict least-recently-used entries.
+
+Configuration (environment variables):
+    EMBED_CACHE_PATH=.cache/embeddings.sqlite3   # empty string disables disk tier
+    EMBED_CACHE_MEMORY_ITEMS=10000
+    EMBED_CACHE_MAX_BYTES=536870912              # 512 MiB on disk
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", ".cache/embeddings.sqlite3")
+EMBED_CACHE_MEMORY_ITEMS = int(os.getenv("EMBED_CACHE_MEMORY_ITEMS", "10000"))
+EMBED_CACHE_MAX_BYTES = int(os.getenv("EMBED_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+Vector = List[float]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache key."""
+
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + SQLite) embedding cache."""
+
+    def __init__(
+        self,
+        path: Optional[str] = EMBED_CACHE_PATH,
+        *,
+        memory_items: int = EMBED_CACHE_MEMORY_ITEMS,
+        max_bytes: int = EMBED_CACHE_MAX_BYTES,
+    ) -> None:
+        self.memory_items = max(0, memory_items)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # Tuples, so a caller mutating a returned vector cannot corrupt the cache.
+        self._memory: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        if path:
+            self._open_disk(path)
+
+    def _open_disk(self, path: str) -> None:
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_access ON embeddings(last_access)")
+            row = db.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Embedding disk cache unavailable at %s: %s", path, exc)
+            return
+        self._db = db
+        self._disk_bytes = int(row[0])
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory_items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[Vector]]:
+        """Return cached vectors (or ``None``) for each text."""
+
+        keys = [cache_key(model, text) for text in texts]
+        found: List[Optional[Vector]] = [None] * len(keys)
+        pending: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for idx, key in enumerate(keys):
+                cached = self._memory.get(key)
+                if cached is not None:
+                    self._memory.move_to_end(key)
+                    found[idx] = list(cached)
+                else:
+                    pending.setdefault(key, []).append(idx)
+
+            if pending and self._db is not None:
+                for key, vector in self._read_disk(list(pending)).items():
+                    self._remember(key, vector)
+                    self.disk_hits += len(pending[key])
+                    for idx in pending.pop(key):
+                        found[idx] = list(vector)
+
+            missing = sum(len(indexes) for indexes in pending.values())
+            self.misses += missing
+            self.hits += len(keys) - missing
+        return found
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store freshly computed vectors in both tiers."""
+
+        rows: Dict[str, tuple] = {}
+        now = time.time()
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = cache_key(model, text)
+                self._remember(key, vector)
+                rows[key] = (key, model, array("f", vector).tobytes(), now)
+            if rows and self._db is not None:
+                self._write_disk(list(rows.values()))
+
+    def embed(
+        self, model: str, texts: Sequence[str], compute: Callable[[List[str]], List[Vector]]
+    ) -> List[Vector]:
+        """Return embeddings for ``texts``, calling ``compute`` only for misses."""
+
+        found = self.get_many(model, texts)
+        missing = _unique_missing(texts, found)
+        if missing:
+            vectors = compute(missing)
+            self.put_many(model, missing, vectors)
+            found = _fill(texts, found, {normalize_text(t): v for t, v in zip(missing, vectors)})
+        return found  # type: ignore[return-value]
+
+    async def aembed(
+        self,
+        model: str,
+        texts: Sequence[str],
+        compute: Callable[[List[str]], Awaitable[List[Vector]]],
+    ) -> List[Vector]:
+        """Async variant of :meth:`embed`; disk I/O runs off the event loop."""
+
+        lookup = asyncio.to_thread if self._db is not None else _call_inline
+        found = await lookup(self.get_many, model, texts)
+        missing = _unique_missing(texts, found)
+        if missing:
+            vectors = await compute(missing)
+            await lookup(self.put_many, model, missing, vectors)
+            found = _fill(texts, found, {normalize_text(t): v for t, v in zip(missing, vectors)})
+        return found  # type: ignore[return-value]
+
+    def _remember(self, key: str, vector: Sequence[float]) -> None:
+        if not self.memory_items:
+            return
+        self._memory[key] = tuple(vector)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, Vector]:
+        assert self._db is not None
+        result: Dict[str, Vector] = {}
+        try:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    values = array("f")
+                    values.frombytes(blob)
+                    result[key] = values.tolist()
+            if result:
+                self._db.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(time.time(), key) for key in result],
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Embedding disk cache read failed: %s", exc)
+        return result
+
+    def _write_disk(self, rows: list[tuple]) -> None:
+        assert self._db is not None
+        try:
+            self._db.execute("BEGIN")
+            # Replaced rows only change the total by their size difference.
+            replaced: Dict[str, int] = {}
+            for start in range(0, len(rows), 500):
+                chunk = [row[0] for row in rows[start : start + 500]]
+                placeholders = ",".join("?" * len(chunk))
+                replaced.update(
+                    self._db.execute(
+                        f"SELECT key, LENGTH(vector) FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_access) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute("COMMIT")
+            self._disk_bytes += sum(len(row[2]) - replaced.get(row[0], 0) for row in rows)
+            if self.max_bytes and self._disk_bytes > self.max_bytes:
+                self._evict_disk()
+        except sqlite3.Error as exc:
+            logger.warning("Embedding disk cache write failed: %s", exc)
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+
+    def _evict_disk(self) -> None:
+        """Drop least-recently-used rows until the tier is at 90% of its budget."""
+
+        assert self._db is not None
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        excess = self._disk_bytes - target
+        rows = self._db.execute(
+            "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_access"
+        )
+        doomed = []
+        for key, size in rows:
+            if freed >= excess:
+                break
+            doomed.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM embeddings WHERE key = ?", doomed)
+        self._disk_bytes -= freed
+        logger.info("Evicted %d embeddings (%d bytes) from disk cache", len(doomed), freed)
+
+
+def _unique_missing(texts: Sequence[str], found: Sequence[Optional[Vector]]) -> List[str]:
+    seen: Dict[str, str] = {}
+    for text, vector in zip(texts, found):
+        if vector is None:
+            seen.setdefault(normalize_text(text), text)
+    return list(seen.values())
+
+
+def _fill(
+    texts: Sequence[str], found: List[Optional[Vector]], computed: Dict[str, Sequence[float]]
+) -> List[Optional[Vector]]:
+    return [
+        vector if vector is not None else list(computed[normalize_text(text)])
+        for text, vector in zip(texts, found)
+    ]
+
+
+async def _call_inline(func, *args):  # noqa: ANN001
+    return func(*args)
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache."""
+
+    return EmbeddingCache()
+
+
+__all__ = ["EmbeddingCache", "cache_key", "get_embedding_cache", "normalize_text"]
@@ -0,0 +1,245 @@
+"""Batched, concurrent embedding engine for the Ollama embedding API.
+
+The engine keeps one pooled :class:`httpx.AsyncClient` per event loop and
+fans batches of texts out to Ollama with a bounded number of in-flight
+requests. Newer Ollama releases accept a list of inputs on ``/api/embed``; when
+the server only exposes the legacy single-prompt ``/api/embeddings`` endpoint
+the engine falls back to it transparently.
+
+Each loop's client is owned by a small task on that loop which closes it when
+the loop shuts down (``asyncio.run`` and uvicorn cancel pending tasks then).
+State for loops that have since closed is dropped the next time any loop binds.
+
+Tuning knobs (environment variables):
+    EMBED_MAX_IN_FLIGHT=4   # concurrent HTTP requests against Ollama
+    EMBED_BATCH_SIZE=32     # texts per /api/embed request
+    EMBED_TIMEOUT=60        # per-request timeout in seconds
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+EMBED_MAX_IN_FLIGHT = int(os.getenv("EMBED_MAX_IN_FLIGHT", "4"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_TIMEOUT = float(os.getenv("EMBED_TIMEOUT", "60"))
+
+
+@dataclass
+class _LoopState:
+    client: httpx.AsyncClient
+    semaphore: asyncio.Semaphore
+    closer: asyncio.Task
+
+
+async def _close_on_shutdown(client: httpx.AsyncClient) -> None:
+    """Park until the owning loop cancels its tasks, then close ``client`` there."""
+
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.aclose()
+
+
+@dataclass
+class EmbeddingStats:
+    """Cumulative throughput counters for an embedding engine."""
+
+    texts: int = 0
+    tokens: int = 0
+    requests: int = 0
+    seconds: float = 0.0
+
+    @property
+    def texts_per_second(self) -> float:
+        return self.texts / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "texts": self.texts,
+            "tokens": self.tokens,
+            "requests": self.requests,
+            "seconds": round(self.seconds, 3),
+            "texts_per_second": round(self.texts_per_second, 2),
+            "tokens_per_second": round(self.tokens_per_second, 2),
+        }
+
+
+class OllamaEmbeddingEngine:
+    """Embed texts through Ollama with batching and bounded concurrency."""
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        *,
+        max_in_flight: int = EMBED_MAX_IN_FLIGHT,
+        batch_size: int = EMBED_BATCH_SIZE,
+        timeout: float = EMBED_TIMEOUT,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_in_flight = max(1, max_in_flight)
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.stats = EmbeddingStats()
+        self._batch_endpoint: Optional[bool] = None
+        # Connections and semaphores cannot be shared across loops, so each
+        # loop gets its own. Both reference their loop, so entries are swept
+        # explicitly once the loop is closed rather than keyed weakly.
+        self._loops: Dict[asyncio.AbstractEventLoop, _LoopState] = {}
+        self._loops_lock = threading.Lock()
+
+    def _bind_loop(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """Return the pooled client and limiter for the running event loop."""
+
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            state = self._loops.get(loop)
+            if state is None or state.client.is_closed:
+                self._forget_closed_loops()
+                client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_in_flight,
+                        max_keepalive_connections=self.max_in_flight,
+                    ),
+                )
+                state = self._loops[loop] = _LoopState(
+                    client=client,
+                    semaphore=asyncio.Semaphore(self.max_in_flight),
+                    closer=loop.create_task(_close_on_shutdown(client)),
+                )
+        return state.client, state.semaphore
+
+    def _forget_closed_loops(self) -> None:
+        for loop in [loop for loop in self._loops if loop.is_closed()]:
+            state = self._loops.pop(loop)
+            if not state.client.is_closed:
+                # The loop closed without cancelling its tasks; its sockets go with it.
+                logger.warning("Dropping embedding client of an event loop closed without shutdown")
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed ``texts`` preserving input order."""
+
+        if not texts:
+            return []
+
+        started = time.perf_counter()
+        batches = [
+            list(texts[start : start + self.batch_size])
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        results = await asyncio.gather(*(self._embed_batch(batch) for batch in batches))
+
+        embeddings: List[List[float]] = []
+        tokens = 0
+        for vectors, batch_tokens in results:
+            embeddings.extend(vectors)
+            tokens += batch_tokens
+
+        elapsed = time.perf_counter() - started
+        self.stats.texts += len(texts)
+        self.stats.tokens += tokens
+        self.stats.seconds += elapsed
+        logger.info(
+            "Embedded %d texts (%d tokens) in %.2fs: %.1f texts/s, %.1f tokens/s",
+            len(texts),
+            tokens,
+            elapsed,
+            len(texts) / elapsed if elapsed else 0.0,
+            tokens / elapsed if elapsed else 0.0,
+        )
+        return embeddings
+
+    async def _embed_batch(self, batch: List[str]) -> tuple[List[List[float]], int]:
+        if self._batch_endpoint is not False:
+            try:
+                return await self._embed_batch_endpoint(batch)
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != 404:
+                    raise
+                logger.info("Ollama /api/embed unavailable; falling back to /api/embeddings")
+                self._batch_endpoint = False
+
+        results = await asyncio.gather(*(self._embed_single(text) for text in batch))
+        vectors = [vector for vector, _ in results]
+        tokens = sum(count for _, count in results)
+        return vectors, tokens
+
+    async def _embed_batch_endpoint(self, batch: List[str]) -> tuple[List[List[float]], int]:
+        client, semaphore = self._bind_loop()
+        async with semaphore:
+            response = await client.post(
+                f"{self.base_url}/api/embed", json={"model": self.model, "input": batch}
+            )
+        self.stats.requests += 1
+        response.raise_for_status()
+        payload = response.json()
+        vectors = payload.get("embeddings")
+        if not isinstance(vectors, list) or len(vectors) != len(batch):
+            raise ValueError("Embedding response missing 'embeddings' vectors")
+        self._batch_endpoint = True
+        tokens = payload.get("prompt_eval_count")
+        if not isinstance(tokens, int):
+            tokens = sum(_estimate_tokens(text) for text in batch)
+        return vectors, tokens
+
+    async def _embed_single(self, text: str) -> tuple[List[float], int]:
+        client, semaphore = self._bind_loop()
+        async with semaphore:
+            response = await client.post(
+                f"{self.base_url}/api/embeddings", json={"model": self.model, "prompt": text}
+            )
+        self.stats.requests += 1
+        response.raise_for_status()
+        vector = response.json().get("embedding")
+        if not isinstance(vector, list):
+            raise ValueError("Embedding response missing 'embedding' vector")
+        return vector, _estimate_tokens(text)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients of every loop; each closes on its own loop."""
+
+        current = asyncio.get_running_loop()
+        with self._loops_lock:
+            states, self._loops = self._loops, {}
+        for loop, state in states.items():
+            if loop is current:
+                state.closer.cancel()
+                await state.client.aclose()
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(state.closer.cancel)
+                asyncio.run_coroutine_threadsafe(state.client.aclose(), loop)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count for servers that do not report ``prompt_eval_count``."""
+
+    return len(text.split())
+
+
+@lru_cache(maxsize=1)
+def get_embedding_engine() -> OllamaEmbeddingEngine:
+    """Return the shared embedding engine configured from the environment."""
+
+    from app.services.rag_client import EMBEDDING_MODEL_NAME, OLLAMA_BASE_URL
+
+    return OllamaEmbeddingEngine(OLLAMA_BASE_URL, EMBEDDING_MODEL_NAME)
+
+
+__all__ = ["EmbeddingStats", "OllamaEmbeddingEngine", "get_embedding_engine"]
@@ -0,0 +1,230 @@
+"""Hybrid lexical + vector retrieval over the content library.
+
+Dense vector search misses exact references ("Tehillim 121") and rare Hebrew
+words, while lexical search misses paraphrases. :class:`HybridRetriever` runs
+both and merges them with reciprocal rank fusion (RRF):
+
+* Lexical side: the generated ``content_items.search_text``/``search_tsv``
+  columns (niqqud-stripped, lowercased) backed by trigram and full-text GIN
+  indexes.
+* Vector side: :func:`app.services.rag_client.query` against the Qdrant
+  collection populated by :class:`~app.services.rag_pipeline.RAGPipeline`.
+
+An optional cross-encoder reranks the fused candidates locally. It requires
+``sentence-transformers`` (``pip install sentence-transformers``); without it
+the fused order is returned unchanged.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import util
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
+
+from langgraph_core.text import normalize_search_text
+from app.models.content import ContentCategory, ContentItem
+from app.services import rag_client
+
+logger = logging.getLogger(__name__)
+
+if util.find_spec("sentence_transformers") is not None:
+    from sentence_transformers import CrossEncoder
+else:  # pragma: no cover - optional dependency
+    CrossEncoder = None  # type: ignore
+
+RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_RERANK_MODEL = os.getenv(
+    "HYBRID_RERANK_MODEL", "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+)
+
+
+@dataclass
+class HybridHit:
+    """A fused retrieval result."""
+
+    item: ContentItem
+    score: float
+    lexical_rank: Optional[int] = None
+    vector_rank: Optional[int] = None
+    rerank_score: Optional[float] = None
+    sources: List[str] = field(default_factory=list)
+
+
+def lexical_condition(query: str) -> Any:
+    """Indexed predicate matching ``query`` against the normalized search columns.
+
+    ``ILIKE`` on ``search_text`` is served by the trigram GIN index; the
+    ``@@`` match by the full-text GIN index.
+    """
+
+    normalized = normalize_search_text(query)
+    return or_(
+        ContentItem.search_tsv.op("@@")(func.plainto_tsquery(literal("simple"), normalized)),
+        ContentItem.search_text.ilike(f"%{_escape_like(normalized)}%", escape="\\"),
+    )
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], *, k: int = RRF_K) -> Dict[str, float]:
+    """Fuse ranked id lists: ``score(id) = sum(1 / (k + rank))``."""
+
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class HybridRetriever:
+    """Combine indexed lexical search and vector search over ``ContentItem``."""
+
+    def __init__(self, session: AsyncSession, *, collection: str = "torah") -> None:
+        self.session = session
+        self.collection = collection
+
+    async def search(
+        self,
+        query: str,
+        *,
+        top_k: int = 10,
+        candidates: int = 50,
+        category_slug: Optional[str] = None,
+        rerank: bool = False,
+    ) -> List[HybridHit]:
+        """Return up to ``top_k`` fused hits for ``query``."""
+
+        lexical_ids = await self.lexical_ids(query, limit=candidates, category_slug=category_slug)
+        vector_ids = await self.vector_ids(query, limit=candidates)
+
+        fused = reciprocal_rank_fusion([lexical_ids, vector_ids])
+        ordered = sorted(fused, key=fused.get, reverse=True)[: max(candidates, top_k)]
+        items = await self._load_items(ordered, category_slug=category_slug)
+
+        lexical_rank = {key: rank for rank, key in enumerate(lexical_ids, start=1)}
+        vector_rank = {key: rank for rank, key in enumerate(vector_ids, start=1)}
+        hits = [
+            HybridHit(
+                item=items[key],
+                score=fused[key],
+                lexical_rank=lexical_rank.get(key),
+                vector_rank=vector_rank.get(key),
+                sources=[
+                    name
+                    for name, ranks in (("lexical", lexical_rank), ("vector", vector_rank))
+                    if key in ranks
+                ],
+            )
+            for key in ordered
+            if key in items
+        ]
+
+        if rerank and hits:
+            hits = await self._rerank(query, hits)
+        return hits[:top_k]
+
+    def lexical_query(self, query: str, *, category_slug: Optional[str] = None) -> Select:
+        normalized = normalize_search_text(query)
+        rank = func.greatest(
+            func.ts_rank_cd(ContentItem.search_tsv, func.plainto_tsquery(literal("simple"), normalized)),
+            func.similarity(ContentItem.search_text, normalized),
+        )
+        stmt = select(ContentItem.id).where(
+            ContentItem.is_active.is_(True), lexical_condition(query)
+        )
+        if category_slug:
+            stmt = stmt.join(ContentCategory).where(ContentCategory.slug == category_slug)
+        return stmt.order_by(rank.desc())
+
+    async def lexical_ids(
+        self, query: str, *, limit: int = 50, category_slug: Optional[str] = None
+    ) -> List[str]:
+        if not normalize_search_text(query):
+            return []
+        result = await self.session.execute(
+            self.lexical_query(query, category_slug=category_slug).limit(limit)
+        )
+        return [str(row_id) for row_id in result.scalars().all()]
+
+    async def vector_ids(self, query: str, *, limit: int = 50) -> List[str]:
+        try:
+            search = await rag_client.query(self.collection, query, top_k=limit)
+        except Exception as exc:  # pragma: no cover - depends on vector DB availability
+            logger.warning("Vector retrieval failed; using lexical results only: %s", exc)
+            return []
+        return [match["id"] for match in search.get("matches", [])]
+
+    async def _load_items(
+        self, ids: Sequence[str], *, category_slug: Optional[str] = None
+    ) -> Dict[str, ContentItem]:
+        uuids = [_as_uuid(key) for key in ids]
+        uuids = [value for value in uuids if value is not None]
+        if not uuids:
+            return {}
+        stmt = (
+            select(ContentItem)
+            .options(joinedload(ContentItem.category))
+            .where(ContentItem.id.in_(uuids), ContentItem.is_active.is_(True))
+        )
+        if category_slug:
+            stmt = stmt.join(ContentCategory).where(ContentCategory.slug == category_slug)
+        result = await self.session.execute(stmt)
+        return {str(item.id): item for item in result.scalars().unique().all()}
+
+    async def _rerank(self, query: str, hits: List[HybridHit]) -> List[HybridHit]:
+        # The first call downloads and loads the model; keep that off the loop.
+        model = await asyncio.to_thread(get_cross_encoder)
+        if model is None:
+            return hits
+        pairs = [(query, _item_text(hit.item)) for hit in hits]
+        scores = await asyncio.to_thread(model.predict, pairs)
+        for hit, score in zip(hits, scores):
+            hit.rerank_score = float(score)
+        return sorted(hits, key=lambda hit: hit.rerank_score or 0.0, reverse=True)
+
+
+_cross_encoder_lock = threading.Lock()
+
+
+def get_cross_encoder() -> Optional[Any]:
+    """Load the optional local cross-encoder once per process (blocking)."""
+
+    with _cross_encoder_lock:
+        return _load_cross_encoder()
+
+
+@lru_cache(maxsize=1)
+def _load_cross_encoder() -> Optional[Any]:
+    if CrossEncoder is None:
+        logger.warning("sentence-transformers not installed; skipping rerank")
+        return None
+    logger.info("Loading cross-encoder", extra={"model": HYBRID_RERANK_MODEL})
+    return CrossEncoder(HYBRID_RERANK_MODEL)
+
+
+def _item_text(item: ContentItem) -> str:
+    return "\n".join(
+        value for value in (item.title_he or item.title_en, item.body_he, item.body_en) if value
+    )
+
+
+def _as_uuid(value: str) -> Optional[UUID]:
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+__all__ = ["HybridHit", "HybridRetriever", "lexical_condition", "reciprocal_rank_fusion"]
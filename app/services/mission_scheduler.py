@@ -0,0 +1,234 @@
+"""Cron-driven scheduler for recurring ``MissionTemplate`` broadcasts.
+
+Active templates are loaded once (and reloaded every
+``MISSION_SCHEDULER_RELOAD_SECONDS``), their cron expressions parsed once, and
+the next fire time of each kept in a min-heap, so the process sleeps exactly
+until the next mission is due instead of polling.
+
+Shabbat/Yom Tov blackout windows for the next ``MISSION_SCHEDULER_HORIZON_DAYS``
+are precomputed from :class:`~app.core.halachic_time.HalachicTimeService` and
+looked up with ``bisect``. A fire landing inside a window is deferred to the
+window end (after havdalah); repeated fires of the same template inside one
+window collapse into a single deferred run. Due runs are inserted as
+``MissionInstance`` rows in one statement and enqueued as
+``missions.execute_instance``.
+
+Cron expressions are evaluated in ``MISSION_CRON_TIMEZONE`` (defaults to the
+halachic service timezone). Fires missed while the scheduler was down are not
+replayed.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import heapq
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import bindparam, insert, select, update
+
+from app.core.cron import CronError, CronSchedule
+from app.core.database import AsyncSessionLocal
+from app.core.halachic_time import HalachicTimeService, get_halachic_service
+from app.models.missions import MissionInstance, MissionTemplate
+
+logger = logging.getLogger(__name__)
+
+MISSION_SCHEDULER_HORIZON_DAYS = int(os.getenv("MISSION_SCHEDULER_HORIZON_DAYS", "14"))
+MISSION_SCHEDULER_RELOAD_SECONDS = float(os.getenv("MISSION_SCHEDULER_RELOAD_SECONDS", "300"))
+MISSION_CRON_TIMEZONE = os.getenv("MISSION_CRON_TIMEZONE")
+
+# (run_at UTC, template id, cron-driven?) — deferred runs do not advance the cron.
+HeapEntry = Tuple[datetime, str, bool]
+Enqueue = Callable[[Sequence[Tuple[UUID, datetime]]], List[Optional[str]]]
+
+
+def celery_enqueue(instances: Sequence[Tuple[UUID, datetime]]) -> List[Optional[str]]:
+    """Send ``missions.execute_instance`` for each created instance."""
+
+    from app.workers.celery import celery_app
+
+    return [
+        celery_app.send_task("missions.execute_instance", args=[str(instance_id)]).id
+        for instance_id, _ in instances
+    ]
+
+
+class MissionScheduler:
+    """Heap-based cron scheduler with precomputed Shabbat blackout windows."""
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Any] = AsyncSessionLocal,
+        halachic: Optional[HalachicTimeService] = None,
+        enqueue: Enqueue = celery_enqueue,
+        horizon_days: int = MISSION_SCHEDULER_HORIZON_DAYS,
+        reload_interval: float = MISSION_SCHEDULER_RELOAD_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.halachic = halachic or get_halachic_service()
+        self.enqueue = enqueue
+        self.horizon = timedelta(days=horizon_days)
+        self.reload_interval = reload_interval
+        self.cron_timezone = ZoneInfo(MISSION_CRON_TIMEZONE) if MISSION_CRON_TIMEZONE else self.halachic.timezone
+
+        self._schedules: Dict[str, CronSchedule] = {}
+        self._heap: List[HeapEntry] = []
+        self._deferred: set[Tuple[str, datetime]] = set()
+        self._windows: List[Tuple[datetime, datetime]] = []
+        self._window_starts: List[datetime] = []
+        self._windows_until: Optional[datetime] = None
+
+    async def load_templates(self, now: Optional[datetime] = None) -> int:
+        """(Re)load active templates and rebuild the cron part of the heap."""
+
+        now = now or _utcnow()
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(MissionTemplate.id, MissionTemplate.slug, MissionTemplate.cron_expr).where(
+                    MissionTemplate.is_active.is_(True)
+                )
+            )
+            rows = result.all()
+
+        schedules: Dict[str, CronSchedule] = {}
+        for template_id, slug, cron_expr in rows:
+            try:
+                schedules[str(template_id)] = CronSchedule.parse(cron_expr)
+            except CronError as exc:
+                logger.error("Skipping mission template %s: %s", slug, exc)
+        self._schedules = schedules
+
+        self._heap = [entry for entry in self._heap if not entry[2] and entry[1] in schedules]
+        for template_id, schedule in schedules.items():
+            self._heap.append((self._next_fire(schedule, now), template_id, True))
+        heapq.heapify(self._heap)
+        logger.info("Mission scheduler loaded %s active templates", len(schedules))
+        return len(schedules)
+
+    def _next_fire(self, schedule: CronSchedule, after: datetime) -> datetime:
+        local = after.astimezone(self.cron_timezone).replace(tzinfo=None)
+        fire_local = schedule.next_after(local).replace(tzinfo=self.cron_timezone)
+        return fire_local.astimezone(timezone.utc)
+
+    def _ensure_windows(self, now: datetime) -> None:
+        if self._windows_until is not None and now + timedelta(days=1) < self._windows_until:
+            return
+        self._windows_until = now + self.horizon
+        self._windows = self.halachic.blackout_windows(now - timedelta(days=2), self._windows_until)
+        self._window_starts = [begins for begins, _ in self._windows]
+
+    def blackout_end(self, moment: datetime) -> Optional[datetime]:
+        """Return the end of the blackout window containing ``moment``, if any."""
+
+        self._ensure_windows(moment)
+        index = bisect.bisect_right(self._window_starts, moment) - 1
+        if index >= 0 and moment < self._windows[index][1]:
+            return self._windows[index][1]
+        return None
+
+    async def tick(self, now: Optional[datetime] = None) -> int:
+        """Create and enqueue every run due at ``now``; return how many were created."""
+
+        now = now or _utcnow()
+        due: List[Tuple[str, datetime]] = []
+        while self._heap and self._heap[0][0] <= now:
+            run_at, template_id, cron_driven = heapq.heappop(self._heap)
+            schedule = self._schedules.get(template_id)
+            if schedule is None:
+                continue
+            if cron_driven:
+                heapq.heappush(self._heap, (self._next_fire(schedule, now), template_id, True))
+            else:
+                self._deferred.discard((template_id, run_at))
+
+            window_end = self.blackout_end(run_at)
+            if window_end is not None:
+                if (template_id, window_end) not in self._deferred:
+                    self._deferred.add((template_id, window_end))
+                    heapq.heappush(self._heap, (window_end, template_id, False))
+                    logger.info(
+                        "Deferring mission %s from %s to after havdalah at %s",
+                        template_id,
+                        run_at,
+                        window_end,
+                    )
+                continue
+            # A cron fire landing exactly on a deferred run's time is the same run.
+            if (template_id, run_at) not in due:
+                due.append((template_id, run_at))
+
+        if not due:
+            return 0
+        return len(await self._create_and_enqueue(due))
+
+    async def _create_and_enqueue(self, due: Sequence[Tuple[str, datetime]]) -> List[UUID]:
+        rows = [
+            {
+                "template_id": UUID(template_id),
+                "scheduled_for": run_at.replace(tzinfo=None),
+                "status": "pending",
+            }
+            for template_id, run_at in due
+        ]
+        async with self.session_factory() as session:
+            result = await session.execute(
+                insert(MissionInstance).returning(MissionInstance.id, MissionInstance.scheduled_for),
+                rows,
+            )
+            created = [(row.id, row.scheduled_for) for row in result]
+            await session.commit()
+
+            task_ids = await asyncio.to_thread(self.enqueue, created)
+            marks = [
+                {"b_id": instance_id, "b_task_id": task_id}
+                for (instance_id, _), task_id in zip(created, task_ids)
+                if task_id
+            ]
+            if marks:
+                table = MissionInstance.__table__
+                await session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"))
+                    .values(task_id=bindparam("b_task_id")),
+                    marks,
+                )
+                await session.commit()
+
+        logger.info("Scheduled %s mission instances", len(created))
+        return [instance_id for instance_id, _ in created]
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Sleep until the next due run (or template reload) until ``stop`` is set."""
+
+        stop = stop or asyncio.Event()
+        await self.load_templates()
+        reload_at = _utcnow() + timedelta(seconds=self.reload_interval)
+        while not stop.is_set():
+            now = _utcnow()
+            try:
+                await self.tick(now)
+                if now >= reload_at:
+                    await self.load_templates(now)
+                    reload_at = now + timedelta(seconds=self.reload_interval)
+            except Exception:  # pragma: no cover - depends on database/broker availability
+                logger.exception("Mission scheduler tick failed")
+
+            wake_at = min([reload_at] + ([self._heap[0][0]] if self._heap else []))
+            timeout = max((wake_at - _utcnow()).total_seconds(), 0.0)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+__all__ = ["MissionScheduler", "celery_enqueue"]
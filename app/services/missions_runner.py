@@ -156,15 +156,15 @@ async def execute_mission_instance(instance_id: int) -> Dict[str, Any]:
 
 
 def schedule_recurring_missions() -> None:
-    """Stub illustrating how recurring missions could be scheduled."""
-
-    # This function can be invoked by Celery Beat or an APScheduler job that runs
-    # every minute. The scheduler would:
-    # 1. Query active MissionTemplate rows.
-    # 2. Evaluate cron expressions (e.g., with `croniter`) to determine if a run is due.
-    # 3. Create MissionInstance rows for due templates and enqueue `missions.execute_instance`.
-    # 4. Skip creation if Shabbat/Yom Tov detection returns True.
-    pass
+    """Run the cron-driven mission scheduler in the foreground until interrupted.
+
+    See :mod:`app.services.mission_scheduler`; ``scripts/mission_scheduler.py``
+    is the CLI entrypoint with signal handling.
+    """
+
+    from app.services.mission_scheduler import MissionScheduler
+
+    asyncio.run(MissionScheduler().run_forever())
 
 
 async def _mark_failed(instance_id: int, error_message: str) -> None:
@@ -3,9 +3,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from importlib import util
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from langgraph_core.text import PhraseMatcher, compile_phrase_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +25,13 @@ else:  # pragma: no cover - optional dependency
     Detoxify = None  # type: ignore
 
 
+MODERATION_MODEL = os.getenv("MODERATION_MODEL", "original-small")
+MODERATION_WORKERS = int(os.getenv("MODERATION_WORKERS", "1"))
+MODERATION_BATCH_SIZE = int(os.getenv("MODERATION_BATCH_SIZE", "32"))
+MODERATION_BATCH_WINDOW_MS = float(os.getenv("MODERATION_BATCH_WINDOW_MS", "10"))
+TOXICITY_THRESHOLD = 0.65
+
+
 @dataclass
 class ToxicityScore:
     """Normalized toxicity score container."""
@@ -24,17 +39,102 @@ class ToxicityScore:
     score: float
 
 
+# Detoxify model held by each inference process (loaded by the pool initializer).
+_worker_model: Optional[object] = None
+
+
+def _init_worker(model_name: str) -> None:
+    global _worker_model
+    _worker_model = Detoxify(model_name)
+
+
+def _predict_batch(texts: List[str]) -> List[float]:
+    """Score a batch in an inference process; one forward pass per batch."""
+
+    prediction = _worker_model.predict(texts)
+    return [float(value) for value in prediction.get("toxicity", [0.0] * len(texts))]
+
+
 class HarmClassifier:
-    """Toxicity classifier that wraps Detoxify when available."""
+    """Toxicity classifier that wraps Detoxify when available.
 
-    def __init__(self, model_name: str = "original-small") -> None:
+    Inference runs in a dedicated process pool (``MODERATION_WORKERS``
+    processes, each holding its own model) so neither the event loop nor the
+    GIL is tied up. Concurrent :meth:`score_toxicity` calls are coalesced into
+    one Detoxify batch of up to ``MODERATION_BATCH_SIZE`` texts, waiting at most
+    ``MODERATION_BATCH_WINDOW_MS`` for a batch to fill. With ``workers=0`` the
+    model runs in-process on the default executor instead. If an inference
+    process dies, the broken pool is replaced and the batch retried once.
+    """
+
+    def __init__(
+        self,
+        model_name: str = MODERATION_MODEL,
+        *,
+        workers: int = MODERATION_WORKERS,
+        batch_size: int = MODERATION_BATCH_SIZE,
+        batch_window: float = MODERATION_BATCH_WINDOW_MS / 1000,
+    ) -> None:
         self.model_name = model_name
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
         self._model: Optional[object] = None
+        self._model_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
 
     def _load_model(self) -> None:
-        if self._model is None and Detoxify is not None:
-            logger.info("Loading Detoxify model", extra={"model": self.model_name})
-            self._model = Detoxify(self.model_name)
+        with self._model_lock:
+            if self._model is None and Detoxify is not None:
+                logger.info("Loading Detoxify model", extra={"model": self.model_name})
+                self._model = Detoxify(self.model_name)
+
+    def _ensure_pool(self) -> None:
+        if self._pool is None and self.workers > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name,),
+            )
+
+    def _predict_local(self, texts: List[str]) -> List[float]:
+        self._load_model()
+        prediction = self._model.predict(texts)
+        return [float(value) for value in prediction.get("toxicity", [0.0] * len(texts))]
+
+    async def warm_up(self) -> None:
+        """Load the model ahead of the first request (call at service startup)."""
+
+        if Detoxify is None:
+            logger.warning("Detoxify not installed; moderation runs in stub mode")
+            return
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        if self.workers > 0:
+            self._ensure_pool()
+            await asyncio.gather(
+                *(loop.run_in_executor(self._pool, _predict_batch, ["warm-up"]) for _ in range(self.workers))
+            )
+        else:
+            await loop.run_in_executor(None, self._predict_local, ["warm-up"])
+        logger.info(
+            "Detoxify model ready",
+            extra={"model": self.model_name, "seconds": round(time.perf_counter() - started, 2)},
+        )
+
+    async def close(self) -> None:
+        """Flush queued texts and shut the inference pool down."""
+
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown)
 
     async def score_toxicity(self, text: str) -> Dict[str, float]:
         """Return a toxicity score using Detoxify when installed."""
@@ -46,20 +146,72 @@ class HarmClassifier:
             logger.warning("Detoxify not installed; returning stub score")
             return {"score": 0.0}
 
-        self._load_model()
-
-        if self._model is None:  # pragma: no cover - defensive check
-            return {"score": 0.0}
-
         loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        result = await future
+        return {"score": result.score}
 
-        def _predict() -> ToxicityScore:
-            prediction = self._model.predict(text)
-            toxicity = prediction.get("toxicity", 0.0)
-            return ToxicityScore(score=float(toxicity))
+    async def score_many(self, texts: Sequence[str]) -> List[Dict[str, float]]:
+        """Score many texts, batching them straight into inference calls."""
 
-        result = await loop.run_in_executor(None, _predict)
-        return {"score": result.score}
+        if Detoxify is None:
+            if texts:
+                logger.warning("Detoxify not installed; returning stub scores")
+            return [{"score": 0.0} for _ in texts]
+
+        scores = [0.0] * len(texts)
+        indexed = [(index, text) for index, text in enumerate(texts) if text]
+        batches = [indexed[i : i + self.batch_size] for i in range(0, len(indexed), self.batch_size)]
+        results = await asyncio.gather(*(self._infer([text for _, text in batch]) for batch in batches))
+        for batch, values in zip(batches, results):
+            for (index, _), value in zip(batch, values):
+                scores[index] = value
+        return [{"score": score} for score in scores]
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size :]
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            values = await self._infer([text for text, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), value in zip(batch, values):
+            if not future.done():
+                future.set_result(ToxicityScore(score=value))
+
+    async def _infer(self, texts: List[str], *, retry: bool = True) -> List[float]:
+        loop = asyncio.get_running_loop()
+        if self.workers <= 0:
+            return await loop.run_in_executor(None, self._predict_local, texts)
+        self._ensure_pool()
+        pool = self._pool
+        try:
+            return await loop.run_in_executor(pool, _predict_batch, texts)
+        except BrokenProcessPool:
+            # Concurrent batches see the same broken pool; only replace it once.
+            if self._pool is pool:
+                self._pool = None
+                pool.shutdown(wait=False)
+            if not retry:
+                raise
+            logger.warning("Moderation inference pool broke; restarting it", extra={"model": self.model_name})
+            return await self._infer(texts, retry=False)
 
 
 class HalachaRulesClassifier:
@@ -75,23 +227,23 @@ class HalachaRulesClassifier:
         "она ужасная",
     ]
 
-    def check_rules(self, text: str) -> Dict[str, List[str]]:
-        """Check for simple keyword-based halachic speech violations."""
+    def _matcher(self) -> PhraseMatcher:
+        # Cached by rule content, so the automaton is rebuilt only when the
+        # pattern lists change.
+        return compile_phrase_matcher({"gossip": self.gossip_patterns, "slander": self.slander_patterns})
 
-        normalized = text.lower()
-        violations: List[str] = []
+    def check_rules(self, text: str) -> Dict[str, List]:
+        """Check for keyword-based halachic speech violations.
 
-        for pattern in self.gossip_patterns:
-            if pattern in normalized:
-                violations.append("gossip")
-                break
+        Returns the violated rule names plus, when there are any, the matched
+        phrases and their offsets in ``text``.
+        """
 
-        for pattern in self.slander_patterns:
-            if pattern in normalized:
-                violations.append("slander")
-                break
+        matcher = self._matcher()
+        violations = matcher.matched_labels(text)
+        matches = matcher.find_all(text, labels=violations) if violations else []
 
-        return {"violations": violations}
+        return {"violations": violations, "matches": [match.as_dict() for match in matches]}
 
 
 class ModerationEngine:
@@ -105,16 +257,35 @@ class ModerationEngine:
         self.harm_classifier = harm_classifier or HarmClassifier()
         self.rules_classifier = rules_classifier or HalachaRulesClassifier()
 
+    async def warm_up(self) -> None:
+        """Preload the toxicity model so the first message does not pay for it."""
+
+        await self.harm_classifier.warm_up()
+
+    async def close(self) -> None:
+        await self.harm_classifier.close()
+
     async def assess(self, text: str) -> Dict[str, object]:
         """Assess text for toxicity and halachic rule violations."""
 
         toxicity_result = await self.harm_classifier.score_toxicity(text)
-        toxicity_score = float(toxicity_result.get("score", 0.0))
+        return self._verdict(text, float(toxicity_result.get("score", 0.0)))
+
+    async def assess_many(self, texts: Sequence[str]) -> List[Dict[str, object]]:
+        """Assess many texts at once, scoring toxicity in batched inference calls."""
 
+        toxicity_results = await self.harm_classifier.score_many(texts)
+        return [
+            self._verdict(text, float(result.get("score", 0.0)))
+            for text, result in zip(texts, toxicity_results)
+        ]
+
+    def _verdict(self, text: str, toxicity_score: float) -> Dict[str, object]:
         rule_result = self.rules_classifier.check_rules(text)
         violations = rule_result.get("violations", [])
+        matches = rule_result.get("matches", [])
 
-        allowed = toxicity_score <= 0.65 and len(violations) == 0
+        allowed = toxicity_score <= TOXICITY_THRESHOLD and len(violations) == 0
         if allowed:
             summary = "Allowed: no significant toxicity or halachic violations detected."
         else:
@@ -124,22 +295,39 @@ class ModerationEngine:
             "allowed": allowed,
             "toxicity": toxicity_score,
             "violations": violations,
+            "matches": matches,
             "summary": summary,
         }
 
 
+_engine: Optional[ModerationEngine] = None
+
+
+def get_moderation_engine() -> ModerationEngine:
+    """Return the shared engine; call its ``warm_up`` from service startup."""
+
+    global _engine
+    if _engine is None:
+        _engine = ModerationEngine()
+    return _engine
+
+
 __all__ = [
     "HarmClassifier",
     "HalachaRulesClassifier",
     "ModerationEngine",
+    "get_moderation_engine",
 ]
 
 
 if __name__ == "__main__":
     async def _example() -> None:
         engine = ModerationEngine()
+        await engine.warm_up()
         sample = "Он сказал, что она ужасная"
         result = await engine.assess(sample)
         print(result)
+        print(await engine.assess_many([sample, "Шалом", ""]))
+        await engine.close()
 
     asyncio.run(_example())
@@ -1,38 +1,43 @@
 """Lightweight RAG utilities for Ollama + vector database workflows."""
 from __future__ import annotations
 
+import json
 import logging
 import os
-from typing import Any, Dict, List, Sequence
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
 import httpx
 
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.embedding_cache import get_embedding_cache
+from app.services.embedding_engine import get_embedding_engine
+
 logger = logging.getLogger(__name__)
 
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
 VECTOR_DB_URL = os.getenv("VECTOR_DB_URL", "http://localhost:6333").rstrip("/")
 RAG_MODEL_NAME = os.getenv("RAG_MODEL_NAME", "llama3.1:8b-instruct")
 EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "nomic-embed-text")
+# Longest gap tolerated between two streamed chunks before the answer is abandoned.
+RAG_STREAM_READ_TIMEOUT = float(os.getenv("RAG_STREAM_READ_TIMEOUT", "60"))
+
+answer_cache = SemanticAnswerCache(VECTOR_DB_URL)
 
 
 async def embed_texts(texts: Sequence[str]) -> List[List[float]]:
-    """Generate embeddings for a batch of texts using Ollama."""
+    """Generate embeddings for a batch of texts using Ollama.
+
+    Cached vectors are served from the shared embedding cache; misses are
+    batched and issued concurrently by the shared
+    :class:`~app.services.embedding_engine.OllamaEmbeddingEngine`.
+    """
 
     if not texts:
         return []
 
-    url = f"{OLLAMA_BASE_URL}/api/embeddings"
-    embeddings: list[list[float]] = []
-    async with httpx.AsyncClient(timeout=60) as client:
-        for text in texts:
-            response = await client.post(url, json={"model": EMBEDDING_MODEL_NAME, "prompt": text})
-            response.raise_for_status()
-            payload = response.json()
-            vector = payload.get("embedding")
-            if not isinstance(vector, list):
-                raise ValueError("Embedding response missing 'embedding' vector")
-            embeddings.append(vector)
-    return embeddings
+    cache = get_embedding_cache()
+    return await cache.aembed(EMBEDDING_MODEL_NAME, texts, get_embedding_engine().embed)
 
 
 async def _ensure_collection(client: httpx.AsyncClient, collection: str, vector_size: int) -> None:
@@ -79,12 +84,46 @@ async def add_documents(collection: str, docs: Sequence[Dict[str, Any]]) -> None
         )
         response.raise_for_status()
 
+    # Cached answers were generated from the previous collection contents.
+    await answer_cache.invalidate(collection)
+
+
+async def delete_documents(collection: str, ids: Sequence[str]) -> None:
+    """Remove points from the vector database by document id."""
+
+    if not ids:
+        return
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        response = await client.post(
+            f"{VECTOR_DB_URL}/collections/{collection}/points/delete",
+            json={"points": list(ids)},
+        )
+        if response.status_code != 404:
+            response.raise_for_status()
 
-async def query(collection: str, question: str, top_k: int = 5) -> Dict[str, Any]:
-    """Retrieve the top matching documents for a question."""
+    await answer_cache.invalidate(collection)
 
+
+async def _embed_question(question: str) -> List[float]:
     question_embedding = await embed_texts([question])
-    vector = question_embedding[0] if question_embedding else []
+    return question_embedding[0] if question_embedding else []
+
+
+async def query(
+    collection: str,
+    question: str,
+    top_k: int = 5,
+    *,
+    vector: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """Retrieve the top matching documents for a question.
+
+    Pass ``vector`` to reuse an already computed question embedding.
+    """
+
+    if vector is None:
+        vector = await _embed_question(question)
 
     async with httpx.AsyncClient(timeout=60) as client:
         response = await client.post(
@@ -113,15 +152,11 @@ async def query(collection: str, question: str, top_k: int = 5) -> Dict[str, Any
     return {"matches": results}
 
 
-async def rag_answer(collection: str, question: str, *, top_k: int = 5) -> Dict[str, Any]:
-    """Perform retrieval-augmented generation via Ollama."""
-
-    search = await query(collection, question, top_k=top_k)
-    matches = search.get("matches", [])
+def _build_prompt(question: str, matches: Sequence[Dict[str, Any]]) -> List[Dict[str, str]]:
     context_lines = [f"[{match['id']}] {match.get('text', '')}" for match in matches]
     context_block = "\n\n".join(context_lines) if context_lines else "No relevant context found."
 
-    prompt_messages = [
+    return [
         {
             "role": "system",
             "content": "You are the SOD internal assistant. Answer succinctly and cite provided sources.",
@@ -132,6 +167,30 @@ async def rag_answer(collection: str, question: str, *, top_k: int = 5) -> Dict[
         },
     ]
 
+
+def _sources(matches: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{"id": match["id"], "score": match.get("score", 0.0), "meta": match.get("meta", {})} for match in matches]
+
+
+async def rag_answer(
+    collection: str, question: str, *, top_k: int = 5, use_cache: bool = True
+) -> Dict[str, Any]:
+    """Perform retrieval-augmented generation via Ollama.
+
+    Near-identical questions are answered from the semantic answer cache.
+    """
+
+    started = time.perf_counter()
+    vector = await _embed_question(question)
+    if use_cache:
+        cached = await answer_cache.lookup(collection, vector)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    search = await query(collection, question, top_k=top_k, vector=vector)
+    matches = search.get("matches", [])
+    prompt_messages = _build_prompt(question, matches)
+
     async with httpx.AsyncClient(timeout=120) as client:
         response = await client.post(
             f"{OLLAMA_BASE_URL}/api/chat",
@@ -147,13 +206,88 @@ async def rag_answer(collection: str, question: str, *, top_k: int = 5) -> Dict[
         answer_text = payload["choices"][0].get("message", {}).get("content")
     answer = answer_text or "No answer generated."
 
-    sources = [{"id": match["id"], "score": match.get("score", 0.0), "meta": match.get("meta", {})} for match in matches]
-    return {"answer": answer, "sources": sources}
+    result = {"answer": answer, "sources": _sources(matches)}
+    if use_cache and answer_text:
+        await answer_cache.store(
+            collection, question, vector, result, generation_seconds=time.perf_counter() - started
+        )
+    return result
+
+
+async def rag_answer_stream(
+    collection: str, question: str, *, top_k: int = 5, use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a RAG answer as events: ``sources`` first, then ``token``s, then ``done``.
+
+    Ollama emits NDJSON chunks when ``stream`` is enabled. Closing or
+    cancelling the generator closes the upstream HTTP stream, which makes
+    Ollama abort the generation. Cached answers are replayed as a single token.
+    If Ollama sends nothing for ``RAG_STREAM_READ_TIMEOUT`` seconds the stream
+    ends with an ``error`` event instead of ``done``.
+    """
+
+    started = time.perf_counter()
+    vector = await _embed_question(question)
+    if use_cache:
+        cached = await answer_cache.lookup(collection, vector)
+        if cached is not None:
+            yield {"type": "sources", "sources": cached["sources"]}
+            yield {"type": "token", "content": cached["answer"]}
+            yield {"type": "done", "answer": cached["answer"], "cached": True}
+            return
+
+    search = await query(collection, question, top_k=top_k, vector=vector)
+    matches = search.get("matches", [])
+    sources = _sources(matches)
+    yield {"type": "sources", "sources": sources}
+
+    prompt_messages = _build_prompt(question, matches)
+    parts: List[str] = []
+    timeout = httpx.Timeout(120, read=RAG_STREAM_READ_TIMEOUT)
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            async with client.stream(
+                "POST",
+                f"{OLLAMA_BASE_URL}/api/chat",
+                json={"model": RAG_MODEL_NAME, "messages": prompt_messages, "stream": True},
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(f"Ollama stream error: {chunk['error']}")
+                    token = (chunk.get("message") or {}).get("content") or ""
+                    if token:
+                        parts.append(token)
+                        yield {"type": "token", "content": token}
+                    if chunk.get("done"):
+                        break
+    except httpx.ReadTimeout:
+        logger.warning(
+            "Ollama stream stalled for more than %ss; closing the stream", RAG_STREAM_READ_TIMEOUT
+        )
+        yield {"type": "error", "detail": "Answer generation timed out."}
+        return
+
+    answer = "".join(parts)
+    if use_cache and answer:
+        await answer_cache.store(
+            collection,
+            question,
+            vector,
+            {"answer": answer, "sources": sources},
+            generation_seconds=time.perf_counter() - started,
+        )
+    yield {"type": "done", "answer": answer or "No answer generated."}
 
 
 __all__ = [
     "add_documents",
+    "delete_documents",
     "embed_texts",
     "query",
     "rag_answer",
+    "rag_answer_stream",
 ]
@@ -8,16 +8,94 @@ fresh material is searchable.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List, Sequence
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select, text, tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from app.models.content import ContentItem
+from app.core.metrics import counter, gauge
+from app.models.content import ContentCategory, ContentItem
 from app.services import rag_client
 
+logger = logging.getLogger(__name__)
+
+RAG_INDEX_COLLECTION = os.getenv("RAG_INDEX_COLLECTION", "torah")
+
+INDEX_BACKLOG = gauge(
+    "rag_index_backlog_items", "Content items changed since they were last indexed.", ["collection"]
+)
+INDEX_LAG = gauge(
+    "rag_index_lag_seconds",
+    "Age of the oldest content change not yet reflected in the vector index.",
+    ["collection"],
+)
+INDEX_OPERATIONS = counter(
+    "rag_index_items_total",
+    "Content items processed by the incremental indexer.",
+    ["collection", "outcome"],
+)
+
+# Marks a batch indexed, but only rows still at the updated_at the batch was
+# read with; rows edited meanwhile stay pending for the next pass. A textual
+# UPDATE also bypasses the ORM onupdate for updated_at, so marking a row does
+# not re-queue it.
+_MARK_INDEXED_SQL = text(
+    """
+    UPDATE content_items c
+    SET content_hash = b.content_hash,
+        indexed_at = greatest(now(), c.updated_at)
+    FROM unnest(
+        CAST(:ids AS uuid[]),
+        CAST(:hashes AS varchar[]),
+        CAST(:updated AS timestamptz[])
+    ) AS b(id, content_hash, updated_at)
+    WHERE c.id = b.id AND c.updated_at = b.updated_at
+    """
+)
+
+
+def build_document(
+    *,
+    item_id: Any,
+    title_he: Optional[str],
+    title_en: Optional[str],
+    body_he: Optional[str],
+    body_en: Optional[str],
+    source: Optional[str],
+    tags: Optional[List[str]],
+    category_slug: Optional[str],
+) -> dict:
+    """Construct the vector DB payload for a content item."""
+
+    text_parts = [value for value in [title_he or title_en, body_he, body_en] if value]
+    return {
+        "id": str(item_id),
+        "text": "\n\n".join(text_parts),
+        "meta": {
+            "category_slug": category_slug,
+            "source_ref": source,
+            "tags": tags or [],
+        },
+    }
+
+
+def document_hash(document: dict) -> str:
+    """Stable digest of everything that ends up in the vector DB for a document."""
+
+    encoded = json.dumps(
+        {"text": document["text"], "meta": document["meta"]}, sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 
 class RAGPipeline:
     """Lightweight helper for indexing application content into RAG storage."""
@@ -35,30 +113,10 @@ class RAGPipeline:
         filtering.
         """
 
-        text_parts: List[str] = [
-            value
-            for value in [item.title_he or item.title_en, item.body_he, item.body_en]
-            if value
-        ]
-        text = "\n\n".join(text_parts)
-
-        metadata = {
-            "category_slug": getattr(item.category, "slug", None),
-            "source_ref": item.source,
-            "tags": item.tags or [],
-        }
-
-        await rag_client.add_documents(
-            collection,
-            [
-                {
-                    "id": str(item.id),
-                    "text": text,
-                    "meta": metadata,
-                }
-            ],
-        )
+        document = self._build_doc(item)
+        await rag_client.add_documents(collection, [document])
 
+        item.content_hash = document_hash(document)
         item.indexed_at = datetime.now(timezone.utc)
         await self.session.commit()
 
@@ -92,7 +150,8 @@ class RAGPipeline:
             documents = [self._build_doc(item) for item in batch]
             await rag_client.add_documents(collection, documents)
 
-            for item in batch:
+            for item, document in zip(batch, documents):
+                item.content_hash = document_hash(document)
                 item.indexed_at = now
                 total_indexed += 1
 
@@ -102,21 +161,192 @@ class RAGPipeline:
     def _build_doc(self, item: ContentItem) -> dict:
         """Internal helper to construct a payload for the vector DB."""
 
-        text_parts = [
-            value
-            for value in [item.title_he or item.title_en, item.body_he, item.body_en]
-            if value
-        ]
-
-        return {
-            "id": str(item.id),
-            "text": "\n\n".join(text_parts),
-            "meta": {
-                "category_slug": getattr(item.category, "slug", None),
-                "source_ref": item.source,
-                "tags": item.tags or [],
+        return build_document(
+            item_id=item.id,
+            title_he=item.title_he,
+            title_en=item.title_en,
+            body_he=item.body_he,
+            body_en=item.body_en,
+            source=item.source,
+            tags=item.tags,
+            category_slug=getattr(item.category, "slug", None),
+        )
+
+
+@dataclass
+class IndexerRunStats:
+    """Outcome of one pass over the pending-change stream."""
+
+    embedded: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    batches: int = 0
+
+
+class IncrementalIndexer:
+    """Keep a RAG collection in sync with ``content_items`` using change detection.
+
+    Rows are pending when ``indexed_at`` is NULL or older than ``updated_at``
+    (covered by the ``idx_content_index_pending`` partial index). Pending rows
+    are streamed with a keyset cursor on ``(updated_at, id)``; active rows are
+    re-embedded only when their document hash differs from ``content_hash``,
+    and deactivated rows have their points removed from the vector DB.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        collection: str = "torah",
+        batch_size: int = 100,
+        poll_interval: float = 5.0,
+    ) -> None:
+        self.session = session
+        self.collection = collection
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+    def _pending(self) -> Any:
+        return or_(ContentItem.indexed_at.is_(None), ContentItem.updated_at > ContentItem.indexed_at)
+
+    async def stream_pending(self) -> AsyncIterator[Sequence[Row]]:
+        """Yield batches of pending rows in ``(updated_at, id)`` order."""
+
+        cursor: Optional[tuple] = None
+        while True:
+            stmt = (
+                select(
+                    ContentItem.id,
+                    ContentItem.updated_at,
+                    ContentItem.is_active,
+                    ContentItem.title_he,
+                    ContentItem.title_en,
+                    ContentItem.body_he,
+                    ContentItem.body_en,
+                    ContentItem.source,
+                    ContentItem.tags,
+                    ContentItem.content_hash,
+                    ContentCategory.slug.label("category_slug"),
+                )
+                .join(ContentCategory, ContentItem.category_id == ContentCategory.id)
+                .where(self._pending())
+                .order_by(ContentItem.updated_at, ContentItem.id)
+                .limit(self.batch_size)
+            )
+            if cursor is not None:
+                stmt = stmt.where(tuple_(ContentItem.updated_at, ContentItem.id) > cursor)
+            rows = (await self.session.execute(stmt)).all()
+            if not rows:
+                return
+            yield rows
+            cursor = (rows[-1].updated_at, rows[-1].id)
+
+    async def run_once(self) -> IndexerRunStats:
+        """Drain the current backlog and refresh the lag metrics."""
+
+        stats = IndexerRunStats()
+        async for rows in self.stream_pending():
+            await self._process(rows, stats)
+            stats.batches += 1
+        await self.report_backlog()
+        return stats
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Continuously follow the change stream until ``stop`` is set."""
+
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                stats = await self.run_once()
+                if stats.batches:
+                    logger.info("Incremental index pass: %s", stats)
+            except Exception:  # pragma: no cover - depends on external services
+                logger.exception("Incremental index pass failed")
+                await self.session.rollback()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def report_backlog(self) -> Dict[str, float]:
+        """Publish how far the vector index trails the database."""
+
+        return await refresh_backlog_metrics(self.session, self.collection)
+
+    async def _process(self, rows: Sequence[Row], stats: IndexerRunStats) -> None:
+        documents: List[dict] = []
+        marks: List[Dict[str, Any]] = []
+        removed: List[str] = []
+
+        for row in rows:
+            if not row.is_active:
+                removed.append(str(row.id))
+                marks.append({"id": row.id, "hash": None, "updated_at": row.updated_at})
+                continue
+            document = build_document(
+                item_id=row.id,
+                title_he=row.title_he,
+                title_en=row.title_en,
+                body_he=row.body_he,
+                body_en=row.body_en,
+                source=row.source,
+                tags=row.tags,
+                category_slug=row.category_slug,
+            )
+            digest = document_hash(document)
+            if digest != row.content_hash:
+                documents.append(document)
+            else:
+                stats.unchanged += 1
+            marks.append({"id": row.id, "hash": digest, "updated_at": row.updated_at})
+
+        if documents:
+            await rag_client.add_documents(self.collection, documents)
+            stats.embedded += len(documents)
+        if removed:
+            await rag_client.delete_documents(self.collection, removed)
+            stats.deleted += len(removed)
+
+        result = await self.session.execute(
+            _MARK_INDEXED_SQL,
+            {
+                "ids": [mark["id"] for mark in marks],
+                "hashes": [mark["hash"] for mark in marks],
+                "updated": [mark["updated_at"] for mark in marks],
             },
-        }
+        )
+        await self.session.commit()
+        # Rows changed after this batch was read keep their pending state.
+        skipped = len(marks) - (result.rowcount or 0)
+        stats.skipped += skipped
+
+        INDEX_OPERATIONS.inc(len(documents), collection=self.collection, outcome="embedded")
+        INDEX_OPERATIONS.inc(len(removed), collection=self.collection, outcome="deleted")
+        INDEX_OPERATIONS.inc(
+            len(marks) - len(documents) - len(removed), collection=self.collection, outcome="unchanged"
+        )
+        INDEX_OPERATIONS.inc(skipped, collection=self.collection, outcome="skipped")
+
+
+async def refresh_backlog_metrics(
+    session: AsyncSession, collection: str = RAG_INDEX_COLLECTION
+) -> Dict[str, float]:
+    """Measure the pending-index backlog from the database and set the gauges.
+
+    The indexer runs in its own process, so the API's ``/metrics`` handler
+    calls this too; the gauges it scrapes come from the database, not from
+    the indexer's memory.
+    """
+
+    pending = or_(ContentItem.indexed_at.is_(None), ContentItem.updated_at > ContentItem.indexed_at)
+    count, oldest = (
+        await session.execute(select(func.count(), func.min(ContentItem.updated_at)).where(pending))
+    ).one()
+    lag = (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0
+    INDEX_BACKLOG.set(count, collection=collection)
+    INDEX_LAG.set(max(lag, 0.0), collection=collection)
+    return {"backlog": count, "lag_seconds": lag}
 
 
 # Example: trigger indexing after ingestion/generation flows
@@ -140,4 +370,11 @@ class RAGPipeline:
 #       - "11434:11434"
 
 
-__all__ = ["RAGPipeline"]
+__all__ = [
+    "IncrementalIndexer",
+    "IndexerRunStats",
+    "RAGPipeline",
+    "build_document",
+    "document_hash",
+    "refresh_backlog_metrics",
+]
@@ -2,24 +2,40 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 from typing import Any, Dict, List
 
 from celery import Celery
 
 from app.core.config import config
+from app.rag.bulk_writer import write_torah_chunks
 from app.rag.sefaria_client import SefariaClient
 from app.rag.vector_store import (
     chunk_passages,
     embed_texts,
     ensure_vector_tables,
-    store_chunks,
 )
+from app.workers.event_loop import run_async, shared_http_client, worker_pool_options
 
 celery_app = Celery(
     "sod_celery",
     broker=config.redis_url,
     backend=config.redis_url,
 )
+celery_app.conf.update(**worker_pool_options())
+
+_tables_lock = threading.Lock()
+_tables_ready = False
+
+
+def _ensure_tables_once() -> None:
+    """Create the vector tables at most once per worker process."""
+
+    global _tables_ready
+    with _tables_lock:
+        if not _tables_ready:
+            ensure_vector_tables()
+            _tables_ready = True
 
 
 def _extract_passages(payload: Dict[str, Any], language: str) -> List[str]:
@@ -35,8 +51,9 @@ def _book_from_payload(payload: Dict[str, Any], fallback: str) -> str:
 
 
 async def _ingest_text(reference: str, language: str) -> Dict[str, Any]:
-    ensure_vector_tables()
-    async with SefariaClient() as client:
+    # Sync DDL; keep it off the loop shared with the other tasks in this process.
+    await asyncio.to_thread(_ensure_tables_once)
+    async with SefariaClient(client=shared_http_client()) as client:
         payload = await client.fetch_text(reference, language=language)
     passages = _extract_passages(payload, language)
     if not passages:
@@ -45,15 +62,20 @@ async def _ingest_text(reference: str, language: str) -> Dict[str, Any]:
     chunks = chunk_passages(passages)
     embeddings = await asyncio.to_thread(embed_texts, chunks)
     book = _book_from_payload(payload, reference)
-    inserted = store_chunks(reference, book, chunks, embeddings)
-    return {"status": "completed", "reference": reference, "inserted": inserted}
+    report = await write_torah_chunks(config.database_url, reference, book, chunks, embeddings)
+    return {
+        "status": "completed",
+        "reference": reference,
+        "inserted": report.rows,
+        "rows_per_second": round(report.rows_per_second, 1),
+    }
 
 
 @celery_app.task(name="app.tasks.ingest_torah.ingest_torah_text")
 def ingest_torah_text(reference: str = "Pirkei Avot", language: str = "en") -> Dict[str, Any]:
     """Fetch a Torah text from Sefaria and index it in the vector store."""
 
-    return asyncio.run(_ingest_text(reference, language))
+    return run_async(_ingest_text(reference, language))
 
 
 __all__ = ["ingest_torah_text", "celery_app"]
@@ -1,13 +1,21 @@
 """RAG integration with PGVector."""
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import Integer, String, create_engine, select
 from sqlalchemy.orm import DeclarativeBase, Session, mapped_column
 
 from app.core.config import config
+from app.rag.ann_index import (
+    ANN_EF_SEARCH,
+    ANN_PROBES,
+    DOCUMENT_EMBEDDINGS_INDEX,
+    apply_search_params,
+    distance,
+    ensure_index,
+)
 
 
 class Base(DeclarativeBase):
@@ -30,6 +38,7 @@ def _engine():
 def init_db() -> None:
     engine = _engine()
     Base.metadata.create_all(engine)
+    ensure_index(engine, DOCUMENT_EMBEDDINGS_INDEX)
 
 
 def add_document(source: str, content: str, embedding: List[float]) -> int:
@@ -42,12 +51,19 @@ def add_document(source: str, content: str, embedding: List[float]) -> int:
         return doc.id
 
 
-def similarity_search(embedding: List[float], limit: int = 5) -> List[Tuple[str, str]]:
+def similarity_search(
+    embedding: List[float],
+    limit: int = 5,
+    *,
+    ef_search: Optional[int] = ANN_EF_SEARCH,
+    probes: Optional[int] = ANN_PROBES,
+) -> List[Tuple[str, str]]:
     engine = _engine()
     with Session(engine) as session:
+        apply_search_params(session, ef_search=ef_search, probes=probes)
         stmt = (
             select(DocumentEmbedding.source, DocumentEmbedding.content)
-            .order_by(DocumentEmbedding.embedding.l2_distance(embedding))
+            .order_by(distance(DocumentEmbedding.embedding, DOCUMENT_EMBEDDINGS_INDEX.metric, embedding))
             .limit(limit)
         )
         return [(row[0], row[1]) for row in session.execute(stmt).all()]
@@ -1,13 +1,14 @@
-import asyncio
 from datetime import datetime
 from typing import Any, Dict
 
 from celery import Celery
+from sqlalchemy import select
 
 from app.agents.factory import AgentFactory
 from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.db.models import AgentLog, AgentTask
+from app.workers.event_loop import run_async, worker_pool_options
 
 celery_app = Celery(
     "sod_worker",
@@ -15,6 +16,7 @@ celery_app = Celery(
     backend=settings.REDIS_URL,
 )
 celery_app.conf.task_routes = {"app.worker.execute_agent_task": {"queue": "agents"}}
+celery_app.conf.update(**worker_pool_options())
 
 
 async def _record_task_result(
@@ -36,7 +38,8 @@ async def _record_task_result(
             elif not requires_cro_validation:
                 task.requires_cro_validation = "approved"
 
-        log = await session.get(AgentLog, log_id)
+        # agent_logs is partitioned on timestamp, so look the row up by id alone.
+        log = await session.scalar(select(AgentLog).where(AgentLog.id == log_id))
         if log:
             log.status = status
             log.output_data = output or {}
@@ -70,7 +73,7 @@ async def _execute(agent_name: str, task_description: str, log_id: int, task_id:
 
 @celery_app.task(name="app.worker.execute_agent_task")
 def execute_agent_task(agent_name: str, task_description: str, log_id: int, task_id: int, requires_cro_validation: bool = True):
-    return asyncio.run(
+    return run_async(
         _execute(
             agent_name=agent_name,
             task_description=task_description,
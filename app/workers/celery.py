@@ -1,16 +1,16 @@
 """Celery worker configuration with audit logging to Pinkas."""
 from __future__ import annotations
 
-import asyncio
 import logging
+from traceback import format_tb
 from typing import Any
 
 from celery import Celery, Task, signals
 from kombu import Queue
 
 from app.core.config import settings
-from app.db.session import async_session_factory
-from app.models.pinkas import Pinkas
+from app.db.pinkas_writer import close_pinkas_writer, get_pinkas_writer
+from app.workers.event_loop import run_async, worker_pool_options
 from app.services.missions_runner import _mark_failed, execute_mission_instance
 
 logger = logging.getLogger(__name__)
@@ -21,11 +21,17 @@ celery_app = Celery(
     backend=settings.redis_url,
 )
 celery_app.conf.update(
-    worker_concurrency=2,
+    **worker_pool_options(),
     task_default_queue="agents",
     task_queues=(Queue("agents"),),
     task_acks_late=True,
     result_extended=True,
+    beat_schedule={
+        "audit-partition-maintenance": {
+            "task": "maintenance.audit_partitions",
+            "schedule": 3600.0,
+        },
+    },
 )
 
 
@@ -45,7 +51,7 @@ def _get_agent_name(task: Task | None) -> str:
     return task.name if task and task.name else "unknown"
 
 
-async def _write_pinkas_entry(
+def _write_pinkas_entry(
     *,
     agent: str,
     action: str,
@@ -53,34 +59,33 @@ async def _write_pinkas_entry(
     payload: Any | None = None,
     meta: dict[str, Any] | None = None,
 ) -> None:
-    """Persist a Pinkas entry asynchronously."""
+    """Buffer a Pinkas entry; the batched writer persists it off the task path."""
 
-    async with async_session_factory() as session:
-        merged_payload = payload if isinstance(payload, dict) else {"payload": payload}
-        if meta:
-            merged_payload = {**(merged_payload or {}), "meta": meta}
-        record = Pinkas(agent=agent, action=action, status=status, payload=merged_payload)
-        session.add(record)
-        await session.commit()
+    merged_payload = payload if isinstance(payload, dict) else {"payload": payload}
+    if meta:
+        merged_payload = {**(merged_payload or {}), "meta": meta}
+    get_pinkas_writer().enqueue(agent=agent, action=action, status=status, payload=merged_payload)
 
 
 @signals.task_success.connect
 def log_task_success(sender: Task | None = None, result: Any | None = None, **kwargs: Any) -> None:
     agent_name = _get_agent_name(sender)
     meta = {"task_id": kwargs.get("task_id")}
-    asyncio.run(
-        _write_pinkas_entry(agent=agent_name, action="task_complete", status="success", payload=result, meta=meta)
-    )
+    _write_pinkas_entry(agent=agent_name, action="task_complete", status="success", payload=result, meta=meta)
 
 
 @signals.task_failure.connect
 def log_task_failure(sender: Task | None = None, exception: Exception | None = None, **kwargs: Any) -> None:
     agent_name = _get_agent_name(sender)
-    meta = {"task_id": kwargs.get("task_id"), "traceback": kwargs.get("traceback")}
+    tb = kwargs.get("traceback")
+    meta = {"task_id": kwargs.get("task_id"), "traceback": "".join(format_tb(tb)) if tb else None}
     payload = {"exception": str(exception) if exception else None}
-    asyncio.run(
-        _write_pinkas_entry(agent=agent_name, action="task_complete", status="failure", payload=payload, meta=meta)
-    )
+    _write_pinkas_entry(agent=agent_name, action="task_complete", status="failure", payload=payload, meta=meta)
+
+
+@signals.worker_process_shutdown.connect
+def flush_pinkas_on_shutdown(**_: Any) -> None:
+    close_pinkas_writer()
 
 
 @celery_app.task(name="missions.execute_instance", bind=True)
@@ -89,11 +94,35 @@ def execute_mission_instance_task(self: Task, instance_id: int) -> dict:
 
     logger.info("Launching mission execution", extra={"instance_id": instance_id, "task_id": self.request.id})
     try:
-        return asyncio.run(execute_mission_instance(instance_id))
+        return run_async(execute_mission_instance(instance_id))
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.exception("Mission execution task failed", exc_info=exc)
-        asyncio.run(_mark_failed(instance_id, str(exc)))
+        run_async(_mark_failed(instance_id, str(exc)))
         raise
 
 
-__all__ = ["celery_app", "AgentTask", "execute_mission_instance_task"]
+@celery_app.task(
+    name="maintenance.audit_partitions",
+    autoretry_for=(Exception,),
+    retry_backoff=60,
+    max_retries=5,
+)
+def audit_partition_maintenance_task() -> dict:
+    """Create upcoming partitions, refresh hourly rollups and retire expired data."""
+
+    from app.db.partitions import run_maintenance
+    from app.db.session import engine
+
+    async def _run() -> dict:
+        report = await run_maintenance(engine)
+        return {
+            "created": report.created,
+            "archived": report.archived,
+            "dropped": report.dropped,
+            "rollup_rows": report.rollup_rows,
+        }
+
+    return run_async(_run())
+
+
+__all__ = ["celery_app", "AgentTask", "audit_partition_maintenance_task", "execute_mission_instance_task"]
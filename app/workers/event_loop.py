@@ -0,0 +1,209 @@
+"""One persistent asyncio event loop per Celery worker process.
+
+Calling ``asyncio.run`` inside every task builds and tears down an event loop
+per task, and anything loop-bound (the SQLAlchemy async engine pools, httpx
+clients) either gets rebuilt each time or breaks when reused on a different
+loop. Instead, tasks hand their coroutine to :func:`run_async`, which runs it
+on a long-lived loop owned by a daemon thread of the worker process. Engines
+and the shared HTTP client (:func:`shared_http_client`) stay bound to that
+loop for the life of the process.
+
+Because the loop lives in its own thread, several pool threads can submit
+coroutines at once: with ``CELERY_WORKER_POOL=threads`` and a high
+``CELERY_WORKER_CONCURRENCY`` a single worker process runs many I/O-bound
+agent tasks concurrently on one loop. Prefork children start their own loop
+after the fork. Cleanup callbacks registered with :func:`on_shutdown` (engine
+disposal, client close) run on the loop when the worker process shuts down.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional, TypeVar
+
+import httpx
+from celery import signals
+
+logger = logging.getLogger(__name__)
+
+CELERY_WORKER_POOL = os.getenv("CELERY_WORKER_POOL", "prefork")
+CELERY_WORKER_CONCURRENCY = int(os.getenv("CELERY_WORKER_CONCURRENCY", "2"))
+WORKER_HTTP_TIMEOUT = float(os.getenv("WORKER_HTTP_TIMEOUT", "30"))
+
+T = TypeVar("T")
+
+
+class WorkerEventLoop:
+    """An event loop running forever in a daemon thread."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_callbacks: List[Callable[[], Awaitable[Any]]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._loop, ready), name="celery-event-loop", daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule ``coro`` on the loop and return a concurrent future."""
+
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the loop and block the calling thread for its result."""
+
+        if self._thread is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("run() called from the worker event loop thread; await the coroutine instead")
+        return self.submit(coro).result(timeout)
+
+    def on_shutdown(self, callback: Callable[[], Awaitable[Any]]) -> None:
+        self._shutdown_callbacks.append(callback)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Run shutdown callbacks on the loop, then stop it."""
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        async def _shutdown() -> None:
+            for callback in reversed(self._shutdown_callbacks):
+                try:
+                    await callback()
+                except Exception:  # pragma: no cover - best-effort cleanup
+                    logger.exception("Worker loop shutdown callback failed")
+            # Like asyncio.run: cancel what is left so loop-bound resources
+            # (e.g. embedding clients) get to close themselves on this loop.
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(timeout)
+        except Exception:  # pragma: no cover - best-effort cleanup
+            logger.exception("Worker loop shutdown did not complete")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        loop.close()
+
+    def reset_after_fork(self) -> None:
+        # The child inherits the loop object but not its thread.
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+
+worker_loop = WorkerEventLoop()
+
+
+def run_async(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine from a (sync) Celery task on the process-wide loop."""
+
+    return worker_loop.run(coro, timeout)
+
+
+def submit_async(coro: Coroutine[Any, Any, T]) -> "Future[T]":
+    """Fire a coroutine on the process-wide loop without waiting for it."""
+
+    return worker_loop.submit(coro)
+
+
+def on_shutdown(callback: Callable[[], Awaitable[Any]]) -> None:
+    """Register an async cleanup callback for worker process shutdown."""
+
+    worker_loop.on_shutdown(callback)
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def shared_http_client() -> httpx.AsyncClient:
+    """Return the worker's pooled HTTP client; call from the worker loop."""
+
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=WORKER_HTTP_TIMEOUT)
+    return _http_client
+
+
+async def _close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
+
+async def _dispose_engines() -> None:
+    # Only engines this process actually imported hold pooled connections.
+    for module_name in ("app.core.database", "app.db.session"):
+        module = sys.modules.get(module_name)
+        engine = getattr(module, "engine", None)
+        if engine is not None:
+            await engine.dispose()
+
+
+on_shutdown(_dispose_engines)
+on_shutdown(_close_http_client)
+
+
+def _reset_after_fork() -> None:
+    global _http_client
+    worker_loop.reset_after_fork()
+    _http_client = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@signals.worker_process_shutdown.connect
+def _close_loop_on_process_shutdown(**_: Any) -> None:
+    worker_loop.close()
+
+
+@signals.worker_shutdown.connect
+def _close_loop_on_worker_shutdown(**_: Any) -> None:
+    # Covers the solo and threads pools, which have no child processes.
+    worker_loop.close()
+
+
+def worker_pool_options() -> dict:
+    """Celery ``conf.update`` kwargs for the configured pool and concurrency."""
+
+    return {"worker_pool": CELERY_WORKER_POOL, "worker_concurrency": CELERY_WORKER_CONCURRENCY}
+
+
+__all__ = [
+    "WorkerEventLoop",
+    "on_shutdown",
+    "run_async",
+    "shared_http_client",
+    "submit_async",
+    "worker_loop",
+    "worker_pool_options",
+]
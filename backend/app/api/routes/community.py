@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.services.community_analytics import get_community_snapshot
+
+router = APIRouter(prefix="/community", tags=["Community"])
+
+
+class CommunityStatsResponse(BaseModel):
+    snapshot_at: datetime
+    build_ms: float
+    community: dict[str, Any]
+    campaigns: dict[str, Any]
+    language_growth: list[str]
+
+
+@router.get("/stats", response_model=CommunityStatsResponse)
+async def community_stats(
+    refresh: bool = Query(
+        False,
+        description="Rebuild the snapshot first, unless one was built in the last "
+        "COMMUNITY_SNAPSHOT_MIN_REFRESH_SECONDS",
+    ),
+    session: AsyncSession = Depends(get_db),
+) -> CommunityStatsResponse:
+    snapshot = await get_community_snapshot(session, force_refresh=refresh)
+    payload = snapshot.payload
+    return CommunityStatsResponse(
+        snapshot_at=snapshot.created_at,
+        build_ms=snapshot.build_ms,
+        community=payload["community"],
+        campaigns=payload["campaigns"],
+        language_growth=payload.get("language_growth", []),
+    )
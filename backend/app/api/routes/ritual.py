@@ -232,5 +232,4 @@ async def register_engagement(
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=f"Unknown event: {payload.event}") from exc
 
-    updated_user = await register_event(db, user=user, event=event_enum)
-    return {"engagement_score": updated_user.engagement_score}
+    return {"engagement_score": register_event(user, event_enum)}
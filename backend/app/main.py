@@ -1,19 +1,40 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.database import Base, engine
+from app.core.database import AsyncSessionLocal, Base, engine
 from app.core.logging import configure_logging
 from app.core.middleware import RequestContextLogMiddleware
 from app.db import models
+from app.models import campaign, community_stats  # noqa: F401 - registers tables for create_all
+from app.services.community_analytics import (
+    COMMUNITY_SNAPSHOT_REFRESH_SECONDS,
+    run_snapshot_refresher,
+)
+from app.services.user_engagement import engagement_buffer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    engagement_flusher = asyncio.create_task(engagement_buffer.run(AsyncSessionLocal))
+    refresher = None
+    if COMMUNITY_SNAPSHOT_REFRESH_SECONDS > 0:
+        refresher = asyncio.create_task(
+            run_snapshot_refresher(AsyncSessionLocal, COMMUNITY_SNAPSHOT_REFRESH_SECONDS)
+        )
     yield
+    if refresher is not None:
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+    # Cancelling the flusher writes whatever is still buffered.
+    engagement_flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await engagement_flusher
     await engine.dispose()
 
 
@@ -44,7 +65,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from app.api.routes import amac, finance  # noqa: E402
+from app.api.routes import amac, community, finance  # noqa: E402
 from app.api.v1 import admin, agents, health, logs  # noqa: E402
 
 app.include_router(health.router, tags=["Health"])
@@ -53,6 +74,7 @@ app.include_router(agents.router, prefix="/api/v1", tags=["Agents"])
 app.include_router(admin.router, prefix="/api/v1", tags=["Admin"])
 app.include_router(amac.router)
 app.include_router(finance.router)
+app.include_router(community.router)
 
 
 @app.get("/")
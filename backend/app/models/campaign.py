@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.database import Base
@@ -19,6 +19,12 @@ class BroadcastCampaign(Base):
     message_template = Column(Text, nullable=False)
     status = Column(String(50), nullable=False, default="draft")
     scheduled_at = Column(DateTime, nullable=True)
+    # Maintained incrementally by app.services.campaigns as recipient rows
+    # are added and change status. Not recounted on reads; backfill or repair
+    # with ``python -m app.services.campaigns``.
+    pending_count = Column(Integer, nullable=False, default=0, server_default="0")
+    sent_count = Column(Integer, nullable=False, default=0, server_default="0")
+    failed_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -32,8 +38,14 @@ class CampaignRecipient(Base):
     )
     user_id = Column(UUID(as_uuid=True), ForeignKey("user_profiles.id"), nullable=False)
     status = Column(String(50), nullable=False, default="pending")
+    error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
     last_update_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "user_id", name="uq_campaign_recipient_campaign_user"),
+    )
+
 
 Index("idx_campaign_recipient_campaign", CampaignRecipient.campaign_id)
 Index("idx_campaign_recipient_user", CampaignRecipient.user_id)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import JSON, Column, DateTime, Float, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class CommunityStatsSnapshot(Base):
+    __tablename__ = "community_stats_snapshots"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    build_ms = Column(Float, nullable=False, default=0.0)
+    payload = Column(JSON, nullable=False)
+
+
+Index("idx_community_stats_snapshot_created", CommunityStatsSnapshot.created_at.desc())
@@ -21,7 +21,10 @@ class UserProfile(Base):
     timezone = Column(String(64), nullable=True)
     joined_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     last_activity_at = Column(DateTime, nullable=True)
+    # Score as of engagement_decayed_at; readers apply decay since then
+    # (see app.services.user_engagement.effective_engagement_score).
     engagement_score = Column(Float, default=0.0, nullable=False)
+    engagement_decayed_at = Column(DateTime, nullable=True)
     tags = Column(ARRAY(String), default=list)
 
     __table_args__ = (
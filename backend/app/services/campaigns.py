@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import os
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
 from uuid import UUID as UUIDType
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, exists, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.campaign import BroadcastCampaign, CampaignRecipient
 from app.models.user_profile import UserProfile
+from app.services.user_engagement import effective_score_expression
+
+STATUS_BATCH_SIZE = int(os.getenv("CAMPAIGN_STATUS_BATCH_SIZE", "5000"))
+
+RECIPIENT_STATUSES = frozenset({"pending", "sent", "failed"})
+# Gateway results that mean "not delivered yet": the message was held back
+# (e.g. by the Shabbat guard) and the recipient stays pending.
+PENDING_ALIASES = frozenset({"blocked"})
 
 
 async def create_campaign(
@@ -43,7 +55,12 @@ def _apply_segment_filters(
 ) -> Select[Any]:
     query = base_query
     if min_score is not None:
-        query = query.where(UserProfile.engagement_score >= min_score)
+        # Decay only lowers scores: the stored-score bound can use the index,
+        # the decayed one decides.
+        query = query.where(
+            UserProfile.engagement_score >= min_score,
+            effective_score_expression(datetime.utcnow()) >= min_score,
+        )
     if language:
         query = query.where(UserProfile.language == language)
     if tags_any:
@@ -57,57 +74,248 @@ async def build_recipients_for_campaign(
     *,
     limit: int | None = None,
 ) -> int:
+    """Materialize the campaign's segment into ``campaign_recipients``.
+
+    Runs as one ``INSERT ... SELECT`` on the server: user ids never travel to
+    Python, users already enrolled are skipped by ``NOT EXISTS`` and a racing
+    build is absorbed by ``ON CONFLICT DO NOTHING``. Returns the number of
+    recipients added.
+    """
+
     segment_filter = campaign.segment_filter or {}
     min_score = segment_filter.get("min_score")
     language = segment_filter.get("language")
     tags_any = segment_filter.get("tags_any")
 
-    existing_recipients_subquery = select(CampaignRecipient.user_id).where(
-        CampaignRecipient.campaign_id == campaign.id
-    )
-
-    user_query: Select[Any] = select(UserProfile.id).where(
-        ~UserProfile.id.in_(existing_recipients_subquery)
+    already_enrolled = select(CampaignRecipient.id).where(
+        CampaignRecipient.campaign_id == campaign.id,
+        CampaignRecipient.user_id == UserProfile.id,
     )
+    user_query: Select[Any] = select(
+        func.gen_random_uuid(),
+        literal(campaign.id, CampaignRecipient.campaign_id.type),
+        UserProfile.id,
+        literal("pending"),
+        literal(datetime.utcnow(), CampaignRecipient.last_update_at.type),
+    ).where(~exists(already_enrolled))
     user_query = _apply_segment_filters(
         user_query, min_score=min_score, language=language, tags_any=tags_any
     )
     if limit is not None:
         user_query = user_query.limit(limit)
 
-    result = await session.execute(user_query)
-    user_ids = list(result.scalars().all())
+    stmt = (
+        pg_insert(CampaignRecipient)
+        .from_select(["id", "campaign_id", "user_id", "status", "last_update_at"], user_query)
+        .on_conflict_do_nothing()
+    )
+    result = await session.execute(stmt)
+    inserted = result.rowcount or 0
+    if inserted:
+        await session.execute(
+            update(BroadcastCampaign)
+            .where(BroadcastCampaign.id == campaign.id)
+            .values(pending_count=BroadcastCampaign.pending_count + inserted)
+        )
+    await session.commit()
+
+    return inserted
+
+
+@dataclass(frozen=True)
+class RecipientStatusUpdate:
+    recipient_id: UUIDType
+    status: str
+    error: str | None = None
+    sent_at: datetime | None = None
+
+    def __post_init__(self) -> None:
+        if self.status in PENDING_ALIASES:
+            object.__setattr__(self, "status", "pending")
+        elif self.status not in RECIPIENT_STATUSES:
+            raise ValueError(f"Unknown recipient status: {self.status!r}")
+
+
+# One statement per batch: lock the touched recipients, update those whose
+# status changes (the locked snapshot keeps the previous status), then move
+# each campaign's counters by the net per-status delta. Anything that is not
+# sent or failed counts as pending, matching _RECOUNT_SQL.
+_BULK_STATUS_SQL = text(
+    """
+    WITH incoming AS (
+        SELECT * FROM unnest(
+            CAST(:ids AS uuid[]),
+            CAST(:statuses AS varchar[]),
+            CAST(:errors AS text[]),
+            CAST(:sent_at AS timestamp[])
+        ) AS t(id, status, error, sent_at)
+    ),
+    previous AS (
+        SELECT r.id, r.status
+        FROM campaign_recipients r
+        JOIN incoming i ON i.id = r.id
+        FOR UPDATE OF r
+    ),
+    changed AS (
+        UPDATE campaign_recipients r
+        SET status = i.status,
+            error = i.error,
+            sent_at = coalesce(i.sent_at, r.sent_at),
+            last_update_at = :now
+        FROM incoming i
+        JOIN previous p ON p.id = i.id
+        WHERE r.id = i.id
+          AND (p.status IS DISTINCT FROM i.status OR i.error IS NOT NULL OR i.sent_at IS NOT NULL)
+        RETURNING r.campaign_id, p.status AS old_status, r.status AS new_status
+    ),
+    deltas AS (
+        SELECT
+            campaign_id,
+            count(*) FILTER (WHERE new_status NOT IN ('sent', 'failed'))
+                - count(*) FILTER (WHERE old_status NOT IN ('sent', 'failed')) AS pending,
+            count(*) FILTER (WHERE new_status = 'sent') - count(*) FILTER (WHERE old_status = 'sent') AS sent,
+            count(*) FILTER (WHERE new_status = 'failed') - count(*) FILTER (WHERE old_status = 'failed') AS failed,
+            count(*) AS updated
+        FROM changed
+        GROUP BY campaign_id
+    ),
+    counters AS (
+        UPDATE broadcast_campaigns c
+        SET pending_count = c.pending_count + d.pending,
+            sent_count = c.sent_count + d.sent,
+            failed_count = c.failed_count + d.failed,
+            updated_at = :now
+        FROM deltas d
+        WHERE c.id = d.campaign_id
+          AND (d.pending <> 0 OR d.sent <> 0 OR d.failed <> 0)
+    )
+    SELECT coalesce(sum(updated), 0) FROM deltas
+    """
+)
+
+
+async def apply_recipient_statuses(
+    session: AsyncSession,
+    updates: Iterable[RecipientStatusUpdate],
+    *,
+    batch_size: int = STATUS_BATCH_SIZE,
+) -> int:
+    """Apply delivery results in bulk and keep campaign counters in step.
+
+    Each batch of up to ``batch_size`` updates is a single statement driven by
+    array parameters, so a 50k-message broadcast costs a few dozen round
+    trips rather than 50k transactions. Later updates for the same recipient
+    win. Returns the number of recipient rows changed.
+    """
 
-    recipients: list[CampaignRecipient] = []
+    latest: dict[UUIDType, RecipientStatusUpdate] = {}
+    for update in updates:
+        latest[update.recipient_id] = update
+    pending = list(latest.values())
+
+    changed = 0
     now = datetime.utcnow()
-    for user_id in user_ids:
-        recipients.append(
-            CampaignRecipient(
-                campaign_id=campaign.id,
-                user_id=user_id,
-                status="pending",
-                last_update_at=now,
-            )
+    for offset in range(0, len(pending), batch_size):
+        batch = pending[offset : offset + batch_size]
+        result = await session.execute(
+            _BULK_STATUS_SQL,
+            {
+                "ids": [update.recipient_id for update in batch],
+                "statuses": [update.status for update in batch],
+                "errors": [update.error for update in batch],
+                "sent_at": [update.sent_at for update in batch],
+                "now": now,
+            },
         )
-
-    session.add_all(recipients)
+        changed += int(result.scalar_one())
     await session.commit()
-
-    return len(recipients)
+    return changed
 
 
 async def mark_recipient_status(
-    session: AsyncSession, recipient_id: UUIDType, status: str
+    session: AsyncSession,
+    recipient_id: UUIDType,
+    status: str,
+    *,
+    error: str | None = None,
+    sent_at: datetime | None = None,
 ) -> None:
-    result = await session.execute(
-        select(CampaignRecipient).where(CampaignRecipient.id == recipient_id)
+    await apply_recipient_statuses(
+        session, [RecipientStatusUpdate(recipient_id, status, error=error, sent_at=sent_at)]
     )
-    recipient = result.scalar_one_or_none()
-    if recipient is None:
-        return
 
-    recipient.status = status
-    recipient.last_update_at = datetime.utcnow()
 
-    session.add(recipient)
+# Rebuilds the counters from campaign_recipients. Needed once for campaigns
+# created before the counters existed, or to repair drift; run it while no
+# delivery results are being applied.
+_RECOUNT_SQL = text(
+    """
+    UPDATE broadcast_campaigns c
+    SET (pending_count, sent_count, failed_count) = (
+            SELECT
+                count(*) FILTER (WHERE r.status NOT IN ('sent', 'failed')),
+                count(*) FILTER (WHERE r.status = 'sent'),
+                count(*) FILTER (WHERE r.status = 'failed')
+            FROM campaign_recipients r
+            WHERE r.campaign_id = c.id
+        ),
+        updated_at = :now
+    WHERE CAST(:campaign_id AS uuid) IS NULL OR c.id = CAST(:campaign_id AS uuid)
+    """
+)
+
+
+async def recount_campaign_counters(session: AsyncSession, campaign_id: UUIDType | None = None) -> int:
+    """Recount pending/sent/failed counters from recipients; return campaigns updated."""
+
+    result = await session.execute(_RECOUNT_SQL, {"campaign_id": campaign_id, "now": datetime.utcnow()})
     await session.commit()
+    return result.rowcount or 0
+
+
+async def run_recount(campaign_id: UUIDType | None = None) -> int:
+    """Backfill campaign counters with the app's database::
+
+        cd backend && python -m app.services.campaigns [--campaign-id UUID]
+    """
+
+    from app.core.database import AsyncSessionLocal, engine
+
+    try:
+        async with AsyncSessionLocal() as session:
+            return await recount_campaign_counters(session, campaign_id)
+    finally:
+        await engine.dispose()
+
+
+async def get_campaign_progress(session: AsyncSession, campaign_id: UUIDType) -> dict[str, Any] | None:
+    """Return a campaign's status and delivery counters without counting recipients."""
+
+    result = await session.execute(
+        select(
+            BroadcastCampaign.status,
+            BroadcastCampaign.pending_count,
+            BroadcastCampaign.sent_count,
+            BroadcastCampaign.failed_count,
+        ).where(BroadcastCampaign.id == campaign_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return {
+        "campaign_id": campaign_id,
+        "status": row.status,
+        "pending": row.pending_count,
+        "sent": row.sent_count,
+        "failed": row.failed_count,
+        "total": row.pending_count + row.sent_count + row.failed_count,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recount campaign delivery counters from recipients.")
+    parser.add_argument("--campaign-id", type=UUIDType, help="Only this campaign (default: all campaigns)")
+    args = parser.parse_args()
+    print(f"Recounted {asyncio.run(run_recount(args.campaign_id))} campaigns")
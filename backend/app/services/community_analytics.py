@@ -1,144 +1,258 @@
-"""Community analytics and auto-proposal helpers."""
+"""Community analytics and auto-proposal helpers.
+
+The admin dashboard reads precomputed snapshots: :func:`build_community_snapshot`
+computes every metric with one ``FILTER``/``GROUPING SETS`` pass over users and
+one windowed pass over campaigns, :func:`refresh_community_snapshot` stores the
+result, and readers fetch the newest row. A background refresher started with
+the app keeps snapshots ``COMMUNITY_SNAPSHOT_REFRESH_SECONDS`` fresh.
+
+Builds are serialized across worker processes with a transaction-scoped
+Postgres advisory lock: a caller that loses the race, or finds a snapshot
+younger than its ``min_age``, gets the newest stored snapshot instead. That
+keeps N workers' refreshers to one build per interval and rate-limits
+``?refresh=true`` to one build per ``COMMUNITY_SNAPSHOT_MIN_REFRESH_SECONDS``.
+"""
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.amac_proposal import AMACProposal
-from app.models.campaign import Campaign
-from app.models.user_profile import UserProfile
+from app.models.community_stats import CommunityStatsSnapshot
 from app.services.amac_proposals import generate_proposals_from_metrics
+from app.services.user_engagement import ENGAGEMENT_DECAY_FACTOR, ENGAGEMENT_DECAY_PERIOD_SECONDS
+
+
+COMMUNITY_SNAPSHOT_REFRESH_SECONDS = float(os.getenv("COMMUNITY_SNAPSHOT_REFRESH_SECONDS", "300"))
+COMMUNITY_SNAPSHOT_KEEP = int(os.getenv("COMMUNITY_SNAPSHOT_KEEP", "288"))
+COMMUNITY_SNAPSHOT_MIN_REFRESH_SECONDS = float(os.getenv("COMMUNITY_SNAPSHOT_MIN_REFRESH_SECONDS", "60"))
+
+# pg_try_advisory_xact_lock key guarding snapshot builds ("comm").
+_SNAPSHOT_LOCK_KEY = 0x636F6D6D
+
+logger = logging.getLogger(__name__)
+
+# One scan of user_profiles. Each profile is unnested into one row per tag
+# (or a single row when untagged); the ``ord = 1`` row is its canonical row for
+# per-user aggregates. GROUPING SETS yield the overall totals, the per-language
+# breakdown (incl. the 7-day growth windows) and the per-tag counts together.
+_USER_STATS_SQL = text(
+    """
+    SELECT
+        GROUPING(p.language) AS language_rollup,
+        GROUPING(t.tag) AS tag_rollup,
+        p.language,
+        t.tag,
+        count(*) FILTER (WHERE coalesce(t.ord, 1) = 1) AS users,
+        count(*) FILTER (WHERE coalesce(t.ord, 1) = 1 AND p.last_activity_at >= :active_since) AS active,
+        avg(
+            p.engagement_score * power(
+                CAST(:decay_factor AS float8),
+                greatest(extract(epoch FROM (:now - coalesce(p.engagement_decayed_at, :now))), 0) / :decay_period
+            )
+        ) FILTER (WHERE coalesce(t.ord, 1) = 1) AS avg_engagement,
+        count(*) FILTER (WHERE coalesce(t.ord, 1) = 1 AND p.joined_at >= :recent_since) AS joined_recent,
+        count(*) FILTER (
+            WHERE coalesce(t.ord, 1) = 1 AND p.joined_at >= :previous_since AND p.joined_at < :recent_since
+        ) AS joined_previous,
+        count(t.tag) AS tagged
+    FROM user_profiles p
+    LEFT JOIN LATERAL unnest(p.tags) WITH ORDINALITY AS t(tag, ord) ON true
+    GROUP BY GROUPING SETS ((), (p.language), (t.tag))
+    """
+)
+
+# Window aggregates are computed over every campaign before LIMIT applies, so
+# the totals and the five latest campaigns come from one scan.
+_CAMPAIGN_STATS_SQL = text(
+    """
+    SELECT
+        name,
+        channel,
+        status,
+        created_at,
+        pending_count + sent_count + failed_count AS recipients_count,
+        count(*) OVER () AS total_campaigns,
+        sum(sent_count) OVER () AS sent_total,
+        sum(failed_count) OVER () AS failed_total
+    FROM broadcast_campaigns
+    ORDER BY created_at DESC
+    LIMIT 5
+    """
+)
+
+
+def _growth_candidates(languages: Dict[str, Dict[str, int]]) -> list[str]:
+    """Languages whose sign-ups this week clearly outpace the week before."""
+
+    candidates: list[str] = []
+    for lang, counts in languages.items():
+        recent_count = counts["joined_recent"]
+        previous_count = counts["joined_previous"]
+        if recent_count >= 5 and recent_count >= (previous_count * 1.5 + 1):
+            candidates.append(lang)
+    return candidates
 
 
-async def get_basic_community_stats(session: AsyncSession) -> dict:
-    """Return a set of high-level community metrics."""
-
-    total_users_result = await session.execute(select(func.count(UserProfile.id)))
-    total_users = total_users_result.scalar_one() or 0
+async def build_community_snapshot(session: AsyncSession) -> dict:
+    """Compute the full dashboard payload (one pass over users, one over campaigns)."""
 
-    recent_threshold = datetime.utcnow() - timedelta(days=7)
-    active_result = await session.execute(
-        select(func.count(UserProfile.id)).where(UserProfile.last_active_at >= recent_threshold)
+    now = datetime.utcnow()
+    user_rows = await session.execute(
+        _USER_STATS_SQL,
+        {
+            "active_since": now - timedelta(days=7),
+            "now": now,
+            "decay_factor": ENGAGEMENT_DECAY_FACTOR,
+            "decay_period": ENGAGEMENT_DECAY_PERIOD_SECONDS,
+            "recent_since": now - timedelta(days=7),
+            "previous_since": now - timedelta(days=14),
+        },
     )
-    active_last_7d = active_result.scalar_one() or 0
-
-    engagement_result = await session.execute(select(func.avg(UserProfile.engagement_score)))
-    avg_engagement_score = engagement_result.scalar_one() or 0.0
 
-    language_rows = await session.execute(
-        select(UserProfile.language, func.count(UserProfile.id))
-        .group_by(UserProfile.language)
-        .order_by(UserProfile.language)
-    )
-    segments_count_by_language: Dict[str, int] = {
-        language: count for language, count in language_rows.all()
-    }
-
-    # Tag distribution (top 5)
-    tag_counts_query = (
-        select(func.unnest(UserProfile.tags).label("tag"), func.count().label("count"))
-        .group_by("tag")
-        .order_by(func.count().desc())
-        .limit(5)
-    )
-    tag_rows = await session.execute(tag_counts_query)
-    segments_count_by_tag_top5: List[Dict[str, Any]] = [
-        {"tag": tag, "count": count} for tag, count in tag_rows.all()
-    ]
+    totals: Dict[str, Any] = {"users": 0, "active": 0, "avg_engagement": 0.0}
+    languages: Dict[str, Dict[str, int]] = {}
+    tags: List[Dict[str, Any]] = []
+    for row in user_rows.mappings():
+        if row["language_rollup"] and row["tag_rollup"]:
+            totals = row
+        elif not row["language_rollup"]:
+            languages[row["language"] or "unknown"] = {
+                "users": row["users"],
+                "joined_recent": row["joined_recent"],
+                "joined_previous": row["joined_previous"],
+            }
+        elif row["tag"] is not None:
+            tags.append({"tag": row["tag"], "count": row["tagged"]})
+    tags.sort(key=lambda item: (-item["count"], item["tag"]))
+
+    campaign_rows = (await session.execute(_CAMPAIGN_STATS_SQL)).mappings().all()
+    first = campaign_rows[0] if campaign_rows else {}
+    sent_total = first.get("sent_total") or 0
+    failed_total = first.get("failed_total") or 0
+    denominator = sent_total + failed_total
 
     return {
-        "total_users": total_users,
-        "active_last_7d": active_last_7d,
-        "avg_engagement_score": float(avg_engagement_score or 0),
-        "segments_count_by_language": segments_count_by_language,
-        "segments_count_by_tag_top5": segments_count_by_tag_top5,
+        "generated_at": now.isoformat(),
+        "community": {
+            "total_users": totals["users"] or 0,
+            "active_last_7d": totals["active"] or 0,
+            "avg_engagement_score": float(totals["avg_engagement"] or 0),
+            "segments_count_by_language": {lang: counts["users"] for lang, counts in sorted(languages.items())},
+            "segments_count_by_tag_top5": tags[:5],
+        },
+        "campaigns": {
+            "total_campaigns": first.get("total_campaigns") or 0,
+            "last_campaigns": [
+                {
+                    "name": row["name"],
+                    "channel": row["channel"],
+                    "recipients_count": row["recipients_count"],
+                    "status": row["status"],
+                    "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+                }
+                for row in campaign_rows
+            ],
+            "approximate_delivery_rate": (sent_total / denominator) if denominator else 0.0,
+        },
+        "language_growth": _growth_candidates(languages),
     }
 
 
-async def get_campaign_stats(session: AsyncSession) -> dict:
-    """Aggregate campaign delivery statistics."""
-
-    total_campaigns_result = await session.execute(select(func.count(Campaign.id)))
-    total_campaigns = total_campaigns_result.scalar_one() or 0
+async def _latest_snapshot(session: AsyncSession) -> CommunityStatsSnapshot | None:
+    result = await session.execute(
+        select(CommunityStatsSnapshot).order_by(CommunityStatsSnapshot.created_at.desc()).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def refresh_community_snapshot(
+    session: AsyncSession, *, min_age: float = 0.0
+) -> CommunityStatsSnapshot:
+    """Build and store a new snapshot, pruning all but the newest ``COMMUNITY_SNAPSHOT_KEEP``.
+
+    Returns the newest stored snapshot instead when another process holds the
+    build lock or that snapshot is younger than ``min_age`` seconds.
+    """
+
+    locked = await session.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _SNAPSHOT_LOCK_KEY})
+    latest = await _latest_snapshot(session)
+    if latest is not None:
+        age = (datetime.utcnow() - latest.created_at).total_seconds()
+        if not locked or age < min_age:
+            await session.commit()  # releases the lock without expiring ``latest``
+            return latest
+
+    started = time.perf_counter()
+    payload = await build_community_snapshot(session)
+    snapshot = CommunityStatsSnapshot(
+        payload=payload, build_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+    session.add(snapshot)
+    await session.flush()
 
-    last_campaigns_query = (
-        select(
-            Campaign.name,
-            Campaign.channel,
-            Campaign.recipients_count,
-            Campaign.status,
-            Campaign.created_at,
-        )
-        .order_by(Campaign.created_at.desc())
-        .limit(5)
+    keep = (
+        select(CommunityStatsSnapshot.id)
+        .order_by(CommunityStatsSnapshot.created_at.desc())
+        .limit(COMMUNITY_SNAPSHOT_KEEP)
     )
-    last_campaigns_rows = await session.execute(last_campaigns_query)
-    last_campaigns = [
-        {
-            "name": name,
-            "channel": channel,
-            "recipients_count": recipients_count,
-            "status": status,
-            "created_at": created_at,
-        }
-        for name, channel, recipients_count, status, created_at in last_campaigns_rows.all()
-    ]
-
-    delivery_totals_query = select(
-        func.sum(Campaign.sent_count), func.sum(Campaign.failed_count)
+    await session.execute(
+        delete(CommunityStatsSnapshot).where(CommunityStatsSnapshot.id.not_in(keep.scalar_subquery()))
     )
-    sent_total, failed_total = (
-        await session.execute(delivery_totals_query)
-    ).one_or_none() or (0, 0)
+    await session.commit()
+    return snapshot
 
-    sent_total = sent_total or 0
-    failed_total = failed_total or 0
-    denominator = sent_total + failed_total
-    approximate_delivery_rate = (sent_total / denominator) if denominator else 0.0
 
-    return {
-        "total_campaigns": total_campaigns,
-        "last_campaigns": last_campaigns,
-        "approximate_delivery_rate": approximate_delivery_rate,
-    }
+async def get_community_snapshot(
+    session: AsyncSession, *, force_refresh: bool = False
+) -> CommunityStatsSnapshot:
+    """Return the latest stored snapshot (an index lookup), building one if needed."""
 
+    if not force_refresh:
+        snapshot = await _latest_snapshot(session)
+        if snapshot is not None:
+            return snapshot
+    return await refresh_community_snapshot(session, min_age=COMMUNITY_SNAPSHOT_MIN_REFRESH_SECONDS)
 
-async def _language_growth_candidates(session: AsyncSession) -> list[str]:
-    """Detect languages with rapid recent growth."""
 
-    recent_window = datetime.utcnow() - timedelta(days=7)
-    previous_window = datetime.utcnow() - timedelta(days=14)
+async def run_snapshot_refresher(
+    session_factory: Callable[[], AsyncSession],
+    interval: float = COMMUNITY_SNAPSHOT_REFRESH_SECONDS,
+) -> None:
+    """Refresh the snapshot every ``interval`` seconds until cancelled.
 
-    recent_counts_query = (
-        select(UserProfile.language, func.count(UserProfile.id))
-        .where(UserProfile.created_at >= recent_window)
-        .group_by(UserProfile.language)
-    )
-    previous_counts_query = (
-        select(UserProfile.language, func.count(UserProfile.id))
-        .where(
-            UserProfile.created_at >= previous_window,
-            UserProfile.created_at < recent_window,
-        )
-        .group_by(UserProfile.language)
-    )
+    Every worker process runs one; the advisory lock and ``min_age`` mean only
+    one of them actually builds per interval.
+    """
 
-    recent_rows = await session.execute(recent_counts_query)
-    previous_rows = await session.execute(previous_counts_query)
+    while True:
+        try:
+            async with session_factory() as session:
+                await refresh_community_snapshot(session, min_age=interval / 2)
+        except Exception:  # pragma: no cover - keep refreshing after transient DB errors
+            logger.exception("Community stats snapshot refresh failed")
+        await asyncio.sleep(interval)
 
-    recent_map = {lang: count for lang, count in recent_rows.all()}
-    previous_map = {lang: count for lang, count in previous_rows.all()}
 
-    growth_candidates: list[str] = []
-    for lang, recent_count in recent_map.items():
-        previous_count = previous_map.get(lang, 0) or 0
-        if recent_count >= 5 and recent_count >= (previous_count * 1.5 + 1):
-            growth_candidates.append(lang)
+async def get_basic_community_stats(session: AsyncSession) -> dict:
+    """Return a set of high-level community metrics."""
+
+    snapshot = await get_community_snapshot(session)
+    return snapshot.payload["community"]
+
+
+async def get_campaign_stats(session: AsyncSession) -> dict:
+    """Aggregate campaign delivery statistics."""
 
-    return growth_candidates
+    snapshot = await get_community_snapshot(session)
+    return snapshot.payload["campaigns"]
 
 
 async def generate_community_growth_proposals(
@@ -146,7 +260,8 @@ async def generate_community_growth_proposals(
 ) -> list[AMACProposal]:
     """Create rule-based AMAC proposals from community metrics."""
 
-    stats = await get_basic_community_stats(session)
+    snapshot = await get_community_snapshot(session)
+    stats = snapshot.payload["community"]
     proposals: List[AMACProposal] = []
 
     def enqueue_proposal(title: str, description: str, tags: list[str] | None = None):
@@ -172,7 +287,7 @@ async def generate_community_growth_proposals(
             tags=["reactivation", "retention"],
         )
 
-    language_growth = await _language_growth_candidates(session)
+    language_growth = snapshot.payload.get("language_growth", [])
     for lang in language_growth:
         if len(proposals) >= limit:
             break
@@ -1,15 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Any, Protocol
+import asyncio
+import inspect
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Protocol, Sequence
+from uuid import UUID, uuid4
 from zoneinfo import ZoneInfo
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.daily_plan import DailyDevotionPlan
 from app.models.user_profile import UserProfile
+from app.services.user_engagement import decay_multiplier, effective_engagement_score
+
+logger = logging.getLogger(__name__)
+
+DAILY_PLAN_BATCH_SIZE = int(os.getenv("DAILY_PLAN_BATCH_SIZE", "2000"))
+DAILY_PLAN_LEARNING_BOOST_SCORE = float(os.getenv("DAILY_PLAN_LEARNING_BOOST_SCORE", "50"))
+# The nightly run plans for each user's local date at (run time + lead), so a
+# 21:00 UTC run with a 3h lead targets tomorrow in Israel and Moscow.
+DAILY_PLAN_PRECOMPUTE_HOUR = int(os.getenv("DAILY_PLAN_PRECOMPUTE_HOUR", "21"))
+DAILY_PLAN_LEAD_HOURS = float(os.getenv("DAILY_PLAN_LEAD_HOURS", "3"))
 
 
 @dataclass
@@ -37,24 +54,39 @@ _LABELS: dict[str, dict[str, str]] = {
 }
 
 
-def _determine_target_date(user: UserProfile, target_date: date | None) -> date:
-    if target_date:
-        return target_date
+def _local_date(timezone: str | None, moment: datetime | None = None) -> date:
+    """``moment`` (naive UTC, default now) as a date in ``timezone``."""
 
-    if user.timezone:
+    moment = moment or datetime.utcnow()
+    if timezone:
         try:
-            return datetime.now(ZoneInfo(user.timezone)).date()
+            return moment.replace(tzinfo=ZoneInfo("UTC")).astimezone(ZoneInfo(timezone)).date()
         except Exception:
             pass
 
-    return datetime.utcnow().date()
+    return moment.date()
+
+
+def _determine_target_date(user: UserProfile, target_date: date | None) -> date:
+    if target_date:
+        return target_date
+
+    return _local_date(user.timezone)
 
 
 def _label(code: str) -> dict[str, str]:
     return _LABELS.get(code, {"en": code})
 
 
+def _engagement_tier(score: float) -> str:
+    return "boost" if score >= DAILY_PLAN_LEARNING_BOOST_SCORE else "base"
+
+
 def _build_items(day_info: JewishDayInfo, user: UserProfile) -> list[dict[str, Any]]:
+    return _build_tier_items(day_info, _engagement_tier(effective_engagement_score(user)))
+
+
+def _build_tier_items(day_info: JewishDayInfo, tier: str) -> list[dict[str, Any]]:
     items: list[dict[str, Any]] = [
         {
             "type": "tefillah",
@@ -116,7 +148,7 @@ def _build_items(day_info: JewishDayInfo, user: UserProfile) -> list[dict[str, A
             ]
         )
 
-    if (user.engagement_score or 0) >= 50:
+    if tier == "boost":
         items.append(
             {
                 "type": "learning",
@@ -134,12 +166,16 @@ async def _fetch_day_info(
     calendar_service: JewishCalendarService, target_date: date | None
 ) -> JewishDayInfo:
     if hasattr(calendar_service, "get_jewish_day_info"):
-        return await calendar_service.get_jewish_day_info(target_date=target_date)
-
-    if hasattr(calendar_service, "get_day_info"):
-        return await calendar_service.get_day_info(target_date=target_date)
+        day_info = calendar_service.get_jewish_day_info(target_date=target_date)
+    elif hasattr(calendar_service, "get_day_info"):
+        day_info = calendar_service.get_day_info(target_date=target_date)
+    else:
+        raise AttributeError("Calendar service does not expose a day info method")
 
-    raise AttributeError("Calendar service does not expose a day info method")
+    # The zmanim-based calendar service is synchronous.
+    if inspect.isawaitable(day_info):
+        day_info = await day_info
+    return day_info
 
 
 async def generate_daily_plan_for_user(
@@ -208,3 +244,173 @@ async def get_or_generate_plan(
         calendar_service=calendar_service,
         target_date=plan_date,
     )
+
+
+@dataclass
+class DailyPlanBatchReport:
+    users: int = 0
+    plans_written: int = 0
+    day_contexts: int = 0
+    buckets: int = 0
+    elapsed: float = 0.0
+    dates: list[date] = field(default_factory=list)
+
+    @property
+    def users_per_second(self) -> float:
+        return self.users / self.elapsed if self.elapsed else 0.0
+
+
+def _plan_bucket(language: str | None, tier: str, tags: Sequence[str] | None) -> tuple[str, str, tuple[str, ...]]:
+    """Users in the same bucket on the same date get identical plan items."""
+
+    return (language or "", tier, tuple(sorted(set(tags or ()))))
+
+
+async def _upsert_plans(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    stmt = pg_insert(DailyDevotionPlan).values(rows)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DailyDevotionPlan.user_id, DailyDevotionPlan.date],
+            set_={
+                "jewish_date_str": stmt.excluded.jewish_date_str,
+                "day_type": stmt.excluded.day_type,
+                "items": stmt.excluded.items,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+async def precompute_daily_plans(
+    session: AsyncSession,
+    *,
+    calendar_service: JewishCalendarService,
+    target_date: date | None = None,
+    now: datetime | None = None,
+    lead: timedelta = timedelta(hours=DAILY_PLAN_LEAD_HOURS),
+    batch_size: int = DAILY_PLAN_BATCH_SIZE,
+) -> DailyPlanBatchReport:
+    """Generate and upsert plans for every user in a few bulk statements.
+
+    Each user's plan date is ``target_date`` or their local date at
+    ``now + lead``. Day info is fetched once per (date, timezone) and plan
+    items are built once per date and bucket (language, engagement tier,
+    tags). Users are read in keyset pages of ``batch_size`` and each page is
+    written with one ``INSERT ... ON CONFLICT DO UPDATE``, committed once at
+    the end. :func:`get_or_generate_plan` then finds the plan already there.
+    """
+
+    started = time.perf_counter()
+    now = now or datetime.utcnow()
+    report = DailyPlanBatchReport()
+    dates_by_timezone: dict[str | None, date] = {}
+    day_infos: dict[date, JewishDayInfo] = {}
+    bucket_items: dict[tuple[date, tuple[str, str, tuple[str, ...]]], list[dict[str, Any]]] = {}
+
+    last_id: UUID | None = None
+    while True:
+        query = (
+            select(
+                UserProfile.id,
+                UserProfile.timezone,
+                UserProfile.language,
+                UserProfile.tags,
+                UserProfile.engagement_score,
+                UserProfile.engagement_decayed_at,
+            )
+            .order_by(UserProfile.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(UserProfile.id > last_id)
+        users = (await session.execute(query)).all()
+        if not users:
+            break
+        last_id = users[-1].id
+
+        rows: list[dict[str, Any]] = []
+        written_at = datetime.utcnow()
+        for user in users:
+            if target_date is not None:
+                plan_date = target_date
+            else:
+                if user.timezone not in dates_by_timezone:
+                    dates_by_timezone[user.timezone] = _local_date(user.timezone, now + lead)
+                plan_date = dates_by_timezone[user.timezone]
+
+            day_info = day_infos.get(plan_date)
+            if day_info is None:
+                day_info = day_infos[plan_date] = await _fetch_day_info(calendar_service, plan_date)
+
+            score = (user.engagement_score or 0.0) * decay_multiplier(user.engagement_decayed_at, now)
+            key = (plan_date, _plan_bucket(user.language, _engagement_tier(score), user.tags))
+            items = bucket_items.get(key)
+            if items is None:
+                items = bucket_items[key] = _build_tier_items(day_info, key[1][1])
+
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "user_id": user.id,
+                    "date": plan_date,
+                    "jewish_date_str": day_info.jewish_date_str,
+                    "day_type": day_info.day_type,
+                    "items": items,
+                    "created_at": written_at,
+                    "updated_at": written_at,
+                }
+            )
+
+        await _upsert_plans(session, rows)
+        report.users += len(users)
+        report.plans_written += len(rows)
+
+    await session.commit()
+    report.day_contexts = len(day_infos)
+    report.buckets = len(bucket_items)
+    report.dates = sorted(day_infos)
+    report.elapsed = time.perf_counter() - started
+    logger.info(
+        "Precomputed %s daily plans in %.1fs (%.0f users/s, %s day contexts, %s buckets)",
+        report.plans_written,
+        report.elapsed,
+        report.users_per_second,
+        report.day_contexts,
+        report.buckets,
+    )
+    return report
+
+
+async def run_precompute(target_date: date | None = None) -> DailyPlanBatchReport:
+    """Precompute plans with the app's database and the configured calendar.
+
+    Entry point for the nightly ``daily_plans.precompute`` Celery beat task
+    (at ``DAILY_PLAN_PRECOMPUTE_HOUR`` UTC) and for manual runs::
+
+        cd backend && python -m app.services.daily_plan_service [--date YYYY-MM-DD]
+    """
+
+    from app.core.database import AsyncSessionLocal, engine
+    from app.services.jewish_calendar import get_calendar_service
+
+    try:
+        async with AsyncSessionLocal() as session:
+            return await precompute_daily_plans(
+                session, calendar_service=get_calendar_service(), target_date=target_date
+            )
+    finally:
+        # Each run owns its event loop; pooled connections must not outlive it.
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute daily devotion plans for every user.")
+    parser.add_argument("--date", type=date.fromisoformat, help="Plan date (default: each user's next local day)")
+    args = parser.parse_args()
+    result = asyncio.run(run_precompute(args.date))
+    print(
+        f"{result.plans_written} plans for {', '.join(map(str, result.dates)) or 'no dates'} "
+        f"in {result.elapsed:.1f}s ({result.users_per_second:.0f} users/s)"
+    )
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import bisect
 import importlib.util
+import json
+import os
+import threading
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
+from pathlib import Path
 from typing import Optional
 from zoneinfo import ZoneInfo
 
-from backend.app.schemas.jewish_calendar import JewishDayInfo, Zmanim
+from app.schemas.jewish_calendar import JewishDayInfo, Zmanim
 
-# Default coordinates/timezone should ideally be provided via environment variables:
-# HALACHA_LATITUDE, HALACHA_LONGITUDE, HALACHA_TIMEZONE
+# Default coordinates/timezone, used by get_calendar_service().
+HALACHA_LATITUDE = float(os.getenv("HALACHA_LATITUDE", "31.7857"))
+HALACHA_LONGITUDE = float(os.getenv("HALACHA_LONGITUDE", "35.2007"))
+HALACHA_TIMEZONE = os.getenv("HALACHA_TIMEZONE", "Asia/Jerusalem")
+
+# Restricted windows are precomputed per (location, year) and cached here so
+# is_shabbat_or_yom_tov is a bisect over sorted timestamps.
+HALACHA_INDEX_CACHE_DIR = os.getenv("HALACHA_INDEX_CACHE_DIR", ".cache/halachic")
+_RESTRICTED_DAY_TYPES = {"shabbat", "yom_tov"}
+_INDEX_VERSION = 1
 
 
 @dataclass
@@ -21,10 +34,20 @@ class _HebrewCalendarArtifacts:
 
 
 class JewishCalendarService:
-    def __init__(self, latitude: float, longitude: float, timezone: str):
+    def __init__(
+        self,
+        latitude: float,
+        longitude: float,
+        timezone: str,
+        *,
+        index_cache_dir: Optional[str] = HALACHA_INDEX_CACHE_DIR,
+    ):
         self.latitude = latitude
         self.longitude = longitude
         self.timezone = timezone
+        self.index_cache_dir = Path(index_cache_dir) if index_cache_dir else None
+        self._windows: dict[int, tuple[list[float], list[float]]] = {}
+        self._windows_lock = threading.Lock()
 
     def get_jewish_day_info(self, target_date: date | None = None) -> JewishDayInfo:
         tz = ZoneInfo(self.timezone)
@@ -46,6 +69,16 @@ class JewishCalendarService:
         )
 
     def is_shabbat_or_yom_tov(self, target_datetime: datetime) -> bool:
+        tz = ZoneInfo(self.timezone)
+        localized_dt = target_datetime if target_datetime.tzinfo else target_datetime.replace(tzinfo=tz)
+        starts, ends = self.restricted_windows(localized_dt.astimezone(tz).year)
+        moment = localized_dt.timestamp()
+        index = bisect.bisect_right(starts, moment) - 1
+        return index >= 0 and moment < ends[index]
+
+    def compute_is_shabbat_or_yom_tov(self, target_datetime: datetime) -> bool:
+        """Direct (uncached) check; reference implementation for the window index."""
+
         tz = ZoneInfo(self.timezone)
         localized_dt = target_datetime if target_datetime.tzinfo else target_datetime.replace(tzinfo=tz)
         current_day_info = self.get_jewish_day_info(localized_dt.date())
@@ -61,6 +94,79 @@ class JewishCalendarService:
 
         return False
 
+    def restricted_windows(self, year: int) -> tuple[list[float], list[float]]:
+        """Return sorted ``(starts, ends)`` epoch seconds of restricted spans in ``year``.
+
+        Built once per year from :meth:`get_jewish_day_info` and persisted under
+        ``HALACHA_INDEX_CACHE_DIR``; later checks never touch pyluach or zmanim.
+        """
+
+        windows = self._windows.get(year)
+        if windows is not None:
+            return windows
+        with self._windows_lock:
+            windows = self._windows.get(year)
+            if windows is None:
+                windows = self._load_windows(year)
+                if windows is None:
+                    windows = self._build_windows(year)
+                    self._save_windows(year, windows)
+                self._windows[year] = windows
+        return windows
+
+    def _build_windows(self, year: int) -> tuple[list[float], list[float]]:
+        tz = ZoneInfo(self.timezone)
+        starts: list[float] = []
+        ends: list[float] = []
+        day = date(year, 1, 1) - timedelta(days=1)
+        last = date(year, 12, 31) + timedelta(days=1)
+        while day <= last:
+            info = self.get_jewish_day_info(day)
+            if info.day_type in _RESTRICTED_DAY_TYPES:
+                begins = datetime.combine(day, time(0, 0), tzinfo=tz)
+                finishes = datetime.combine(day + timedelta(days=1), time(0, 0), tzinfo=tz)
+                if info.zmanim.havdalah and info.zmanim.havdalah > finishes:
+                    finishes = info.zmanim.havdalah
+                if starts and begins.timestamp() <= ends[-1]:
+                    ends[-1] = max(ends[-1], finishes.timestamp())
+                else:
+                    starts.append(begins.timestamp())
+                    ends.append(finishes.timestamp())
+            day += timedelta(days=1)
+        return starts, ends
+
+    def _windows_path(self, year: int) -> Optional[Path]:
+        if self.index_cache_dir is None:
+            return None
+        key = f"{self.latitude:.4f}_{self.longitude:.4f}_{self.timezone.replace('/', '-')}"
+        return self.index_cache_dir / f"backend-{key}-{year}.json"
+
+    def _load_windows(self, year: int) -> Optional[tuple[list[float], list[float]]]:
+        path = self._windows_path(year)
+        if path is None or not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if payload.get("version") != _INDEX_VERSION:
+            return None
+        return list(payload["starts"]), list(payload["ends"])
+
+    def _save_windows(self, year: int, windows: tuple[list[float], list[float]]) -> None:
+        path = self._windows_path(year)
+        # Without pyluach/zmanim the windows are approximations; keep them in
+        # memory only so installing the libraries takes effect on restart.
+        if path is None or not (importlib.util.find_spec("pyluach") and importlib.util.find_spec("zmanim")):
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": _INDEX_VERSION, "starts": windows[0], "ends": windows[1]}))
+            tmp.replace(path)
+        except OSError:
+            pass
+
     def _compute_hebrew_calendar_details(self, resolved_date: date) -> _HebrewCalendarArtifacts:
         jewish_date_str = resolved_date.isoformat()
         parsha: Optional[str] = None
@@ -176,7 +282,15 @@ class JewishCalendarService:
         return "weekday"
 
 
+def get_calendar_service() -> JewishCalendarService:
+    """Calendar for the configured ``HALACHA_*`` location."""
+
+    return JewishCalendarService(
+        latitude=HALACHA_LATITUDE, longitude=HALACHA_LONGITUDE, timezone=HALACHA_TIMEZONE
+    )
+
+
 if __name__ == "__main__":
-    svc = JewishCalendarService(latitude=31.7857, longitude=35.2007, timezone="Asia/Jerusalem")
+    svc = get_calendar_service()
     info = svc.get_jewish_day_info()
     print(info.model_dump())
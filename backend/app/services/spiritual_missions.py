@@ -11,6 +11,7 @@ from app.models.spiritual_mission import (
     SpiritualMissionInstance,
     SpiritualMissionTemplate,
 )
+from app.services.user_engagement import effective_engagement_score
 
 if TYPE_CHECKING:  # pragma: no cover - only for type checking
     from app.models.user_profile import UserProfile
@@ -70,7 +71,7 @@ async def instantiate_missions_for_user(
     applicable_templates = await get_applicable_templates(
         session,
         day_type=day_type_value or "",
-        engagement_score=getattr(user, "engagement_score", 0.0),
+        engagement_score=effective_engagement_score(user),
     )
 
     instances: list[SpiritualMissionInstance] = []
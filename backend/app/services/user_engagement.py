@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from typing import Callable
+from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import ColumnElement, DateTime, extract, func, literal, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_profile import UserProfile
 
+logger = logging.getLogger(__name__)
+
+# Scores shrink by ENGAGEMENT_DECAY_FACTOR per ENGAGEMENT_DECAY_PERIOD_HOURS,
+# applied lazily from engagement_decayed_at rather than by rewriting the table.
+ENGAGEMENT_DECAY_FACTOR = float(os.getenv("ENGAGEMENT_DECAY_FACTOR", "0.99"))
+ENGAGEMENT_DECAY_PERIOD_SECONDS = float(os.getenv("ENGAGEMENT_DECAY_PERIOD_HOURS", "24")) * 3600
+ENGAGEMENT_FLUSH_INTERVAL = float(os.getenv("ENGAGEMENT_FLUSH_INTERVAL", "2.0"))
+ENGAGEMENT_BUFFER_MAX_USERS = int(os.getenv("ENGAGEMENT_BUFFER_MAX_USERS", "5000"))
+ENGAGEMENT_FLUSH_BATCH_SIZE = int(os.getenv("ENGAGEMENT_FLUSH_BATCH_SIZE", "5000"))
+
 
 class EngagementEvent(str, Enum):
     MESSAGE_READ = "message_read"
@@ -77,25 +93,198 @@ async def get_or_create_user(
     return user
 
 
-async def register_event(
-    session: AsyncSession,
-    user: UserProfile,
-    event: EngagementEvent,
-    weight_override: float | None = None,
-) -> UserProfile:
-    delta = weight_override if weight_override is not None else BASE_WEIGHTS[event]
+def decay_multiplier(decayed_at: datetime | None, now: datetime) -> float:
+    """Decay factor accumulated between ``decayed_at`` and ``now``."""
 
-    user.engagement_score += delta
-    user.last_activity_at = datetime.utcnow()
+    if decayed_at is None or now <= decayed_at:
+        return 1.0
+    return ENGAGEMENT_DECAY_FACTOR ** ((now - decayed_at).total_seconds() / ENGAGEMENT_DECAY_PERIOD_SECONDS)
 
-    session.add(user)
-    await session.commit()
-    await session.refresh(user)
-    return user
 
+def effective_engagement_score(user: UserProfile, now: datetime | None = None) -> float:
+    """The stored score with decay since ``engagement_decayed_at`` applied."""
 
-async def decay_scores(session: AsyncSession, factor: float = 0.99) -> None:
-    await session.execute(
-        update(UserProfile).values(engagement_score=UserProfile.engagement_score * factor)
+    now = now or datetime.utcnow()
+    return (user.engagement_score or 0.0) * decay_multiplier(user.engagement_decayed_at, now)
+
+
+def effective_score_expression(now: datetime) -> ColumnElement[float]:
+    """SQL equivalent of :func:`effective_engagement_score` for filters and aggregates.
+
+    The result never exceeds the stored ``engagement_score``, so range filters
+    can pre-filter on the indexed column and then on this expression.
+    """
+
+    elapsed = extract(
+        "epoch", literal(now, DateTime) - func.coalesce(UserProfile.engagement_decayed_at, literal(now, DateTime))
     )
-    await session.commit()
+    return UserProfile.engagement_score * func.power(
+        ENGAGEMENT_DECAY_FACTOR, func.greatest(elapsed, 0) / ENGAGEMENT_DECAY_PERIOD_SECONDS
+    )
+
+
+# Decay each touched profile up to ``now`` and add its buffered delta in the
+# same write; untouched profiles are never rewritten.
+_FLUSH_SQL = text(
+    """
+    UPDATE user_profiles p
+    SET engagement_score = p.engagement_score * power(
+            CAST(:factor AS float8),
+            greatest(extract(epoch FROM (:now - coalesce(p.engagement_decayed_at, :now))), 0) / :period
+        ) + d.delta,
+        engagement_decayed_at = :now,
+        last_activity_at = greatest(p.last_activity_at, d.last_activity_at)
+    FROM unnest(
+        CAST(:ids AS uuid[]),
+        CAST(:deltas AS float8[]),
+        CAST(:activity AS timestamp[])
+    ) AS d(user_id, delta, last_activity_at)
+    WHERE p.id = d.user_id
+    """
+)
+
+
+@dataclass
+class _PendingEngagement:
+    delta: float = 0.0
+    events: int = 0
+    last_activity_at: datetime | None = None
+
+
+class EngagementBuffer:
+    """Write-behind buffer of engagement score deltas, aggregated per user.
+
+    :meth:`record` appends an event in memory; deltas for the same user are
+    summed, so a flush writes one row per active user via a single
+    ``UPDATE ... FROM unnest(...)`` per batch. Flushes happen every
+    ``ENGAGEMENT_FLUSH_INTERVAL`` seconds (:meth:`run`) or as soon as
+    ``ENGAGEMENT_BUFFER_MAX_USERS`` users are pending (at most one such early
+    flush is in flight at a time). Events still buffered
+    when the process dies are lost, which is acceptable for a decaying score.
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float = ENGAGEMENT_FLUSH_INTERVAL,
+        max_users: int = ENGAGEMENT_BUFFER_MAX_USERS,
+        batch_size: int = ENGAGEMENT_FLUSH_BATCH_SIZE,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.max_users = max_users
+        self.batch_size = batch_size
+        self._pending: dict[UUID, _PendingEngagement] = {}
+        self._flush_lock = asyncio.Lock()
+        self._session_factory: Callable[[], AsyncSession] | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    def record(self, user_id: UUID, delta: float, at: datetime | None = None) -> float:
+        """Buffer ``delta`` for ``user_id``; return the user's pending total."""
+
+        at = at or datetime.utcnow()
+        pending = self._pending.setdefault(user_id, _PendingEngagement())
+        pending.delta += delta
+        pending.events += 1
+        if pending.last_activity_at is None or at > pending.last_activity_at:
+            pending.last_activity_at = at
+        if (
+            len(self._pending) >= self.max_users
+            and self._session_factory is not None
+            and (self._flush_task is None or self._flush_task.done())
+        ):
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_logged())
+        return pending.delta
+
+    def pending_delta(self, user_id: UUID) -> float:
+        pending = self._pending.get(user_id)
+        return pending.delta if pending else 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def flush(self, session_factory: Callable[[], AsyncSession] | None = None) -> int:
+        """Write all buffered deltas; return the number of users updated."""
+
+        factory = session_factory or self._session_factory
+        if factory is None:
+            raise RuntimeError("EngagementBuffer.flush needs a session factory")
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            drained, self._pending = self._pending, {}
+            items = list(drained.items())
+            now = datetime.utcnow()
+            try:
+                async with factory() as session:
+                    for offset in range(0, len(items), self.batch_size):
+                        batch = items[offset : offset + self.batch_size]
+                        await session.execute(
+                            _FLUSH_SQL,
+                            {
+                                "ids": [user_id for user_id, _ in batch],
+                                "deltas": [pending.delta for _, pending in batch],
+                                "activity": [pending.last_activity_at for _, pending in batch],
+                                "factor": ENGAGEMENT_DECAY_FACTOR,
+                                "period": ENGAGEMENT_DECAY_PERIOD_SECONDS,
+                                "now": now,
+                            },
+                        )
+                    await session.commit()
+            except Exception:
+                # Put the deltas back so the next flush retries them.
+                for user_id, pending in drained.items():
+                    merged = self._pending.setdefault(user_id, _PendingEngagement())
+                    merged.delta += pending.delta
+                    merged.events += pending.events
+                    if merged.last_activity_at is None or (
+                        pending.last_activity_at and pending.last_activity_at > merged.last_activity_at
+                    ):
+                        merged.last_activity_at = pending.last_activity_at
+                raise
+            return len(items)
+
+    async def _flush_logged(self) -> None:
+        try:
+            await self.flush()
+        except Exception:  # pragma: no cover - deltas were put back for the next flush
+            logger.exception("Engagement buffer flush failed")
+
+    async def run(self, session_factory: Callable[[], AsyncSession]) -> None:
+        """Flush every ``flush_interval`` seconds until cancelled, then flush once more."""
+
+        self._session_factory = session_factory
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception:  # pragma: no cover - retried on the next tick
+                    logger.exception("Engagement buffer flush failed")
+        finally:
+            # Runs during lifespan shutdown; a DB error here must not escape it.
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Final engagement buffer flush failed; %s users' deltas lost", len(self._pending))
+
+
+engagement_buffer = EngagementBuffer()
+
+
+def register_event(
+    user: UserProfile,
+    event: EngagementEvent,
+    weight_override: float | None = None,
+    *,
+    buffer: EngagementBuffer | None = None,
+) -> float:
+    """Buffer an engagement event and return the user's projected score.
+
+    The score is written by the buffer's next flush; the returned value is the
+    decayed stored score plus everything still pending for the user.
+    """
+
+    buffer = buffer or engagement_buffer
+    delta = weight_override if weight_override is not None else BASE_WEIGHTS[event]
+    pending = buffer.record(user.id, delta)
+    return effective_engagement_score(user) + pending
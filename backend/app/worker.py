@@ -1,9 +1,12 @@
+import asyncio
 import logging
 
 from celery import Celery, signals
+from celery.schedules import crontab
 
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.services.daily_plan_service import DAILY_PLAN_PRECOMPUTE_HOUR, run_precompute
 
 
 configure_logging()
@@ -20,6 +23,12 @@ celery_app.conf.update(
     accept_content=["json"],
     result_serializer="json",
     worker_hijack_root_logger=False,
+    beat_schedule={
+        "daily-plan-precompute": {
+            "task": "daily_plans.precompute",
+            "schedule": crontab(hour=DAILY_PLAN_PRECOMPUTE_HOUR, minute=0),
+        },
+    },
 )
 
 
@@ -40,3 +49,16 @@ def log_task_end(task_id, task, state, **kwargs):
 async def process_task(task_id: int):
     # Placeholder for task processing logic
     return {"task_id": task_id, "status": "completed"}
+
+
+@celery_app.task(name="daily_plans.precompute")
+def precompute_daily_plans_task() -> dict:
+    """Nightly batch: upsert every user's plan for their next local day."""
+
+    report = asyncio.run(run_precompute())
+    return {
+        "users": report.users,
+        "plans_written": report.plans_written,
+        "dates": [day.isoformat() for day in report.dates],
+        "users_per_second": round(report.users_per_second, 1),
+    }
@@ -0,0 +1,128 @@
+import os
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.campaign import BroadcastCampaign, CampaignRecipient
+from app.models.user_profile import UserProfile
+from app.services.campaigns import RecipientStatusUpdate, apply_recipient_statuses, recount_campaign_counters
+
+# Throwaway Postgres database; everything runs in a rolled-back transaction.
+TEST_DATABASE_URL = os.getenv("BACKEND_TEST_DATABASE_URL")
+
+
+class _Result:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def scalar_one(self) -> int:
+        return self.value
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.batches: list[dict] = []
+        self.commits = 0
+
+    async def execute(self, _statement, params: dict) -> _Result:  # noqa: ANN001
+        self.batches.append(params)
+        return _Result(len(params["ids"]))
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+@pytest.mark.anyio
+async def test_later_updates_win_and_batches_are_summed() -> None:
+    first, second, third = uuid4(), uuid4(), uuid4()
+    session = _RecordingSession()
+
+    changed = await apply_recipient_statuses(
+        session,  # type: ignore[arg-type]
+        [
+            RecipientStatusUpdate(first, "failed", error="timeout"),
+            RecipientStatusUpdate(second, "sent"),
+            RecipientStatusUpdate(first, "sent"),
+            RecipientStatusUpdate(third, "sent"),
+        ],
+        batch_size=2,
+    )
+
+    assert changed == 3
+    assert session.commits == 1
+    assert [batch["ids"] for batch in session.batches] == [[first, second], [third]]
+    assert session.batches[0]["statuses"] == ["sent", "sent"]
+    assert session.batches[0]["errors"] == [None, None]
+
+
+def test_blocked_results_stay_pending_and_unknown_statuses_are_rejected() -> None:
+    held = RecipientStatusUpdate(uuid4(), "blocked", error="Shabbat")
+
+    assert held.status == "pending"
+    assert held.error == "Shabbat"
+    with pytest.raises(ValueError, match="delivered"):
+        RecipientStatusUpdate(uuid4(), "delivered")
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="BACKEND_TEST_DATABASE_URL not set")
+async def test_counters_move_by_net_status_deltas() -> None:
+    engine = create_async_engine(TEST_DATABASE_URL)
+    tables = [UserProfile.__table__, BroadcastCampaign.__table__, CampaignRecipient.__table__]
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            await conn.run_sync(lambda sync_conn: UserProfile.metadata.create_all(sync_conn, tables=tables))
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+            campaign = BroadcastCampaign(
+                name="test", channel="telegram", segment_filter={}, message_template="hi", pending_count=3
+            )
+            users = [UserProfile(external_id=str(index), channel="telegram") for index in range(3)]
+            session.add_all([campaign, *users])
+            await session.flush()
+            recipients = [CampaignRecipient(campaign_id=campaign.id, user_id=user.id) for user in users]
+            session.add_all(recipients)
+            await session.commit()
+            a, b, c = (recipient.id for recipient in recipients)
+
+            changed = await apply_recipient_statuses(
+                session,
+                [
+                    RecipientStatusUpdate(a, "sent", sent_at=datetime(2024, 1, 1)),
+                    RecipientStatusUpdate(b, "failed", error="blocked"),
+                    RecipientStatusUpdate(c, "pending"),  # no change: counters untouched
+                ],
+            )
+            assert changed == 2
+            assert await _counters(session, campaign.id) == (1, 1, 1)
+
+            changed = await apply_recipient_statuses(session, [RecipientStatusUpdate(b, "sent")])
+            assert changed == 1
+            assert await _counters(session, campaign.id) == (1, 2, 0)
+
+            await session.execute(
+                update(BroadcastCampaign)
+                .where(BroadcastCampaign.id == campaign.id)
+                .values(pending_count=0, sent_count=0, failed_count=0)
+            )
+            assert await recount_campaign_counters(session, campaign.id) == 1
+            assert await _counters(session, campaign.id) == (1, 2, 0)
+            await session.close()
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+async def _counters(session: AsyncSession, campaign_id) -> tuple[int, int, int]:  # noqa: ANN001
+    row = (
+        await session.execute(
+            select(
+                BroadcastCampaign.pending_count, BroadcastCampaign.sent_count, BroadcastCampaign.failed_count
+            ).where(BroadcastCampaign.id == campaign_id)
+        )
+    ).one()
+    return tuple(row)
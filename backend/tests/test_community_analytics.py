@@ -0,0 +1,13 @@
+from app.services.community_analytics import _growth_candidates
+
+
+def test_growth_candidates_need_volume_and_a_clear_jump() -> None:
+    languages = {
+        "he": {"users": 40, "joined_recent": 10, "joined_previous": 4},  # 10 >= 4 * 1.5 + 1
+        "ru": {"users": 40, "joined_recent": 10, "joined_previous": 7},  # 10 < 7 * 1.5 + 1
+        "en": {"users": 40, "joined_recent": 4, "joined_previous": 0},  # too few sign-ups
+        "fr": {"users": 40, "joined_recent": 5, "joined_previous": 0},
+    }
+
+    assert _growth_candidates(languages) == ["he", "fr"]
+    assert _growth_candidates({}) == []
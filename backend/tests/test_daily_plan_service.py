@@ -0,0 +1,21 @@
+from datetime import date
+
+from app.services.daily_plan_service import JewishDayInfo, _build_tier_items, _plan_bucket
+
+
+def test_plan_bucket_ignores_tag_order_and_duplicates() -> None:
+    assert _plan_bucket("he", "base", ["torah", "chesed", "torah"]) == ("he", "base", ("chesed", "torah"))
+    assert _plan_bucket("he", "base", ["chesed", "torah"]) == _plan_bucket("he", "base", ["torah", "chesed"])
+    assert _plan_bucket(None, "boost", None) == ("", "boost", ())
+    assert _plan_bucket("he", "base", []) != _plan_bucket("he", "boost", [])
+
+
+def test_tier_items_follow_day_type_and_tier() -> None:
+    shabbat = JewishDayInfo(date=date(2024, 3, 2), jewish_date_str="22 Adar I 5784", day_type="shabbat")
+    weekday = JewishDayInfo(date=date(2024, 3, 4), jewish_date_str="24 Adar I 5784", day_type="weekday")
+
+    shabbat_codes = [item["code"] for item in _build_tier_items(shabbat, "base")]
+    boost_codes = [item["code"] for item in _build_tier_items(weekday, "boost")]
+
+    assert "parsha_insight" in shabbat_codes and "learning_boost" not in shabbat_codes
+    assert boost_codes[-1] == "learning_boost" and "parsha_insight" not in boost_codes
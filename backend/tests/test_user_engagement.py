@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.services.user_engagement import EngagementBuffer
+
+
+class _Session:
+    def __init__(self, on_execute=None) -> None:  # noqa: ANN001
+        self.on_execute = on_execute
+        self.params: list[dict] = []
+
+    async def __aenter__(self) -> "_Session":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:  # noqa: ANN002
+        return None
+
+    async def execute(self, _statement, params: dict) -> None:  # noqa: ANN001
+        self.params.append(params)
+        if self.on_execute is not None:
+            self.on_execute()
+
+    async def commit(self) -> None:
+        return None
+
+
+@pytest.mark.anyio
+async def test_failed_flush_merges_deltas_with_events_recorded_meanwhile() -> None:
+    buffer = EngagementBuffer(max_users=100)
+    user = uuid4()
+    buffer.record(user, 2.0, at=datetime(2024, 1, 1))
+
+    def fail_after_new_event() -> None:
+        buffer.record(user, 3.0, at=datetime(2024, 1, 2))
+        raise ConnectionError("db down")
+
+    with pytest.raises(ConnectionError):
+        await buffer.flush(lambda: _Session(fail_after_new_event))
+
+    assert buffer.pending_delta(user) == 5.0
+    assert len(buffer) == 1
+
+    session = _Session()
+    assert await buffer.flush(lambda: session) == 1
+    assert session.params[0]["deltas"] == [5.0]
+    assert session.params[0]["activity"] == [datetime(2024, 1, 2)]
+    assert len(buffer) == 0
+
+
+@pytest.mark.anyio
+async def test_full_buffer_schedules_one_flush_at_a_time() -> None:
+    buffer = EngagementBuffer(max_users=1)
+    sessions: list[_Session] = []
+
+    def factory() -> _Session:
+        sessions.append(_Session())
+        return sessions[-1]
+
+    buffer._session_factory = factory
+    for _ in range(5):
+        buffer.record(uuid4(), 1.0)
+    task = buffer._flush_task
+    assert task is not None
+
+    await task
+    assert len(sessions) == 1
+    assert len(sessions[0].params[0]["ids"]) == 5
+
+
+@pytest.mark.anyio
+async def test_run_swallows_a_failing_final_flush() -> None:
+    buffer = EngagementBuffer(flush_interval=60)
+    buffer.record(uuid4(), 1.0)
+
+    def broken() -> _Session:
+        raise ConnectionError("db down")
+
+    runner = asyncio.ensure_future(buffer.run(broken))
+    await asyncio.sleep(0)
+    runner.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await runner
+    assert len(buffer) == 1
@@ -24,9 +24,8 @@ export type PinkasEntry = {
 
 export type PinkasListResponse = {
   items: PinkasEntry[];
-  total?: number;
   limit?: number;
-  offset?: number;
+  next_cursor?: string | null;
 };
 
 export type ScheduleCommandBody = {
@@ -83,16 +82,20 @@ export async function getHealth(): Promise<HealthResponse> {
 
 export async function getPinkas(params: {
   limit?: number;
-  offset?: number;
+  cursor?: string;
   agent?: string;
   status?: string;
+  since?: string;
+  until?: string;
 } = {}): Promise<PinkasListResponse> {
   const searchParams = new URLSearchParams();
 
   if (params.limit) searchParams.append("limit", String(params.limit));
-  if (params.offset) searchParams.append("offset", String(params.offset));
+  if (params.cursor) searchParams.append("cursor", params.cursor);
   if (params.agent) searchParams.append("agent", params.agent);
   if (params.status) searchParams.append("status", params.status);
+  if (params.since) searchParams.append("since", params.since);
+  if (params.until) searchParams.append("until", params.until);
 
   const query = searchParams.toString();
   const path = `/pinkas${query ? `?${query}` : ""}`;
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from typing import Iterable
 
+from langgraph_core.text import compile_phrase_matcher
+
 from .schemas import BoardDecision, Proposal, RoleOpinion
 
 
@@ -10,12 +12,8 @@ FORBIDDEN_KEYWORDS: set[str] = {"adult"}
 
 
 def _contains_forbidden(content: Iterable[str]) -> bool:
-    for value in content:
-        lower_value = value.lower()
-        for keyword in FORBIDDEN_KEYWORDS:
-            if keyword in lower_value:
-                return True
-    return False
+    matcher = compile_phrase_matcher({"forbidden": sorted(FORBIDDEN_KEYWORDS)})
+    return matcher.contains_any(content)
 
 
 def simulate_board_meeting(proposal: Proposal) -> BoardDecision:
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from langgraph_core.text import PhraseMatcher, compile_phrase_matcher
+
 from .schemas import CPAOInput, CPAOJudgement
 
 
@@ -41,20 +43,34 @@ class CPAOEvaluator:
             },
         }
 
+    def _content_matcher(self) -> PhraseMatcher:
+        # Compiled once per distinct keyword set; a changed constitution
+        # produces a new matcher on the next evaluation.
+        content = self.constitution.get("content", {})
+        return compile_phrase_matcher(
+            {
+                "gossip": content.get("gossip_keywords", []),
+                "insult": content.get("insults", []),
+            }
+        )
+
     def evaluate(self, inp: CPAOInput) -> CPAOJudgement:
         reasons: list[str] = []
         recommendations: list[str] = []
+        matches: list[dict[str, Any]] = []
         decision = "allow"
         allowed = True
 
         if inp.action_type == "content.publish":
-            text = str(inp.payload.get("text", "")).lower()
-            gossip_keywords = self.constitution.get("content", {}).get("gossip_keywords", [])
-            insults = self.constitution.get("content", {}).get("insults", [])
+            text = str(inp.payload.get("text", ""))
+            matcher = self._content_matcher()
+            labels = matcher.matched_labels(text)
+            if labels:
+                matches = [match.as_dict() for match in matcher.find_all(text, labels=labels)]
 
-            if any(keyword in text for keyword in gossip_keywords):
+            if "gossip" in labels:
                 reasons.append("Potential lashon hara or gossip detected in content.")
-            if any(insult in text for insult in insults):
+            if "insult" in labels:
                 reasons.append("Insulting language found in content.")
 
             if reasons:
@@ -103,6 +119,7 @@ class CPAOEvaluator:
             reasons=reasons or ["No issues detected under CPAO rules."],
             risk_level=risk_level,
             recommendations=recommendations,
+            matches=matches,
         )
 
     def is_allowed(self, inp: CPAOInput) -> bool:
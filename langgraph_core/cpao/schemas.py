@@ -15,3 +15,4 @@ class CPAOJudgement(BaseModel):
     reasons: list[str]
     risk_level: str
     recommendations: list[str] = Field(default_factory=list)
+    matches: list[dict] = Field(default_factory=list)
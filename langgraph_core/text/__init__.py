@@ -0,0 +1,34 @@
+"""Text normalization and phrase matching shared by the API, backend and LangGraph services.
+
+Kept outside either ``app`` package so every service can import it no matter
+which ``app`` is on its path.
+"""
+
+from .normalization import (
+    MAQAF,
+    NIQQUD_PATTERN,
+    NIQQUD_SQL_PATTERN,
+    WHITESPACE_SQL_PATTERN,
+    fold_for_matching,
+    fold_with_offsets,
+    normalize_search_text,
+    search_text_sql,
+    strip_niqqud,
+)
+from .phrase_matcher import PhraseMatch, PhraseMatcher, compile_phrase_matcher, rules_key
+
+__all__ = [
+    "MAQAF",
+    "NIQQUD_PATTERN",
+    "NIQQUD_SQL_PATTERN",
+    "WHITESPACE_SQL_PATTERN",
+    "PhraseMatch",
+    "PhraseMatcher",
+    "compile_phrase_matcher",
+    "fold_for_matching",
+    "fold_with_offsets",
+    "normalize_search_text",
+    "rules_key",
+    "search_text_sql",
+    "strip_niqqud",
+]
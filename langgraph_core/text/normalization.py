@@ -0,0 +1,114 @@
+"""Text normalization shared by lexical search and rule matching.
+
+Hebrew sources arrive with or without niqqud (vowel points) and cantillation
+marks, so ``שָׁלוֹם`` and ``שלום`` must compare equal. Normalization strips
+those marks, turns the maqaf into a space and lowercases Latin/Cyrillic text.
+
+:func:`normalize_search_text` and :func:`search_text_sql` are the same
+function on both sides of the query: NFKD (which also splits Hebrew
+presentation forms and ligatures), niqqud removal, maqaf to space, ``lower``
+and whitespace collapsing. The SQL form needs Postgres 13+ for
+``normalize()``. ``NIQQUD_SQL_PATTERN`` is valid both for :mod:`re` and for
+Postgres ``regexp_replace`` (ARE ``\\uXXXX`` escapes).
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+# Cantillation (U+0591-U+05AF) and vowel points/dagesh/meteg, excluding the
+# punctuation code points maqaf (05BE), paseq (05C0), sof pasuq (05C3) and
+# nun hafukha (05C6).
+NIQQUD_SQL_PATTERN = r"[\u0591-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]"
+NIQQUD_PATTERN = re.compile(NIQQUD_SQL_PATTERN)
+MAQAF = "\u05BE"
+
+# ASCII whitespace only; NFKD already maps no-break and other compatibility
+# spaces to U+0020, and Postgres ``\s`` is locale-dependent.
+WHITESPACE_SQL_PATTERN = r"[\t\n\v\f\r ]+"
+_WHITESPACE = re.compile(WHITESPACE_SQL_PATTERN)
+
+
+def strip_niqqud(text: str) -> str:
+    """Remove Hebrew vowel points and cantillation marks."""
+
+    return NIQQUD_PATTERN.sub("", unicodedata.normalize("NFKD", text))
+
+
+def normalize_search_text(text: str | None) -> str:
+    """Return the canonical form used for lexical search and keyword matching."""
+
+    if not text:
+        return ""
+    stripped = strip_niqqud(text).replace(MAQAF, " ")
+    return _WHITESPACE.sub(" ", stripped.lower()).strip(" ")
+
+
+def search_text_sql(expression: str) -> str:
+    """Postgres counterpart of :func:`normalize_search_text` applied to ``expression``."""
+
+    return (
+        "btrim(regexp_replace(lower(regexp_replace(regexp_replace("
+        f"normalize({expression}, NFKD), '{NIQQUD_SQL_PATTERN}', '', 'g'), "
+        f"'\\u05BE', ' ', 'g')), '{WHITESPACE_SQL_PATTERN}', ' ', 'g'), ' ')"
+    )
+
+
+_FOLDED_CHARS: Dict[str, str] = {}
+
+
+def fold_for_matching(text: str) -> str:
+    """Niqqud-free, casefolded, whitespace-collapsed text for phrase matching.
+
+    Unlike :func:`normalize_search_text` the result stays decomposed, so it
+    lines up character for character with :func:`fold_with_offsets`.
+    """
+
+    if not unicodedata.is_normalized("NFKD", text):
+        text = unicodedata.normalize("NFKD", text)
+    return " ".join(NIQQUD_PATTERN.sub("", text).replace(MAQAF, " ").casefold().split())
+
+
+def _fold_char(char: str) -> str:
+    folded = _FOLDED_CHARS.get(char)
+    if folded is None:
+        folded = NIQQUD_PATTERN.sub("", unicodedata.normalize("NFKD", char)).replace(MAQAF, " ").casefold()
+        if folded.isspace():
+            folded = " "
+        _FOLDED_CHARS[char] = folded
+    return folded
+
+
+def fold_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """Return :func:`fold_for_matching` output plus each character's source index."""
+
+    chars: List[str] = []
+    offsets: List[int] = []
+    for index, char in enumerate(text):
+        folded = _fold_char(char)
+        if folded == " ":
+            if chars and chars[-1] != " ":
+                chars.append(" ")
+                offsets.append(index)
+            continue
+        for piece in folded:
+            chars.append(piece)
+            offsets.append(index)
+    if chars and chars[-1] == " ":
+        chars.pop()
+        offsets.pop()
+    return "".join(chars), offsets
+
+
+__all__ = [
+    "MAQAF",
+    "NIQQUD_PATTERN",
+    "NIQQUD_SQL_PATTERN",
+    "WHITESPACE_SQL_PATTERN",
+    "fold_for_matching",
+    "fold_with_offsets",
+    "normalize_search_text",
+    "search_text_sql",
+    "strip_niqqud",
+]
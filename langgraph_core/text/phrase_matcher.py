@@ -0,0 +1,164 @@
+"""Compiled multi-phrase matcher for rule and keyword checks.
+
+Rule lists (halachic speech patterns, CPAO content keywords, board compliance
+terms) used to be checked with one ``phrase in text.lower()`` scan per
+phrase, i.e. O(phrases x text) per message. :class:`PhraseMatcher` compiles
+each label's phrases into a single trie-shaped regular expression, so a scan
+costs one pass over the text regardless of how many phrases there are.
+
+Text and phrases share the normalization from
+:mod:`langgraph_core.text.normalization` (niqqud and cantillation stripped, maqaf as
+space, casefolded, whitespace collapsed), so ``שָׁלוֹם`` matches ``שלום`` and
+``Он  Сказал`` matches ``он сказал``. Matches report offsets into the original,
+unnormalized text for explainability. Semantics match the old substring
+checks: a label fires when any of its phrases occurs anywhere in the text.
+
+Decisions should use :meth:`PhraseMatcher.matched_labels` (one search per
+label, no offset map) and ask :meth:`PhraseMatcher.find_all` for offsets only
+when a label fired, passing those labels so the search is not repeated.
+
+Matchers are cached by rule content: :func:`compile_phrase_matcher` only
+builds a new automaton when the phrase lists actually change.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Pattern, Sequence, Tuple
+
+from .normalization import fold_for_matching, fold_with_offsets
+
+RuleKey = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    """A rule phrase found in a text, with offsets into the original string."""
+
+    label: str
+    phrase: str
+    start: int
+    end: int
+    text: str
+
+    def as_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """Build a regex whose alternations are factored by common prefix."""
+
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional: prefer the longest phrase at this position.
+            return body + "?" if len(branches) == 1 and len(branches[0]) == 1 else "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class PhraseMatcher:
+    """Match many labelled phrases against a text in one pass per label."""
+
+    def __init__(self, rules: Mapping[str, Iterable[str]]) -> None:
+        self.labels: List[str] = []
+        self._patterns: List[Tuple[str, Pattern[str], Dict[str, str]]] = []
+        for label, phrases in rules.items():
+            originals: Dict[str, str] = {}
+            for phrase in phrases:
+                folded = fold_for_matching(phrase).strip()
+                if folded:
+                    originals.setdefault(folded, phrase)
+            self.labels.append(label)
+            if originals:
+                self._patterns.append((label, re.compile(_trie_pattern(originals)), originals))
+
+    def __len__(self) -> int:
+        return sum(len(originals) for _, _, originals in self._patterns)
+
+    def matched_labels(self, text: Optional[str]) -> List[str]:
+        """Return the labels with at least one phrase in ``text``, in rule order."""
+
+        if not text:
+            return []
+        folded = fold_for_matching(text)
+        return [label for label, pattern, _ in self._patterns if pattern.search(folded)]
+
+    def contains_any(self, values: Iterable[Optional[str]]) -> bool:
+        """Return True if any value contains any phrase of any label."""
+
+        for value in values:
+            if not value:
+                continue
+            folded = fold_for_matching(value)
+            if any(pattern.search(folded) for _, pattern, _ in self._patterns):
+                return True
+        return False
+
+    def find_all(self, text: Optional[str], labels: Optional[Iterable[str]] = None) -> List[PhraseMatch]:
+        """Return every non-overlapping match per label, ordered by position.
+
+        ``labels`` restricts the scan to labels already known to match (e.g.
+        from :meth:`matched_labels`), skipping the search pass.
+        """
+
+        if not text:
+            return []
+        if labels is None:
+            folded = fold_for_matching(text)
+            hits = [entry for entry in self._patterns if entry[1].search(folded)]
+        else:
+            wanted = set(labels)
+            hits = [entry for entry in self._patterns if entry[0] in wanted]
+        if not hits:
+            return []
+
+        # Offsets are only worth tracking once something matched.
+        folded, offsets = fold_with_offsets(text)
+        matches: List[PhraseMatch] = []
+        for label, pattern, originals in hits:
+            for found in pattern.finditer(folded):
+                start = offsets[found.start()]
+                end = offsets[found.end() - 1] + 1
+                matches.append(
+                    PhraseMatch(
+                        label=label,
+                        phrase=originals.get(found.group(), found.group()),
+                        start=start,
+                        end=end,
+                        text=text[start:end],
+                    )
+                )
+        matches.sort(key=lambda match: (match.start, match.label))
+        return matches
+
+
+def rules_key(rules: Mapping[str, Iterable[str]]) -> RuleKey:
+    return tuple((label, tuple(phrases)) for label, phrases in rules.items())
+
+
+@lru_cache(maxsize=32)
+def _compile(key: RuleKey) -> PhraseMatcher:
+    return PhraseMatcher(dict(key))
+
+
+def compile_phrase_matcher(rules: Mapping[str, Sequence[str]]) -> PhraseMatcher:
+    """Return a matcher for ``rules``, reusing the compiled one if unchanged."""
+
+    return _compile(rules_key(rules))
+
+
+__all__ = ["PhraseMatch", "PhraseMatcher", "compile_phrase_matcher", "rules_key"]
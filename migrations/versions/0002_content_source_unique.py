@@ -0,0 +1,71 @@
+"""Add a partial unique index on content_items.source for bulk dedupe.
+
+Revision ID: 0002_content_source_unique
+Revises: 0001_uuid_upgrade
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002_content_source_unique"
+down_revision = "0001_uuid_upgrade"
+branch_labels = None
+depends_on = None
+
+
+def _merge_duplicate_sources() -> None:
+    # Earlier imports could store the same ref more than once. Keep the oldest
+    # row per source and repoint generated content at it. The other copies are
+    # retired rather than deleted: they lose their source (so the unique index
+    # can be built), are marked inactive and touched, which puts them back in
+    # the incremental indexer's backlog so their vector points are removed
+    # from Qdrant on its next run.
+    op.execute(
+        """
+        CREATE TEMP TABLE content_source_duplicates AS
+        SELECT id, keeper FROM (
+            SELECT id, first_value(id) OVER (PARTITION BY source ORDER BY created_at, id) AS keeper
+            FROM content_items
+            WHERE source IS NOT NULL
+        ) ranked
+        WHERE id <> keeper
+        """
+    )
+    if sa.inspect(op.get_bind()).has_table("generated_content"):
+        op.execute(
+            "UPDATE generated_content g SET source_id = d.keeper "
+            "FROM content_source_duplicates d WHERE g.source_id = d.id"
+        )
+    op.execute(
+        """
+        UPDATE content_items c
+        SET is_active = false,
+            source = NULL,
+            metadata = coalesce(c.metadata, '{}'::jsonb)
+                || jsonb_build_object('duplicate_of', d.keeper::text, 'duplicate_source', c.source),
+            updated_at = now()
+        FROM content_source_duplicates d
+        WHERE c.id = d.id
+        """
+    )
+    op.execute("DROP TABLE content_source_duplicates")
+
+
+def upgrade():
+    _merge_duplicate_sources()
+    # Bulk ingestion relies on ON CONFLICT (source) DO NOTHING to skip verses
+    # that were already imported.
+    op.create_index(
+        "uq_content_source",
+        "content_items",
+        ["source"],
+        unique=True,
+        postgresql_where=sa.text("source IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_content_source", table_name="content_items")
@@ -0,0 +1,47 @@
+"""Add niqqud-normalized lexical search columns and indexes to content_items.
+
+Revision ID: 0003_content_search
+Revises: 0002_content_source_unique
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_content_search"
+down_revision = "0002_content_source_unique"
+branch_labels = None
+depends_on = None
+
+
+# Must match app.models.content.SEARCH_TEXT_SQL.
+SEARCH_TEXT_SQL = (
+    "lower(regexp_replace(regexp_replace("
+    "coalesce(title_he, '') || ' ' || coalesce(title_en, '') || ' ' || "
+    "coalesce(source, '') || ' ' || body_he || ' ' || coalesce(body_en, ''), "
+    r"'[\u0591-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]', '', 'g'), '\u05BE', ' ', 'g'))"
+)
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute(
+        f"ALTER TABLE content_items ADD COLUMN search_text text "
+        f"GENERATED ALWAYS AS ({SEARCH_TEXT_SQL}) STORED"
+    )
+    op.execute(
+        f"ALTER TABLE content_items ADD COLUMN search_tsv tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {SEARCH_TEXT_SQL})) STORED"
+    )
+    op.execute(
+        "CREATE INDEX idx_content_search_trgm ON content_items USING gin (search_text gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX idx_content_search_tsv ON content_items USING gin (search_tsv)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_content_search_tsv")
+    op.execute("DROP INDEX IF EXISTS idx_content_search_trgm")
+    op.execute("ALTER TABLE content_items DROP COLUMN IF EXISTS search_tsv")
+    op.execute("ALTER TABLE content_items DROP COLUMN IF EXISTS search_text")
@@ -0,0 +1,33 @@
+"""Track content hashes and pending RAG index work on content_items.
+
+Revision ID: 0004_content_index_tracking
+Revises: 0003_content_search
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_content_index_tracking"
+down_revision = "0003_content_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("content_items", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    # Small partial index covering only rows the incremental indexer still has
+    # to visit; drives both the keyset stream and the backlog-lag metric.
+    op.create_index(
+        "idx_content_index_pending",
+        "content_items",
+        ["updated_at", "id"],
+        postgresql_where=sa.text("indexed_at IS NULL OR updated_at > indexed_at"),
+    )
+
+
+def downgrade():
+    op.drop_index("idx_content_index_pending", table_name="content_items")
+    op.drop_column("content_items", "content_hash")
@@ -0,0 +1,46 @@
+"""Composite (filter, timestamp, id) indexes for keyset pagination of pinkas.
+
+Revision ID: 0005_pinkas_keyset_indexes
+Revises: 0004_content_index_tracking
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_pinkas_keyset_indexes"
+down_revision = "0004_content_index_tracking"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (timestamp, id) gives a total order, so "< cursor" seeks are exact and
+    # each filter's equality column leads its own index.
+    op.drop_index("idx_pinkas_timestamp", table_name="pinkas")
+    op.drop_index("idx_pinkas_agent", table_name="pinkas")
+    op.drop_index("idx_pinkas_status", table_name="pinkas")
+    op.create_index(
+        "idx_pinkas_timestamp", "pinkas", [sa.text("timestamp DESC"), sa.text("id DESC")]
+    )
+    op.create_index(
+        "idx_pinkas_agent_timestamp",
+        "pinkas",
+        ["agent", sa.text("timestamp DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "idx_pinkas_status_timestamp",
+        "pinkas",
+        ["status", sa.text("timestamp DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_pinkas_status_timestamp", table_name="pinkas")
+    op.drop_index("idx_pinkas_agent_timestamp", table_name="pinkas")
+    op.drop_index("idx_pinkas_timestamp", table_name="pinkas")
+    op.create_index("idx_pinkas_timestamp", "pinkas", [sa.text("timestamp DESC")])
+    op.create_index("idx_pinkas_agent", "pinkas", ["agent"])
+    op.create_index("idx_pinkas_status", "pinkas", ["status"])
@@ -0,0 +1,197 @@
+"""Partition pinkas and agent_logs by month and add hourly rollup tables.
+
+Both tables become ``PARTITION BY RANGE (timestamp)`` parents with one
+partition per month (``<table>_YYYY_MM``), covering existing rows through
+three months ahead; app.db.partitions keeps creating future partitions and
+retires expired ones. The partition key joins the primary key, as Postgres
+requires.
+
+Revision ID: 0006_partition_audit_tables
+Revises: 0005_pinkas_keyset_indexes
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_partition_audit_tables"
+down_revision = "0005_pinkas_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _create_monthly_partitions(table: str, legacy: str | None) -> None:
+    # One partition per month from the oldest legacy row (or now) to
+    # MONTHS_AHEAD months out. No DEFAULT partition: a missing month should
+    # fail loudly rather than silently collect unpartitioned rows.
+    first = f"(SELECT min(timestamp) FROM {legacy})" if legacy else "NULL"
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month date := date_trunc('month', coalesce({first}, now()))::date;
+            last date := (date_trunc('month', now()) + interval '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE month <= last LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+
+
+def _partition_pinkas() -> None:
+    op.drop_index("idx_pinkas_status_timestamp", table_name="pinkas")
+    op.drop_index("idx_pinkas_agent_timestamp", table_name="pinkas")
+    op.drop_index("idx_pinkas_timestamp", table_name="pinkas")
+    op.rename_table("pinkas", "pinkas_legacy")
+    op.execute("ALTER TABLE pinkas_legacy RENAME CONSTRAINT pinkas_pkey TO pinkas_legacy_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE pinkas (
+            id uuid NOT NULL,
+            agent varchar NOT NULL,
+            thought text,
+            action varchar,
+            payload jsonb,
+            status varchar,
+            timestamp timestamp without time zone NOT NULL,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+        """
+    )
+    _create_monthly_partitions("pinkas", "pinkas_legacy")
+    op.execute(
+        "INSERT INTO pinkas (id, agent, thought, action, payload, status, timestamp) "
+        "SELECT id, agent, thought, action, payload, status, timestamp FROM pinkas_legacy"
+    )
+    op.drop_table("pinkas_legacy")
+
+    op.create_index("idx_pinkas_timestamp", "pinkas", [sa.text("timestamp DESC"), sa.text("id DESC")])
+    op.create_index(
+        "idx_pinkas_agent_timestamp", "pinkas", ["agent", sa.text("timestamp DESC"), sa.text("id DESC")]
+    )
+    op.create_index(
+        "idx_pinkas_status_timestamp", "pinkas", ["status", sa.text("timestamp DESC"), sa.text("id DESC")]
+    )
+
+
+def _partition_agent_logs() -> None:
+    inspector = sa.inspect(op.get_bind())
+    legacy = None
+    if inspector.has_table("agent_logs"):
+        legacy = "agent_logs_legacy"
+        op.rename_table("agent_logs", legacy)
+        op.execute(f"ALTER TABLE {legacy} RENAME CONSTRAINT agent_logs_pkey TO {legacy}_pkey")
+        op.execute("DROP INDEX IF EXISTS ix_agent_logs_id")
+        op.execute("DROP INDEX IF EXISTS ix_agent_logs_agent_name")
+        op.execute("DROP INDEX IF EXISTS ix_agent_logs_timestamp")
+        # Keep the id sequence when the legacy table is dropped.
+        op.execute("ALTER SEQUENCE agent_logs_id_seq OWNED BY NONE")
+    else:
+        op.execute("CREATE SEQUENCE IF NOT EXISTS agent_logs_id_seq")
+
+    op.execute(
+        """
+        CREATE TABLE agent_logs (
+            id integer NOT NULL DEFAULT nextval('agent_logs_id_seq'),
+            agent_id integer,
+            agent_name varchar,
+            action varchar,
+            input_data jsonb,
+            output_data jsonb,
+            embedding vector(384),
+            timestamp timestamp without time zone NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            status varchar,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+        """
+    )
+    op.execute("ALTER SEQUENCE agent_logs_id_seq OWNED BY agent_logs.id")
+    if inspector.has_table("agents"):
+        op.create_foreign_key(None, "agent_logs", "agents", ["agent_id"], ["id"], ondelete="SET NULL")
+    _create_monthly_partitions("agent_logs", legacy)
+    if legacy:
+        op.execute(
+            "INSERT INTO agent_logs (id, agent_id, agent_name, action, input_data, output_data, "
+            "embedding, timestamp, status) "
+            "SELECT id, agent_id, agent_name, action, input_data, output_data, embedding, "
+            f"coalesce(timestamp, now() AT TIME ZONE 'utc'), status FROM {legacy}"
+        )
+        op.drop_table(legacy)
+
+    op.create_index("ix_agent_logs_agent_name", "agent_logs", ["agent_name"])
+    op.create_index("ix_agent_logs_timestamp", "agent_logs", ["timestamp"])
+
+
+def _create_rollups() -> None:
+    for table in ("pinkas_hourly_rollups", "agent_log_hourly_rollups"):
+        op.create_table(
+            table,
+            sa.Column("bucket", sa.DateTime(), nullable=False),
+            sa.Column("agent", sa.String(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("entries", sa.Integer(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("bucket", "agent", "status"),
+        )
+    op.execute(
+        "INSERT INTO pinkas_hourly_rollups (bucket, agent, status, entries) "
+        "SELECT date_trunc('hour', timestamp), agent, coalesce(status, 'unknown'), count(*) "
+        "FROM pinkas GROUP BY 1, 2, 3"
+    )
+    op.execute(
+        "INSERT INTO agent_log_hourly_rollups (bucket, agent, status, entries) "
+        "SELECT date_trunc('hour', timestamp), coalesce(agent_name, 'unknown'), "
+        "coalesce(status, 'unknown'), count(*) FROM agent_logs GROUP BY 1, 2, 3"
+    )
+
+
+def upgrade():
+    _partition_pinkas()
+    _partition_agent_logs()
+    _create_rollups()
+
+
+def downgrade():
+    op.drop_table("agent_log_hourly_rollups")
+    op.drop_table("pinkas_hourly_rollups")
+
+    for table, columns in (
+        ("pinkas", "id, agent, thought, action, payload, status, timestamp"),
+        (
+            "agent_logs",
+            "id, agent_id, agent_name, action, input_data, output_data, embedding, timestamp, status",
+        ),
+    ):
+        op.execute(f"CREATE TABLE {table}_plain (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table}_plain ({columns}) SELECT {columns} FROM {table}")
+        if table == "agent_logs":
+            op.execute("ALTER SEQUENCE agent_logs_id_seq OWNED BY NONE")
+        op.drop_table(table)
+        op.rename_table(f"{table}_plain", table)
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+
+    op.execute("ALTER SEQUENCE agent_logs_id_seq OWNED BY agent_logs.id")
+    if sa.inspect(op.get_bind()).has_table("agents"):
+        op.create_foreign_key(None, "agent_logs", "agents", ["agent_id"], ["id"], ondelete="SET NULL")
+    op.create_index("idx_pinkas_timestamp", "pinkas", [sa.text("timestamp DESC"), sa.text("id DESC")])
+    op.create_index(
+        "idx_pinkas_agent_timestamp", "pinkas", ["agent", sa.text("timestamp DESC"), sa.text("id DESC")]
+    )
+    op.create_index(
+        "idx_pinkas_status_timestamp", "pinkas", ["status", sa.text("timestamp DESC"), sa.text("id DESC")]
+    )
+    op.create_index("ix_agent_logs_id", "agent_logs", ["id"])
+    op.create_index("ix_agent_logs_agent_name", "agent_logs", ["agent_name"])
+    op.create_index("ix_agent_logs_timestamp", "agent_logs", ["timestamp"])
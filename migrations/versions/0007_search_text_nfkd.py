@@ -0,0 +1,68 @@
+"""Normalize content_items.search_text with NFKD so it matches the Python side.
+
+The 0003 expression only lowercased and stripped niqqud, while query strings
+were NFKD-normalized and casefolded in Python, so Hebrew presentation forms
+(U+FB1D-U+FB4F), ligatures and ``ß`` never matched. Postgres cannot change a
+generated column's expression in place before 17, so both generated columns
+and their indexes are rebuilt. Requires Postgres 13+ for ``normalize()``.
+
+Revision ID: 0007_search_text_nfkd
+Revises: 0006_partition_audit_tables
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007_search_text_nfkd"
+down_revision = "0006_partition_audit_tables"
+branch_labels = None
+depends_on = None
+
+
+_COLUMNS = (
+    "coalesce(title_he, '') || ' ' || coalesce(title_en, '') || ' ' || "
+    "coalesce(source, '') || ' ' || body_he || ' ' || coalesce(body_en, '')"
+)
+
+# Must match app.models.content.SEARCH_TEXT_SQL.
+SEARCH_TEXT_SQL = (
+    "btrim(regexp_replace(lower(regexp_replace(regexp_replace("
+    f"normalize({_COLUMNS}, NFKD), "
+    r"'[\u0591-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]', '', 'g'), '\u05BE', ' ', 'g')), "
+    r"'[\t\n\v\f\r ]+', ' ', 'g'), ' ')"
+)
+
+# Expression installed by 0003_content_search.
+PREVIOUS_SEARCH_TEXT_SQL = (
+    f"lower(regexp_replace(regexp_replace({_COLUMNS}, "
+    r"'[\u0591-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]', '', 'g'), '\u05BE', ' ', 'g'))"
+)
+
+
+def _rebuild_search_columns(expression: str) -> None:
+    op.execute("DROP INDEX IF EXISTS idx_content_search_tsv")
+    op.execute("DROP INDEX IF EXISTS idx_content_search_trgm")
+    op.execute("ALTER TABLE content_items DROP COLUMN IF EXISTS search_tsv")
+    op.execute("ALTER TABLE content_items DROP COLUMN IF EXISTS search_text")
+    op.execute(
+        f"ALTER TABLE content_items ADD COLUMN search_text text "
+        f"GENERATED ALWAYS AS ({expression}) STORED"
+    )
+    op.execute(
+        f"ALTER TABLE content_items ADD COLUMN search_tsv tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {expression})) STORED"
+    )
+    op.execute(
+        "CREATE INDEX idx_content_search_trgm ON content_items USING gin (search_text gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX idx_content_search_tsv ON content_items USING gin (search_tsv)")
+
+
+def upgrade():
+    _rebuild_search_columns(SEARCH_TEXT_SQL)
+
+
+def downgrade():
+    _rebuild_search_columns(PREVIOUS_SEARCH_TEXT_SQL)
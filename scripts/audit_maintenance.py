@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Maintain the month-partitioned audit tables (pinkas, agent_logs).
+
+Creates upcoming partitions, refreshes the hourly rollups and archives then
+drops partitions older than the retention window. The same pass runs hourly
+from Celery beat (``maintenance.audit_partitions``).
+
+Example:
+    python scripts/audit_maintenance.py
+    python scripts/audit_maintenance.py --export pinkas_2025_01   # archive one partition only
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure the repository root is on the Python path when running as a script.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db.partitions import PARTITION_ARCHIVE_DIR, export_partition, run_maintenance  # noqa: E402
+from app.db.session import engine  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Partition maintenance for audit tables.")
+    parser.add_argument("--export", metavar="PARTITION", help="Export a single partition and exit.")
+    parser.add_argument("--archive-dir", default=PARTITION_ARCHIVE_DIR)
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    try:
+        if args.export:
+            async with engine.connect() as conn:
+                target = await export_partition(conn, args.export, Path(args.archive_dir))
+            print(f"Exported {args.export} to {target}")
+            return
+
+        report = await run_maintenance(engine, archive_dir=Path(args.archive_dir))
+        print(f"Created partitions: {', '.join(report.created) or 'none'}")
+        print(f"Rollup rows upserted: {report.rollup_rows}")
+        for partition, path in report.archived.items():
+            print(f"Archived {partition} -> {path}")
+        print(f"Dropped partitions: {', '.join(report.dropped) or 'none'}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
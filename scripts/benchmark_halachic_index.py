@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Checks/sec for Shabbat/Yom Tov detection: direct computation vs window index.
+
+Samples random instants across a year and times
+``HalachicTimeService.compute_is_shabbat`` (a calendar per call) against the
+indexed ``is_shabbat``/``is_shabbat_or_yom_tov``, verifying that the Shabbat
+answers agree. ``--backend`` does the same for
+``backend.app.services.jewish_calendar.JewishCalendarService``.
+
+Example:
+    python scripts/benchmark_halachic_index.py --year 2026 --checks 20000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core.halachic_time import HalachicTimeService  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark halachic-time checks before/after the window index.")
+    parser.add_argument("--year", type=int, default=datetime.now(timezone.utc).year)
+    parser.add_argument("--checks", type=int, default=10_000)
+    parser.add_argument("--latitude", type=float, default=31.7857)
+    parser.add_argument("--longitude", type=float, default=35.2007)
+    parser.add_argument("--timezone", default="Asia/Jerusalem")
+    parser.add_argument("--backend", action="store_true", help="Also benchmark the backend JewishCalendarService.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def sample_instants(year: int, count: int, rng: random.Random) -> List[datetime]:
+    start = datetime(year, 1, 1, tzinfo=timezone.utc)
+    span = (datetime(year + 1, 1, 1, tzinfo=timezone.utc) - start).total_seconds()
+    return [start + timedelta(seconds=rng.uniform(0, span)) for _ in range(count)]
+
+
+def measure(label: str, check: Callable[[datetime], bool], instants: List[datetime]) -> List[bool]:
+    started = time.perf_counter()
+    answers = [check(moment) for moment in instants]
+    elapsed = time.perf_counter() - started
+    print(f"{label:<48} {len(instants) / elapsed:>14,.0f} checks/s  ({elapsed * 1e6 / len(instants):.2f} us/check)")
+    return answers
+
+
+def main() -> None:
+    args = parse_args()
+    instants = sample_instants(args.year, args.checks, random.Random(args.seed))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = HalachicTimeService(
+            args.latitude, args.longitude, args.timezone, index_cache_dir=cache_dir
+        )
+        started = time.perf_counter()
+        index = service.window_index(args.year)
+        print(f"Built {args.year} index ({len(index)} windows) in {time.perf_counter() - started:.2f}s")
+
+        reloaded = HalachicTimeService(args.latitude, args.longitude, args.timezone, index_cache_dir=cache_dir)
+        started = time.perf_counter()
+        reloaded.window_index(args.year)
+        print(f"Loaded it from the on-disk cache in {(time.perf_counter() - started) * 1000:.1f}ms\n")
+
+        before = measure("HalachicTimeService.compute_is_shabbat (before)", service.compute_is_shabbat, instants)
+        after = measure("HalachicTimeService.is_shabbat (index)", service.is_shabbat, instants)
+        measure("HalachicTimeService.is_shabbat_or_yom_tov (index)", service.is_shabbat_or_yom_tov, instants)
+        mismatches = sum(1 for old, new in zip(before, after) if old != new)
+        print(f"Shabbat answers differing from direct computation: {mismatches}/{len(instants)}")
+
+        if args.backend:
+            from backend.app.services.jewish_calendar import JewishCalendarService
+
+            calendar = JewishCalendarService(
+                args.latitude, args.longitude, args.timezone, index_cache_dir=cache_dir
+            )
+            subset = instants[: max(1, args.checks // 20)]  # the direct path is slow
+            print()
+            before = measure(
+                "JewishCalendarService.compute_is_shabbat_or_yom_tov",
+                calendar.compute_is_shabbat_or_yom_tov,
+                subset,
+            )
+            started = time.perf_counter()
+            calendar.restricted_windows(args.year)
+            print(f"Built backend {args.year} index in {time.perf_counter() - started:.2f}s")
+            after = measure("JewishCalendarService.is_shabbat_or_yom_tov", calendar.is_shabbat_or_yom_tov, subset)
+            mismatches = sum(1 for old, new in zip(before, after) if old != new)
+            print(f"Answers differing from direct computation: {mismatches}/{len(subset)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Messages/sec for rule checks: per-phrase substring scans vs the compiled matcher.
+
+Builds a rule set of ``--phrases`` Russian/Hebrew/English phrases split across
+a few labels (seeded with the real moderation and CPAO keywords) and a corpus
+of chat-sized messages, some pointed with niqqud. Times the old
+``any(phrase in text.lower() ...)`` check per label against
+``PhraseMatcher.matched_labels`` and ``PhraseMatcher.find_all``, and verifies
+that both agree on messages without niqqud (the old check cannot see through
+vowel points at all).
+
+Example:
+    python scripts/benchmark_phrase_matcher.py --phrases 500 --messages 20000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from langgraph_core.text import PhraseMatcher, strip_niqqud  # noqa: E402
+
+RUSSIAN = (
+    "он она они сказал сказала говорят видел слышал что такой такая плохой ужасная слух "
+    "сплетни сегодня вчера община урок тора молитва шабат праздник помощь деньги цдака "
+    "рав учитель друг сосед работа семья дети дом письмо встреча вопрос ответ"
+).split()
+HEBREW = (
+    "שָׁלוֹם תּוֹרָה שַׁבָּת חַג לָשׁוֹן הָרָע רְכִילוּת אָמַר אָמְרָה שָׁמַעְתִּי רָאִיתִי קְהִלָּה "
+    "שִׁיעוּר תְּפִלָּה צְדָקָה חֶסֶד רַב חָבֵר שָׁכֵן מִשְׁפָּחָה"
+).split()
+ENGLISH = (
+    "he she said told heard saw that such bad awful rumor gossip today yesterday community "
+    "lesson prayer help money charity rabbi teacher friend neighbour family idiot stupid fool"
+).split()
+# Everyday words the rules never mention; most of every message.
+FILLER = (
+    "и в на с по для как это все мы вы я ты был была будет можно нужно очень хорошо спасибо пожалуйста "
+    "אֲנִי אַתָּה הוּא הִיא אֲנַחְנוּ שֶׁל עַל עִם זֶה גַּם כֵּן לֹא תּוֹדָה בְּבַקָּשָׁה הַיּוֹם מָחָר "
+    "the a an and or of to in on for with is are was be thanks please good great very just will can"
+).split()
+FILLER = [strip_niqqud(word) for word in FILLER]
+SEED_RULES = {
+    "gossip": ["он сказал", "ты видел что", "говорят что", "она сказала", "слух", "сплет"],
+    "slander": ["он плохой", "она ужасная"],
+    "insult": ["idiot", "stupid", "dumb", "fool"],
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark per-phrase scans against the compiled phrase matcher.")
+    parser.add_argument("--phrases", type=int, default=300, help="Total rule phrases across all labels.")
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--words", type=int, default=40, help="Average words per message.")
+    parser.add_argument("--seed", type=int, default=11)
+    return parser.parse_args()
+
+
+def build_rules(total: int, rng: random.Random) -> Dict[str, List[str]]:
+    rules = {label: list(phrases) for label, phrases in SEED_RULES.items()}
+    vocabularies = (RUSSIAN, [strip_niqqud(word) for word in HEBREW], ENGLISH)
+    labels = list(rules)
+    while sum(len(phrases) for phrases in rules.values()) < total:
+        vocabulary = rng.choice(vocabularies)
+        phrase = " ".join(rng.sample(vocabulary, rng.choice((2, 2, 3))))
+        rules[rng.choice(labels)].append(phrase)
+    return rules
+
+
+def build_corpus(count: int, words: int, rng: random.Random) -> List[str]:
+    messages = []
+    for _ in range(count):
+        vocabulary = rng.choice((RUSSIAN, HEBREW, ENGLISH, RUSSIAN + ENGLISH))
+        length = max(3, int(rng.gauss(words, words / 3)))
+        tokens = [rng.choice(vocabulary if rng.random() < 0.25 else FILLER) for _ in range(length)]
+        if rng.random() < 0.3:
+            tokens[0] = tokens[0].capitalize()
+        messages.append(" ".join(tokens))
+    return messages
+
+
+def naive_labels(rules: Dict[str, List[str]]) -> Callable[[str], List[str]]:
+    def check(text: str) -> List[str]:
+        lowered = text.lower()
+        return [label for label, phrases in rules.items() if any(phrase in lowered for phrase in phrases)]
+
+    return check
+
+
+def measure(label: str, check: Callable[[str], object], messages: Sequence[str]) -> List[object]:
+    started = time.perf_counter()
+    answers = [check(message) for message in messages]
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {len(messages) / elapsed:>12,.0f} msgs/s  ({elapsed * 1e6 / len(messages):.1f} us/msg)")
+    return answers
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    rules = build_rules(args.phrases, rng)
+    messages = build_corpus(args.messages, args.words, rng)
+
+    started = time.perf_counter()
+    matcher = PhraseMatcher(rules)
+    print(f"Compiled {len(matcher)} phrases in {len(rules)} labels in {(time.perf_counter() - started) * 1000:.1f}ms")
+    print(f"Corpus: {len(messages)} messages, ~{args.words} words each\n")
+
+    before = measure("substring scan per phrase (before)", naive_labels(rules), messages)
+    after = measure("PhraseMatcher.matched_labels", matcher.matched_labels, messages)
+    found = measure("PhraseMatcher.find_all (with offsets)", matcher.find_all, messages)
+
+    comparable = [index for index, message in enumerate(messages) if strip_niqqud(message) == message]
+    mismatches = sum(1 for index in comparable if before[index] != after[index])
+    print(f"\nLabel sets differing on niqqud-free messages: {mismatches}/{len(comparable)}")
+    flagged = sum(1 for labels in after if labels)
+    print(f"Messages flagged: {flagged}/{len(messages)}; matches reported: {sum(len(hits) for hits in found)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
+from uuid import uuid4
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
@@ -24,7 +25,12 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from app.models.content import ContentCategory, ContentItem  # noqa: E402
+from app.models.content import ContentCategory  # noqa: E402
+from app.rag.bulk_writer import (  # noqa: E402
+    BULK_WRITE_BATCH_SIZE,
+    BulkWriteReport,
+    insert_content_items,
+)
 
 rag_client_spec = importlib.util.find_spec("app.services.rag_client")
 rag_client = None
@@ -49,6 +55,13 @@ def parse_args() -> argparse.Namespace:
         dest="rag_collection",
         help="Optional RAG collection name to index newly ingested documents.",
     )
+    parser.add_argument(
+        "--batch-size",
+        dest="batch_size",
+        type=int,
+        default=BULK_WRITE_BATCH_SIZE,
+        help="Rows per multi-row INSERT batch.",
+    )
     return parser.parse_args()
 
 
@@ -151,25 +164,34 @@ async def ingest_segments(
     category: ContentCategory,
     segments: Iterable[Dict[str, Any]],
     rag_collection: Optional[str] = None,
-) -> int:
-    rag_docs: List[Dict[str, Any]] = []
-    count = 0
-
-    for segment in segments:
-        item = ContentItem(
-            category_id=category.id,
-            title_he=segment.get("title_he"),
-            title_en=segment.get("title_en"),
-            body_he=segment["body_he"],
-            body_en=segment.get("body_en"),
-            source=segment.get("source"),
-            tags=list(segment.get("tags", [])),
-            metadata=dict(segment.get("metadata", {})),
-        )
-        session.add(item)
-        count += 1
-
-        if rag_collection:
+    batch_size: int = BULK_WRITE_BATCH_SIZE,
+) -> BulkWriteReport:
+    # Ids are assigned up front so inserted rows can be matched back to their
+    # segments, whether or not they carry a source ref.
+    segment_list = [(uuid4(), segment) for segment in segments]
+    rows = (
+        {
+            "id": segment_id,
+            "category_id": category.id,
+            "title_he": segment.get("title_he"),
+            "title_en": segment.get("title_en"),
+            "body_he": segment["body_he"],
+            "body_en": segment.get("body_en"),
+            "source": segment.get("source"),
+            "tags": list(segment.get("tags", [])),
+            "metadata": dict(segment.get("metadata", {})),
+        }
+        for segment_id, segment in segment_list
+    )
+    report = await insert_content_items(session, rows, batch_size=batch_size)
+
+    if rag_collection:
+        # Only index segments that were actually inserted; re-runs skip known sources.
+        fresh_ids = set(report.inserted_ids)
+        rag_docs: List[Dict[str, Any]] = []
+        for segment_id, segment in segment_list:
+            if segment_id not in fresh_ids:
+                continue
             body_components = [segment["body_he"]]
             if segment.get("body_en"):
                 body_components.append(segment["body_en"])
@@ -185,16 +207,14 @@ async def ingest_segments(
                 }
             )
 
-    await session.commit()
-
-    if rag_collection and rag_docs:
-        if rag_client:
-            await rag_client.add_documents(rag_collection, rag_docs)
-        else:
-            # TODO: Integrate actual RAG client when available.
-            print(f"RAG client not available. Skipping indexing for collection '{rag_collection}'.")
+        if rag_docs:
+            if rag_client:
+                await rag_client.add_documents(rag_collection, rag_docs)
+            else:
+                # TODO: Integrate actual RAG client when available.
+                print(f"RAG client not available. Skipping indexing for collection '{rag_collection}'.")
 
-    return count
+    return report
 
 
 async def main() -> None:
@@ -209,11 +229,20 @@ async def main() -> None:
 
     async with SessionLocal() as session:
         category = await get_or_create_category(session, args.category_slug)
-        count = await ingest_segments(session, category, segments, rag_collection=args.rag_collection)
+        report = await ingest_segments(
+            session,
+            category,
+            segments,
+            rag_collection=args.rag_collection,
+            batch_size=args.batch_size,
+        )
 
     await engine.dispose()
 
-    print(f"Ingested {count} segments into category '{args.category_slug}'.")
+    print(
+        f"Ingested {report.rows} segments into category '{args.category_slug}' "
+        f"({report.skipped} already present, {report.rows_per_second:.0f} rows/sec)."
+    )
     if args.rag_collection:
         print(f"RAG collection: {args.rag_collection}")
 
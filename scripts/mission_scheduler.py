@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Run the recurring mission scheduler.
+
+Example:
+    python scripts/mission_scheduler.py
+    python scripts/mission_scheduler.py --once   # create whatever is due now and exit
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+# Ensure the repository root is on the Python path when running as a script.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.mission_scheduler import MissionScheduler  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cron-driven mission scheduler.")
+    parser.add_argument("--horizon-days", type=int, default=None)
+    parser.add_argument("--reload-interval", type=float, default=None)
+    parser.add_argument("--once", action="store_true", help="Run a single scheduling pass and exit.")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    options = {}
+    if args.horizon_days is not None:
+        options["horizon_days"] = args.horizon_days
+    if args.reload_interval is not None:
+        options["reload_interval"] = args.reload_interval
+    scheduler = MissionScheduler(**options)
+
+    if args.once:
+        templates = await scheduler.load_templates()
+        created = await scheduler.tick()
+        print(f"Loaded {templates} templates; created {created} mission instances")
+        return
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await scheduler.run_forever(stop)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Continuously sync the RAG vector collection with the content library.
+
+Example:
+    python scripts/rag_indexer.py --collection torah --batch-size 200 --poll-interval 5
+    python scripts/rag_indexer.py --once   # drain the backlog and exit
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+# Ensure the repository root is on the Python path when running as a script.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db.session import async_session_factory, engine  # noqa: E402
+from app.services.rag_pipeline import IncrementalIndexer  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Incremental RAG indexer for content items.")
+    parser.add_argument("--collection", default="torah")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--once", action="store_true", help="Drain the current backlog and exit.")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    async with async_session_factory() as session:
+        indexer = IncrementalIndexer(
+            session,
+            collection=args.collection,
+            batch_size=args.batch_size,
+            poll_interval=args.poll_interval,
+        )
+        if args.once:
+            stats = await indexer.run_once()
+            backlog = await indexer.report_backlog()
+            print(f"Indexed pass complete: {stats}; backlog={backlog}")
+        else:
+            await indexer.run_forever(stop)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
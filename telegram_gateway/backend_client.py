@@ -42,6 +42,8 @@ class BackendClient:
         response = await self._client.get("/pinkas", params=params)
         response.raise_for_status()
         payload = response.json()
+        if isinstance(payload, dict) and "items" in payload:
+            return payload["items"]
         if isinstance(payload, dict) and "logs" in payload:
             return payload["logs"]
         if isinstance(payload, list):
@@ -13,6 +13,10 @@ class Settings(BaseSettings):
     backend_base_url: str = Field("http://localhost:8000", env="BACKEND_BASE_URL")
     request_timeout_seconds: float = Field(15.0, env="GATEWAY_REQUEST_TIMEOUT")
     channels_map: Optional[Dict[str, int]] = Field(default=None, env="CHANNELS_MAP")
+    broadcast_global_rate: float = Field(25.0, env="BROADCAST_GLOBAL_RATE")
+    broadcast_per_chat_rate: float = Field(1.0, env="BROADCAST_PER_CHAT_RATE")
+    broadcast_workers: int = Field(32, env="BROADCAST_WORKERS")
+    broadcast_max_retries: int = Field(3, env="BROADCAST_MAX_RETRIES")
 
     @validator("channels_map", pre=True)
     def _parse_channels_map(cls, value: object) -> Optional[Dict[str, int]]:
@@ -11,20 +11,38 @@ The missions engine will POST to `/api/send-message` with payload:
     {"channel": MissionTemplate.target_channel, "text": rendered_message,
      "respect_shabbat": true}
 The gateway enforces the Shabbat/Yom Tov guard even if upstream skips it.
+
+Campaigns POST to `/api/broadcast` with many recipients in one call:
+    {"text": "...", "recipients": [{"chat_id": 123, "recipient_id": "..."}],
+     "callback_url": "http://backend/campaigns/<id>/delivery"}
+Messages go through one long-lived bot session and the rate-limited
+`BroadcastEngine`, which re-checks the Shabbat guard before every send;
+sent/failed/blocked results are returned (or POSTed to `callback_url`) in
+bulk. Blocked recipients should be re-enqueued after Shabbat/Yom Tov.
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
+import httpx
 from aiogram import Bot
 from fastapi import APIRouter, FastAPI, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from telegram_gateway.config import settings
+from telegram_gateway.services.broadcast import BroadcastEngine, BroadcastRecipient, BroadcastReport
 from telegram_gateway.services.channels import ChannelResolutionError, resolve_chat_id
-from telegram_gateway.services.shabbat_guard import ShabbatGuardError, ensure_not_shabbat
+from telegram_gateway.services.shabbat_guard import (
+    USE_BACKEND_HALACHA,
+    ShabbatGuardError,
+    ensure_not_shabbat,
+    halacha_cache,
+    is_shabbat_or_yom_tov,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,26 +54,65 @@ class SendMessageRequest(BaseModel):
     respect_shabbat: bool = Field(True, description="Block during Shabbat/Yom Tov")
 
 
+class BroadcastRecipientIn(BaseModel):
+    chat_id: int
+    recipient_id: Optional[str] = Field(None, description="Upstream id echoed in results")
+    text: Optional[str] = Field(None, description="Per-recipient override of the message text")
+
+
+class BroadcastRequest(BaseModel):
+    text: str = Field(..., description="Message text sent to every recipient")
+    recipients: List[BroadcastRecipientIn] = Field(..., min_length=1)
+    respect_shabbat: bool = Field(True, description="Block during Shabbat/Yom Tov")
+    callback_url: Optional[str] = Field(
+        None, description="If set, reply 202 immediately and POST the report here when done"
+    )
+
+
 router = APIRouter(prefix="/api")
 
+_engine: Optional[BroadcastEngine] = None
+_background: Set[asyncio.Task] = set()
+
+
+async def get_broadcast_engine() -> BroadcastEngine:
+    """Return the process-wide engine, starting it on first use."""
+
+    global _engine
+    if _engine is None:
+        _engine = BroadcastEngine(
+            Bot(token=settings.telegram_bot_token),
+            global_rate=settings.broadcast_global_rate,
+            per_chat_rate=settings.broadcast_per_chat_rate,
+            workers=settings.broadcast_workers,
+            max_retries=settings.broadcast_max_retries,
+            guard=is_shabbat_or_yom_tov,
+        )
+    await _engine.start()
+    return _engine
+
+
+def _shabbat_block(label: str) -> Optional[JSONResponse]:
+    try:
+        ensure_not_shabbat(datetime.utcnow())
+    except ShabbatGuardError:
+        logger.warning("Broadcast blocked due to Shabbat/Yom Tov: %s", label)
+        return JSONResponse(
+            status_code=status.HTTP_403_FORBIDDEN,
+            content={
+                "status": "blocked",
+                "detail": "Broadcast blocked due to Shabbat/Yom Tov",
+            },
+        )
+    return None
+
 
 @router.post("/send-message")
 async def send_message(request: SendMessageRequest) -> Dict[str, Any]:
-    now = datetime.utcnow()
     if request.respect_shabbat:
-        try:
-            ensure_not_shabbat(now)
-        except ShabbatGuardError:
-            logger.warning(
-                "Broadcast blocked due to Shabbat/Yom Tov: channel=%s", request.channel
-            )
-            return JSONResponse(
-                status_code=status.HTTP_403_FORBIDDEN,
-                content={
-                    "status": "blocked",
-                    "detail": "Broadcast blocked due to Shabbat/Yom Tov",
-                },
-            )
+        blocked = _shabbat_block(f"channel={request.channel}")
+        if blocked is not None:
+            return blocked
 
     try:
         chat_id = resolve_chat_id(request.channel)
@@ -66,19 +123,26 @@ async def send_message(request: SendMessageRequest) -> Dict[str, Any]:
             content={"status": "error", "detail": str(exc)},
         )
 
-    bot = Bot(token=settings.telegram_bot_token)
-    try:
-        await bot.send_message(chat_id=chat_id, text=request.text)
-    except Exception as exc:  # noqa: BLE001 - return clean error payload
-        logger.exception(
-            "Failed to send broadcast channel=%s chat_id=%s", request.channel, chat_id
+    engine = await get_broadcast_engine()
+    result = await engine.send(chat_id, request.text, respect_shabbat=request.respect_shabbat)
+    if result.status == "blocked":
+        # Shabbat began while the message was queued.
+        logger.warning("Broadcast blocked due to Shabbat/Yom Tov: channel=%s", request.channel)
+        return JSONResponse(
+            status_code=status.HTTP_403_FORBIDDEN,
+            content={"status": "blocked", "detail": result.error},
+        )
+    if result.status != "sent":
+        logger.error(
+            "Failed to send broadcast channel=%s chat_id=%s: %s",
+            request.channel,
+            chat_id,
+            result.error,
         )
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"status": "error", "detail": str(exc)},
+            content={"status": "error", "detail": result.error},
         )
-    finally:
-        await bot.session.close()
 
     logger.info(
         "Sent broadcast channel=%s chat_id=%s length=%s",
@@ -89,7 +153,73 @@ async def send_message(request: SendMessageRequest) -> Dict[str, Any]:
     return {"status": "sent", "channel": request.channel, "chat_id": chat_id}
 
 
-app = FastAPI(title="Telegram Gateway API")
+@router.post("/broadcast")
+async def broadcast(request: BroadcastRequest) -> Dict[str, Any]:
+    """Fan a message out to many chats and report sent/failed counts in bulk."""
+
+    if request.respect_shabbat:
+        blocked = _shabbat_block(f"recipients={len(request.recipients)}")
+        if blocked is not None:
+            return blocked
+
+    engine = await get_broadcast_engine()
+    recipients = [
+        BroadcastRecipient(chat_id=item.chat_id, recipient_id=item.recipient_id, text=item.text)
+        for item in request.recipients
+    ]
+
+    if request.callback_url:
+        task = asyncio.create_task(
+            _broadcast_with_callback(
+                engine, recipients, request.text, request.callback_url, request.respect_shabbat
+            )
+        )
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"status": "accepted", "recipients": len(recipients)},
+        )
+
+    report = await engine.broadcast(recipients, request.text, respect_shabbat=request.respect_shabbat)
+    return {"status": "done", **report.as_dict()}
+
+
+async def _broadcast_with_callback(
+    engine: BroadcastEngine,
+    recipients: List[BroadcastRecipient],
+    text: str,
+    callback_url: str,
+    respect_shabbat: bool,
+) -> None:
+    report: BroadcastReport = await engine.broadcast(recipients, text, respect_shabbat=respect_shabbat)
+    try:
+        async with httpx.AsyncClient(timeout=settings.request_timeout_seconds) as client:
+            response = await client.post(callback_url, json={"status": "done", **report.as_dict()})
+            response.raise_for_status()
+    except Exception as exc:  # noqa: BLE001 - the broadcast itself already happened
+        logger.error("Failed to deliver broadcast report to %s: %s", callback_url, exc)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    global _engine
+    if USE_BACKEND_HALACHA:
+        await halacha_cache.start()
+    await get_broadcast_engine()
+    try:
+        yield
+    finally:
+        await halacha_cache.stop()
+        if _engine is not None:
+            # Fails whatever is still queued so pending callbacks report it.
+            await _engine.stop()
+            _engine = None
+        if _background:
+            await asyncio.gather(*_background, return_exceptions=True)
+
+
+app = FastAPI(title="Telegram Gateway API", lifespan=lifespan)
 app.include_router(router)
 
 
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+"""Rate-limited fan-out of Telegram messages over one long-lived bot session.
+
+Telegram allows roughly 30 messages/second per bot overall and about one
+message/second per chat (20/minute for groups). :class:`BroadcastEngine`
+enforces both with token buckets and feeds a pool of async workers from a
+single queue:
+
+* a job whose chat bucket is empty is re-queued after the bucket refills
+  instead of holding a worker, so one hot chat never stalls the rest;
+* ``429 Too Many Requests`` pauses the whole engine for ``retry_after``
+  seconds and the job is retried without spending an attempt;
+* a bot that was blocked or removed from a chat fails immediately, other
+  errors are retried with exponential backoff;
+* with a ``guard`` configured, every send re-checks it right before the
+  message goes out, so a broadcast queued on Friday afternoon stops at candle
+  lighting. Jobs caught by the guard finish as ``blocked`` for the caller to
+  re-enqueue after Shabbat/Yom Tov rather than being held in memory.
+
+Results come back in bulk as a :class:`BroadcastReport`.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if available; otherwise return seconds until one is."""
+
+        now = time.monotonic()
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def is_full(self) -> bool:
+        self._refill(time.monotonic())
+        return self._tokens >= self.capacity
+
+
+@dataclass
+class BroadcastRecipient:
+    chat_id: int
+    recipient_id: Optional[str] = None
+    text: Optional[str] = None
+
+
+@dataclass
+class DeliveryResult:
+    chat_id: int
+    recipient_id: Optional[str]
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "chat_id": self.chat_id,
+            "recipient_id": self.recipient_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
+        }
+
+
+@dataclass
+class BroadcastReport:
+    sent: int = 0
+    failed: int = 0
+    blocked: int = 0
+    seconds: float = 0.0
+    results: List[DeliveryResult] = field(default_factory=list)
+
+    @property
+    def messages_per_second(self) -> float:
+        return (self.sent + self.failed + self.blocked) / self.seconds if self.seconds else 0.0
+
+    def as_dict(self, *, include_results: bool = True) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "sent": self.sent,
+            "failed": self.failed,
+            "blocked": self.blocked,
+            "seconds": round(self.seconds, 3),
+            "messages_per_second": round(self.messages_per_second, 2),
+        }
+        if include_results:
+            payload["results"] = [result.as_dict() for result in self.results]
+        return payload
+
+
+@dataclass(eq=False)
+class _Job:
+    chat_id: int
+    text: str
+    recipient_id: Optional[str]
+    future: "asyncio.Future[DeliveryResult]"
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    respect_shabbat: bool = True
+
+
+class BroadcastEngine:
+    """Queue-driven sender sharing one ``Bot`` session across all requests."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        *,
+        global_rate: float = 25.0,
+        per_chat_rate: float = 1.0,
+        workers: int = 32,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        guard: Optional[Callable[[datetime], bool]] = None,
+    ) -> None:
+        self.bot = bot
+        self.guard = guard
+        self.per_chat_rate = per_chat_rate
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._global = TokenBucket(global_rate)
+        self._chats: Dict[int, TokenBucket] = {}
+        self._queue: "asyncio.Queue[_Job]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._unfinished: Set[_Job] = set()
+        self._paused_until = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"broadcast-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info("Broadcast engine started with %s workers", self.workers)
+
+    async def stop(self) -> None:
+        """Stop the workers, failing anything still queued, and close the session."""
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in list(self._unfinished):
+            self._finish(job, "failed", error="gateway shutting down")
+        self._queue = asyncio.Queue()
+        await self.bot.session.close()
+
+    async def send(
+        self,
+        chat_id: int,
+        text: str,
+        *,
+        recipient_id: Optional[str] = None,
+        respect_shabbat: bool = True,
+        **kwargs: Any,
+    ) -> DeliveryResult:
+        """Enqueue one message and wait for its delivery result."""
+
+        future: "asyncio.Future[DeliveryResult]" = asyncio.get_running_loop().create_future()
+        job = _Job(chat_id, text, recipient_id, future, kwargs, respect_shabbat=respect_shabbat)
+        self._unfinished.add(job)
+        self._queue.put_nowait(job)
+        return await future
+
+    async def broadcast(
+        self,
+        recipients: Sequence[BroadcastRecipient],
+        text: str,
+        *,
+        respect_shabbat: bool = True,
+        **kwargs: Any,
+    ) -> BroadcastReport:
+        """Send ``text`` (or each recipient's own text) to every recipient."""
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                self.send(
+                    recipient.chat_id,
+                    recipient.text or text,
+                    recipient_id=recipient.recipient_id,
+                    respect_shabbat=respect_shabbat,
+                    **kwargs,
+                )
+                for recipient in recipients
+            )
+        )
+        report = BroadcastReport(results=list(results), seconds=time.perf_counter() - started)
+        for result in results:
+            if result.status == "sent":
+                report.sent += 1
+            elif result.status == "blocked":
+                report.blocked += 1
+            else:
+                report.failed += 1
+        logger.info(
+            "Broadcast finished sent=%s failed=%s blocked=%s seconds=%.1f rate=%.1f msg/s",
+            report.sent,
+            report.failed,
+            report.blocked,
+            report.seconds,
+            report.messages_per_second,
+        )
+        return report
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._process(job)
+            except Exception as exc:  # noqa: BLE001 - never let a worker die
+                logger.exception("Broadcast worker failed on chat_id=%s", job.chat_id)
+                self._finish(job, "failed", error=str(exc))
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job: _Job) -> None:
+        wait = self._chat_bucket(job.chat_id).try_acquire()
+        if wait > 0:
+            self._requeue(job, wait)
+            return
+
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        await self._global.acquire()
+
+        # Checked per send, after every wait, not once per request.
+        if job.respect_shabbat and self.guard is not None and self.guard(datetime.utcnow()):
+            self._finish(job, "blocked", error="Broadcast blocked due to Shabbat/Yom Tov")
+            return
+
+        job.attempts += 1
+        try:
+            await self.bot.send_message(chat_id=job.chat_id, text=job.text, **job.kwargs)
+        except TelegramRetryAfter as exc:
+            logger.warning("Telegram flood control: retry after %ss", exc.retry_after)
+            self._paused_until = max(self._paused_until, time.monotonic() + exc.retry_after)
+            job.attempts -= 1
+            self._requeue(job, exc.retry_after)
+        except TelegramForbiddenError as exc:
+            self._finish(job, "failed", error=str(exc))
+        except Exception as exc:  # noqa: BLE001 - retried, then reported per recipient
+            if job.attempts > self.max_retries:
+                self._finish(job, "failed", error=str(exc))
+            else:
+                self._requeue(job, self.retry_backoff * 2 ** (job.attempts - 1))
+        else:
+            self._finish(job, "sent", sent_at=datetime.utcnow())
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) > 10_000:
+                # Drop idle chats; a full bucket carries no state worth keeping.
+                self._chats = {key: value for key, value in self._chats.items() if not value.is_full()}
+            bucket = self._chats[chat_id] = TokenBucket(self.per_chat_rate, capacity=1)
+        return bucket
+
+    def _requeue(self, job: _Job, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        loop.call_later(delay, lambda: job.future.done() or self._queue.put_nowait(job))
+
+    def _finish(
+        self,
+        job: _Job,
+        status: str,
+        *,
+        error: Optional[str] = None,
+        sent_at: Optional[datetime] = None,
+    ) -> None:
+        self._unfinished.discard(job)
+        if job.future.done():
+            return
+        job.future.set_result(
+            DeliveryResult(
+                chat_id=job.chat_id,
+                recipient_id=job.recipient_id,
+                status=status,
+                attempts=job.attempts,
+                error=error,
+                sent_at=sent_at,
+            )
+        )
+
+
+__all__ = [
+    "BroadcastEngine",
+    "BroadcastRecipient",
+    "BroadcastReport",
+    "DeliveryResult",
+    "TokenBucket",
+]
@@ -1,9 +1,26 @@
 from __future__ import annotations
 
+"""Local Shabbat/Yom Tov guard backed by a cached window schedule.
+
+When ``TG_USE_BACKEND_HALACHA`` is enabled the gateway pulls the upcoming
+restricted windows from the backend's ``/halacha/windows`` in one call and
+answers every check locally with a ``bisect`` — no per-message HTTP round trip
+and nothing blocking the event loop.
+
+The schedule is refreshed in the background every
+``TG_HALACHA_REFRESH_SECONDS`` (stale-while-revalidate): a check against a
+stale schedule still answers from it and kicks off a refresh. A failed refresh
+keeps the previous schedule, which stays authoritative until its
+``valid_until`` horizon (``TG_HALACHA_HORIZON_DAYS`` ahead).
+"""
+
+import asyncio
+import bisect
 import logging
 import os
-from datetime import datetime
-from typing import Optional
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
 
 import httpx
 
@@ -12,37 +29,137 @@ from telegram_gateway.config import settings
 logger = logging.getLogger(__name__)
 
 USE_BACKEND_HALACHA = os.getenv("TG_USE_BACKEND_HALACHA", "").lower() == "true"
+HALACHA_REFRESH_SECONDS = float(os.getenv("TG_HALACHA_REFRESH_SECONDS", "3600"))
+HALACHA_HORIZON_DAYS = int(os.getenv("TG_HALACHA_HORIZON_DAYS", "14"))
 
 
 class ShabbatGuardError(RuntimeError):
     """Raised when an action is blocked due to Shabbat or Yom Tov."""
 
 
-def _fetch_backend_status() -> Optional[bool]:
-    """Query backend halachic endpoint if enabled."""
-
-    if not USE_BACKEND_HALACHA:
-        return None
-
-    url = f"{settings.backend_base_url.rstrip('/')}/halacha/now"
-    try:
-        response = httpx.get(url, timeout=settings.request_timeout_seconds)
-        response.raise_for_status()
-        payload = response.json()
-        return bool(payload.get("is_shabbat_or_yom_tov"))
-    except Exception as exc:  # pragma: no cover - defensive around network calls
-        logger.warning("Failed to query backend halacha service: %s", exc)
-        return None
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class HalachaSchedule:
+    """Sorted restricted windows valid until ``valid_until`` (epoch seconds)."""
+
+    def __init__(self, starts: List[float], ends: List[float], valid_until: float) -> None:
+        self.starts = starts
+        self.ends = ends
+        self.valid_until = valid_until
+        self.fetched_at = time.monotonic()
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "HalachaSchedule":
+        windows = sorted(
+            (_epoch(datetime.fromisoformat(item["begins"])), _epoch(datetime.fromisoformat(item["ends"])))
+            for item in payload.get("windows", [])
+        )
+        return cls(
+            [begins for begins, _ in windows],
+            [ends for _, ends in windows],
+            _epoch(datetime.fromisoformat(payload["valid_until"])),
+        )
+
+    def covers(self, moment: float) -> bool:
+        return moment < self.valid_until
+
+    def is_blocked(self, moment: float) -> bool:
+        index = bisect.bisect_right(self.starts, moment) - 1
+        return index >= 0 and moment < self.ends[index]
+
+
+class HalachaScheduleCache:
+    """Holds the current schedule and refreshes it asynchronously."""
+
+    def __init__(
+        self,
+        *,
+        refresh_seconds: float = HALACHA_REFRESH_SECONDS,
+        horizon_days: int = HALACHA_HORIZON_DAYS,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.horizon_days = horizon_days
+        self.schedule: Optional[HalachaSchedule] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> bool:
+        """Fetch a fresh schedule; keep the current one on failure."""
+
+        url = f"{settings.backend_base_url.rstrip('/')}/halacha/windows"
+        try:
+            async with httpx.AsyncClient(timeout=settings.request_timeout_seconds) as client:
+                response = await client.get(url, params={"days": self.horizon_days})
+                response.raise_for_status()
+                self.schedule = HalachaSchedule.from_payload(response.json())
+        except Exception as exc:  # pragma: no cover - defensive around network calls
+            logger.warning("Failed to refresh halacha schedule from backend: %s", exc)
+            return False
+        logger.info("Refreshed halacha schedule (%s windows)", len(self.schedule.starts))
+        return True
+
+    def is_stale(self) -> bool:
+        return self.schedule is None or time.monotonic() - self.schedule.fetched_at > self.refresh_seconds
+
+    def revalidate(self) -> None:
+        """Start a background refresh if one is due and none is running."""
+
+        if not self.is_stale() or (self._refreshing and not self._refreshing.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refreshing = loop.create_task(self.refresh())
+
+    async def start(self) -> None:
+        """Load the schedule and keep it fresh until :meth:`stop`."""
+
+        await self.refresh()
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        for task in (self._loop_task, self._refreshing):
+            if task is not None:
+                task.cancel()
+        self._loop_task = None
+        self._refreshing = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.refresh()
+
+    def lookup(self, now: datetime) -> Optional[bool]:
+        """Answer from the cached schedule, or None when it does not cover ``now``."""
+
+        self.revalidate()
+        schedule = self.schedule
+        moment = _epoch(now)
+        if schedule is None or not schedule.covers(moment):
+            return None
+        return schedule.is_blocked(moment)
+
+
+halacha_cache = HalachaScheduleCache()
 
 
 def is_shabbat_or_yom_tov(now: datetime) -> bool:
     """Return True if the provided datetime falls on Shabbat or Yom Tov."""
 
-    backend_result = _fetch_backend_status()
-    if backend_result is not None:
-        return backend_result
+    if not USE_BACKEND_HALACHA:
+        return False
 
-    return False
+    result = halacha_cache.lookup(now)
+    if result is None:
+        logger.warning("No halacha schedule covers %s; allowing action", now.isoformat())
+        return False
+    return result
 
 
 def ensure_not_shabbat(now: datetime) -> None:
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.cron import CronError, CronSchedule
+
+MONDAY = datetime(2024, 1, 1)
+
+
+def test_restricted_day_of_month_and_weekday_match_either() -> None:
+    schedule = CronSchedule.parse("0 0 13 * fri")
+
+    first = schedule.next_after(MONDAY)
+    second = schedule.next_after(first)
+    third = schedule.next_after(second)
+
+    # Fridays 5th and 12th, then Saturday the 13th.
+    assert [first, second, third] == [datetime(2024, 1, 5), datetime(2024, 1, 12), datetime(2024, 1, 13)]
+
+
+def test_single_restricted_day_field_must_match() -> None:
+    assert CronSchedule.parse("0 0 * * fri").next_after(MONDAY) == datetime(2024, 1, 5)
+    assert CronSchedule.parse("0 0 13 * *").next_after(MONDAY) == datetime(2024, 1, 13)
+
+
+def test_steps_cover_the_whole_range() -> None:
+    quarter_hours = CronSchedule.parse("*/15 * * * *")
+    assert quarter_hours.minutes == frozenset({0, 15, 30, 45})
+    assert quarter_hours.next_after(datetime(2024, 1, 1, 10, 7)) == datetime(2024, 1, 1, 10, 15)
+    assert quarter_hours.next_after(datetime(2024, 1, 1, 10, 45)) == datetime(2024, 1, 1, 11, 0)
+
+    assert CronSchedule.parse("0 */6 * * *").next_after(datetime(2024, 1, 1, 7, 0)) == datetime(2024, 1, 1, 12, 0)
+    assert CronSchedule.parse("30 9-17/4 * * *").hours == frozenset({9, 13, 17})
+
+
+def test_seven_and_sun_mean_sunday() -> None:
+    assert CronSchedule.parse("0 0 * * 7").weekdays == frozenset({0})
+    assert CronSchedule.parse("0 0 * * 5-7").weekdays == frozenset({0, 5, 6})
+    assert CronSchedule.parse("0 0 * * 7").next_after(MONDAY) == datetime(2024, 1, 7)
+    assert CronSchedule.parse("@weekly").next_after(MONDAY) == CronSchedule.parse("0 0 * * sun").next_after(MONDAY)
+
+
+def test_next_after_is_strictly_later() -> None:
+    schedule = CronSchedule.parse("@daily")
+
+    assert schedule.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 2)
+    assert schedule.next_after(datetime(2024, 1, 1, 0, 0, 30)) == datetime(2024, 1, 2)
+
+
+def test_leap_day_waits_for_a_leap_year() -> None:
+    assert CronSchedule.parse("0 0 29 2 *").next_after(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+
+
+@pytest.mark.parametrize("expression", ["0 0 30 feb *", "0 0 31 4,6,9,11 *"])
+def test_expression_that_never_fires_raises(expression: str) -> None:
+    schedule = CronSchedule.parse(expression)
+
+    with pytest.raises(CronError, match="never fires"):
+        schedule.next_after(MONDAY)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "0 0 * * funday", "0 0 5-1 * *"])
+def test_malformed_expressions_are_rejected(expression: str) -> None:
+    with pytest.raises(CronError):
+        CronSchedule.parse(expression)
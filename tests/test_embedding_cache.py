@@ -0,0 +1,58 @@
+from app.services.embedding_cache import EmbeddingCache, cache_key
+
+
+def test_cache_key_normalizes_whitespace_and_separates_models() -> None:
+    assert cache_key("m", "Shema  Yisrael\n") == cache_key("m", " Shema Yisrael")
+    assert cache_key("m", "Shema Yisrael") != cache_key("other", "Shema Yisrael")
+    # The model/text separator keeps ("ab", "c") and ("a", "bc") apart.
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_embed_computes_each_normalized_text_once() -> None:
+    cache = EmbeddingCache(path=None)
+    calls: list[list[str]] = []
+
+    def compute(texts: list[str]) -> list[list[float]]:
+        calls.append(texts)
+        return [[float(len(text))] for text in texts]
+
+    first = cache.embed("m", ["a b", "a  b", "cd"], compute)
+    second = cache.embed("m", ["cd", "a b"], compute)
+
+    assert calls == [["a b", "cd"]]
+    assert first == [[3.0], [3.0], [2.0]]
+    assert second == [[2.0], [3.0]]
+    assert cache.stats["misses"] == 3
+    assert cache.stats["hits"] == 2
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path) -> None:  # noqa: ANN001
+    path = str(tmp_path / "embeddings.sqlite3")
+    EmbeddingCache(path).put_many("m", ["shalom"], [[0.5, 0.25]])
+
+    reopened = EmbeddingCache(path)
+
+    assert reopened.get_many("m", ["shalom", "unknown"]) == [[0.5, 0.25], None]
+    assert reopened.get_many("other-model", ["shalom"]) == [None]
+    assert reopened.stats["disk_hits"] == 1
+
+
+def test_returned_vectors_are_copies() -> None:
+    cache = EmbeddingCache(path=None)
+    cache.put_many("m", ["shalom"], [[1.0, 2.0]])
+
+    first = cache.get_many("m", ["shalom"])[0]
+    first.append(99.0)
+
+    assert cache.get_many("m", ["shalom"]) == [[1.0, 2.0]]
+
+
+def test_rewriting_a_key_does_not_double_count_disk_bytes(tmp_path) -> None:  # noqa: ANN001
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    cache.put_many("m", ["shalom"], [[0.5, 0.25]])
+    once = cache.stats["disk_bytes"]
+
+    cache.put_many("m", ["shalom", "shalom"], [[0.5, 0.25], [0.5, 0.25]])
+
+    assert once == 8
+    assert cache.stats["disk_bytes"] == once
@@ -0,0 +1,31 @@
+import asyncio
+
+from app.services.embedding_engine import OllamaEmbeddingEngine
+
+
+def test_clients_close_with_their_loop_and_are_forgotten() -> None:
+    engine = OllamaEmbeddingEngine("http://ollama.invalid", "test-model")
+
+    async def bind():  # noqa: ANN202
+        return engine._bind_loop()[0]
+
+    first = asyncio.run(bind())
+    # asyncio.run cancelled the owner task on shutdown, which closed the client.
+    assert first.is_closed
+
+    second = asyncio.run(bind())
+    assert second is not first
+    assert len(engine._loops) == 1
+
+
+def test_aclose_closes_the_current_loops_client() -> None:
+    engine = OllamaEmbeddingEngine("http://ollama.invalid", "test-model")
+
+    async def scenario() -> None:
+        client, _ = engine._bind_loop()
+        assert engine._bind_loop()[0] is client
+        await engine.aclose()
+        assert client.is_closed
+        assert engine._loops == {}
+
+    asyncio.run(scenario())
@@ -0,0 +1,16 @@
+import pytest
+
+from app.services.hybrid_search import reciprocal_rank_fusion
+
+
+def test_rrf_rewards_items_ranked_by_both_retrievers() -> None:
+    scores = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a", "d"]], k=60)
+
+    assert scores["a"] == pytest.approx(1 / 61 + 1 / 62)
+    assert scores["d"] == pytest.approx(1 / 63)
+    assert sorted(scores, key=scores.get, reverse=True) == ["a", "c", "b", "d"]
+
+
+def test_rrf_handles_empty_rankings() -> None:
+    assert reciprocal_rank_fusion([[], []]) == {}
+    assert reciprocal_rank_fusion([[], ["x"]], k=0) == {"x": 1.0}
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.services.mission_scheduler import MissionScheduler
+
+TEMPLATE_ID = uuid4()
+SHABBAT = (datetime(2024, 1, 5, 15, 0, tzinfo=timezone.utc), datetime(2024, 1, 6, 16, 7, tzinfo=timezone.utc))
+
+
+def at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2024, 1, day, hour, minute, tzinfo=timezone.utc)
+
+
+class _FakeHalachic:
+    timezone = ZoneInfo("UTC")
+
+    def __init__(self, windows: list[tuple[datetime, datetime]]) -> None:
+        self.windows = windows
+
+    def blackout_windows(self, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        return [window for window in self.windows if window[1] > start and window[0] < end]
+
+
+class _FakeSession:
+    def __init__(self, templates: list[tuple[UUID, str, str]], inserted: list[dict]) -> None:
+        self.templates = templates
+        self.inserted = inserted
+
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:  # noqa: ANN002
+        return None
+
+    async def execute(self, statement, params=None):  # noqa: ANN001
+        if statement.is_select:
+            return SimpleNamespace(all=lambda: list(self.templates))
+        if statement.is_insert:
+            self.inserted.extend(params)
+            return [SimpleNamespace(id=uuid4(), scheduled_for=row["scheduled_for"]) for row in params]
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+
+class _Harness:
+    def __init__(self, cron_expr: str, windows: list[tuple[datetime, datetime]]) -> None:
+        self.inserted: list[dict] = []
+        self.enqueued: list[datetime] = []
+        templates = [(TEMPLATE_ID, "daily-learning", cron_expr)]
+        self.scheduler = MissionScheduler(
+            session_factory=lambda: _FakeSession(templates, self.inserted),
+            halachic=_FakeHalachic(windows),  # type: ignore[arg-type]
+            enqueue=self.enqueue,
+        )
+
+    def enqueue(self, instances):  # noqa: ANN001
+        self.enqueued.extend(scheduled_for for _, scheduled_for in instances)
+        return [f"task-{index}" for index, _ in enumerate(instances)]
+
+    def cron_entries(self) -> list[datetime]:
+        return sorted(run_at for run_at, _, cron_driven in self.scheduler._heap if cron_driven)
+
+
+@pytest.mark.anyio
+async def test_fire_outside_a_window_is_enqueued_and_cron_advances() -> None:
+    harness = _Harness("0 * * * *", [SHABBAT])
+    await harness.scheduler.load_templates(at(5, 9, 30))
+
+    assert harness.cron_entries() == [at(5, 10)]
+    assert await harness.scheduler.tick(at(5, 10)) == 1
+    assert harness.enqueued == [datetime(2024, 1, 5, 10)]
+    assert harness.inserted[0]["template_id"] == TEMPLATE_ID
+    assert harness.cron_entries() == [at(5, 11)]
+
+
+@pytest.mark.anyio
+async def test_fire_inside_a_window_is_deferred_to_the_window_end() -> None:
+    harness = _Harness("0 * * * *", [SHABBAT])
+    await harness.scheduler.load_templates(at(5, 14, 30))
+
+    assert await harness.scheduler.tick(at(5, 15)) == 0
+    assert harness.enqueued == []
+    assert (SHABBAT[1], str(TEMPLATE_ID), False) in harness.scheduler._heap
+    assert harness.cron_entries() == [at(5, 16)]
+
+    assert await harness.scheduler.tick(SHABBAT[1]) == 1
+    assert harness.enqueued == [SHABBAT[1].replace(tzinfo=None)]
+
+
+@pytest.mark.anyio
+async def test_repeated_fires_in_one_window_collapse_into_one_run() -> None:
+    harness = _Harness("0 * * * *", [SHABBAT])
+    await harness.scheduler.load_templates(at(5, 14, 30))
+
+    hour = at(5, 15)
+    while hour < SHABBAT[1]:
+        assert await harness.scheduler.tick(hour) == 0
+        assert harness.cron_entries() == [hour + timedelta(hours=1)]
+        hour = harness.cron_entries()[0]
+
+    deferred = [entry for entry in harness.scheduler._heap if not entry[2]]
+    assert deferred == [(SHABBAT[1], str(TEMPLATE_ID), False)]
+
+    assert await harness.scheduler.tick(SHABBAT[1]) == 1
+    assert harness.enqueued == [SHABBAT[1].replace(tzinfo=None)]
+    assert harness.cron_entries() == [at(6, 17)]
+
+
+@pytest.mark.anyio
+async def test_cron_fire_at_the_window_end_joins_the_deferred_run() -> None:
+    window = (at(5, 15), at(6, 16))
+    harness = _Harness("0 * * * *", [window])
+    await harness.scheduler.load_templates(at(5, 14, 30))
+
+    hour = at(5, 15)
+    while hour < window[1]:
+        await harness.scheduler.tick(hour)
+        hour = harness.cron_entries()[0]
+
+    assert await harness.scheduler.tick(window[1]) == 1
+    assert harness.enqueued == [window[1].replace(tzinfo=None)]
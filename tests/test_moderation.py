@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import moderation
+from app.services.moderation import HarmClassifier
+
+
+class _FakeDetoxify:
+    batches: list[list[str]] = []
+
+    def __init__(self, _model_name: str) -> None:
+        pass
+
+    def predict(self, texts: list[str]) -> dict:
+        _FakeDetoxify.batches.append(list(texts))
+        return {"toxicity": [0.9 if "bad" in text else 0.1 for text in texts]}
+
+
+@pytest.fixture
+def fake_detoxify(monkeypatch: pytest.MonkeyPatch) -> type[_FakeDetoxify]:
+    _FakeDetoxify.batches = []
+    monkeypatch.setattr(moderation, "Detoxify", _FakeDetoxify)
+    return _FakeDetoxify
+
+
+@pytest.mark.anyio
+async def test_concurrent_scores_share_one_batch(fake_detoxify: type[_FakeDetoxify]) -> None:
+    classifier = HarmClassifier(workers=0, batch_size=8, batch_window=0.05)
+
+    results = await asyncio.gather(*(classifier.score_toxicity(text) for text in ["ok", "bad", "fine"]))
+
+    assert fake_detoxify.batches == [["ok", "bad", "fine"]]
+    assert [result["score"] for result in results] == [0.1, 0.9, 0.1]
+
+
+@pytest.mark.anyio
+async def test_full_batch_flushes_without_waiting(fake_detoxify: type[_FakeDetoxify]) -> None:
+    classifier = HarmClassifier(workers=0, batch_size=2, batch_window=10)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(classifier.score_toxicity("a"), classifier.score_toxicity("bad")), timeout=1
+    )
+
+    assert fake_detoxify.batches == [["a", "bad"]]
+    assert [result["score"] for result in results] == [0.1, 0.9]
+
+
+@pytest.mark.anyio
+async def test_score_many_splits_batches_and_skips_empty_texts(fake_detoxify: type[_FakeDetoxify]) -> None:
+    classifier = HarmClassifier(workers=0, batch_size=2)
+
+    results = await classifier.score_many(["a", "", "bad", "c"])
+
+    assert sorted(fake_detoxify.batches) == [["a", "bad"], ["c"]]
+    assert [result["score"] for result in results] == [0.1, 0.0, 0.9, 0.1]
+
+
+class _BrokenPool(Executor):
+    def submit(self, fn, /, *args, **kwargs) -> Future:  # noqa: ANN001, ANN003
+        raise BrokenProcessPool("worker died")
+
+
+class _InlinePool(Executor):
+    def submit(self, fn, /, *args, **kwargs) -> Future:  # noqa: ANN001, ANN003
+        future: Future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@pytest.mark.anyio
+async def test_broken_pool_is_replaced(fake_detoxify: type[_FakeDetoxify], monkeypatch: pytest.MonkeyPatch) -> None:
+    classifier = HarmClassifier(workers=1)
+    classifier._pool = _BrokenPool()  # type: ignore[assignment]
+    monkeypatch.setattr(moderation, "_worker_model", _FakeDetoxify("test"))
+
+    def ensure_pool() -> None:
+        if classifier._pool is None:
+            classifier._pool = _InlinePool()  # type: ignore[assignment]
+
+    monkeypatch.setattr(classifier, "_ensure_pool", ensure_pool)
+
+    assert await classifier.score_many(["bad"]) == [{"score": 0.9}]
+    assert isinstance(classifier._pool, _InlinePool)
+
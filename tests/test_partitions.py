@@ -0,0 +1,18 @@
+from datetime import date, datetime
+
+from app.db.partitions import PINKAS, add_months, months_covered
+
+
+def test_add_months_crosses_year_boundaries() -> None:
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert PINKAS.partition_name(date(2025, 2, 1)) == "pinkas_2025_02"
+
+
+def test_months_covered_counts_consecutive_future_partitions() -> None:
+    now = datetime(2024, 12, 15, 8, 0)
+    partitions = {date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1), date(2025, 4, 1)}
+
+    assert months_covered(partitions, now) == 2
+    assert months_covered({date(2024, 12, 1)}, now) == 0
+    assert months_covered({date(2025, 1, 1)}, now) == -1
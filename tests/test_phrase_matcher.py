@@ -0,0 +1,58 @@
+from langgraph_core.text import PhraseMatcher, compile_phrase_matcher
+from app.services.moderation import HalachaRulesClassifier
+
+RULES = {"gossip": ["он сказал", "говорят что"], "blessing": ["שלום", "shalom aleichem"], "empty": []}
+
+
+def test_matched_labels_ignores_case_whitespace_and_niqqud() -> None:
+    matcher = PhraseMatcher(RULES)
+
+    assert matcher.matched_labels("Он   Сказал: שָׁלוֹם") == ["gossip", "blessing"]
+    assert matcher.matched_labels("nothing to see") == []
+    assert matcher.matched_labels(None) == []
+    assert matcher.labels == ["gossip", "blessing", "empty"]
+    assert len(matcher) == 4
+
+
+def test_find_all_reports_offsets_into_the_original_text() -> None:
+    text = "Shalom  Aleichem! ОН сказал"
+    matches = PhraseMatcher(RULES).find_all(text)
+
+    assert [(match.label, match.phrase, match.text) for match in matches] == [
+        ("blessing", "shalom aleichem", "Shalom  Aleichem"),
+        ("gossip", "он сказал", "ОН сказал"),
+    ]
+    assert all(text[match.start : match.end] == match.text for match in matches)
+
+
+def test_find_all_with_known_labels_skips_other_rules() -> None:
+    matcher = PhraseMatcher(RULES)
+    text = "шалом, он сказал שלום"
+
+    labels = matcher.matched_labels(text)
+    restricted = matcher.find_all(text, labels=["blessing"])
+
+    assert matcher.find_all(text, labels=labels) == matcher.find_all(text)
+    assert [match.label for match in restricted] == ["blessing"]
+
+
+def test_prefers_the_longest_phrase_sharing_a_prefix() -> None:
+    matcher = PhraseMatcher({"x": ["сплет", "сплетни"]})
+
+    assert [match.text for match in matcher.find_all("одни сплетни")] == ["сплетни"]
+
+
+def test_compiled_matchers_are_cached_by_rule_content() -> None:
+    assert compile_phrase_matcher({"a": ["x"]}) is compile_phrase_matcher({"a": ["x"]})
+    assert compile_phrase_matcher({"a": ["x"]}) is not compile_phrase_matcher({"a": ["y"]})
+
+
+def test_rules_classifier_explains_only_violations() -> None:
+    classifier = HalachaRulesClassifier()
+
+    result = classifier.check_rules("Говорят что он плохой")
+    clean = classifier.check_rules("Шабат шалом")
+
+    assert result["violations"] == ["gossip", "slander"]
+    assert [match["phrase"] for match in result["matches"]] == ["говорят что", "он плохой"]
+    assert clean == {"violations": [], "matches": []}
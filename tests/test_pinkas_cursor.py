@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes.pinkas import _naive_utc, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_timestamp_and_id() -> None:
+    timestamp = datetime(2024, 3, 1, 12, 30, 15, 123456)
+    entry_id = uuid4()
+
+    cursor = encode_cursor(timestamp, entry_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, entry_id)
+
+
+def test_aware_cursor_and_bounds_become_naive_utc() -> None:
+    jerusalem = timezone(timedelta(hours=2))
+    aware = datetime(2024, 3, 1, 14, 0, tzinfo=jerusalem)
+    entry_id = uuid4()
+
+    timestamp, _ = decode_cursor(encode_cursor(aware, entry_id))
+
+    assert timestamp == datetime(2024, 3, 1, 12, 0)
+    assert timestamp.tzinfo is None
+    assert _naive_utc(aware) == datetime(2024, 3, 1, 12, 0)
+    assert _naive_utc(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(datetime(2024, 1, 1), uuid4())[:-4] + "!!!!"])
+def test_invalid_cursor_is_a_client_error(cursor: str) -> None:
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def test_keyset_pages_cover_every_row_once_in_order() -> None:
+    # Mirrors list_pinkas: ORDER BY (timestamp, id) DESC, seek with (timestamp, id) < cursor.
+    base = datetime(2024, 1, 1)
+    rows = [(base + timedelta(seconds=i // 3), UUID(int=i)) for i in range(20)]
+    ordered = sorted(rows, reverse=True)
+    limit = 4
+
+    seen: list[tuple[datetime, UUID]] = []
+    cursor = None
+    while True:
+        candidates = ordered if cursor is None else [row for row in ordered if row < decode_cursor(cursor)]
+        page = candidates[: limit + 1]
+        seen.extend(page[:limit])
+        if len(page) <= limit:
+            break
+        cursor = encode_cursor(*page[limit - 1])
+
+    assert seen == ordered
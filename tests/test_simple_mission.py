@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from app.agents.flows import simple_mission
+from app.agents.flows.simple_mission import FlowContext, SimpleMissionGraph
+from app.agents.protocols import AgentResponse
+
+
+def _context() -> FlowContext:
+    return FlowContext(mission_type="test", user_id=1, payload={}, primary_agent="scholar")
+
+
+@pytest.mark.anyio
+async def test_independent_nodes_overlap_and_dependents_wait() -> None:
+    events: list[str] = []
+    both_started = asyncio.Event()
+    started: set[str] = set()
+
+    def root(name: str):
+        async def handler(context: FlowContext) -> FlowContext:
+            events.append(f"{name}:start")
+            started.add(name)
+            if len(started) == 2:
+                both_started.set()
+            # Would time out if the roots ran one after the other.
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            events.append(f"{name}:end")
+            return context
+
+        return handler
+
+    async def join(context: FlowContext) -> FlowContext:
+        events.append("join")
+        return context
+
+    graph = SimpleMissionGraph()
+    graph.add_node("a", root("a"), depends_on=())
+    graph.add_node("b", root("b"), depends_on=())
+    graph.add_node("join", join, depends_on=("a", "b"))
+
+    context = await graph.run(_context())
+
+    assert events[-1] == "join"
+    assert {"a:end", "b:end"} <= set(events[:-1])
+    assert [entry["node"] for entry in context.timings][-1] == "join"
+    assert all(entry["status"] == "ok" for entry in context.timings)
+    assert context.history == []
+
+
+def test_add_node_defaults_to_linear_and_rejects_unknown_dependencies() -> None:
+    async def noop(context: FlowContext) -> FlowContext:
+        return context
+
+    graph = SimpleMissionGraph()
+    graph.add_node("first", noop)
+    graph.add_node("second", noop)
+
+    assert graph.nodes[1].depends_on == ("first",)
+    with pytest.raises(ValueError):
+        graph.add_node("third", noop, depends_on=("missing",))
+    with pytest.raises(ValueError):
+        graph.add_node("first", noop)
+
+
+@pytest.mark.anyio
+async def test_failure_cancels_siblings_and_skips_dependents() -> None:
+    sibling_cancelled = asyncio.Event()
+    dependent_ran = False
+
+    async def boom(context: FlowContext) -> FlowContext:
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def slow(context: FlowContext) -> FlowContext:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            sibling_cancelled.set()
+            raise
+        return context
+
+    async def dependent(context: FlowContext) -> FlowContext:
+        nonlocal dependent_ran
+        dependent_ran = True
+        return context
+
+    graph = SimpleMissionGraph()
+    graph.add_node("boom", boom, depends_on=(), retries=0)
+    graph.add_node("slow", slow, depends_on=())
+    graph.add_node("dependent", dependent, depends_on=("boom",))
+
+    context = _context()
+    with pytest.raises(RuntimeError, match="boom"):
+        await graph.run(context)
+
+    assert sibling_cancelled.is_set()
+    assert not dependent_ran
+    assert context.timings[0]["node"] == "boom"
+    assert context.timings[0]["status"] == "failed"
+
+
+class _FlakyAgent:
+    role = "tester"
+    dna: dict = {}
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+        self.pinkas: list[str] = []
+
+    async def run(self, request):  # noqa: ANN001
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("transient")
+        return AgentResponse(agent="flaky", result={"ok": True})
+
+    def log_to_pinkas(self, action: str, **_kwargs) -> None:  # noqa: ANN003
+        self.pinkas.append(action)
+
+
+@pytest.mark.anyio
+async def test_agent_retry_records_the_call_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    agent = _FlakyAgent(failures=1)
+    monkeypatch.setattr(simple_mission, "get_agent", lambda _name: agent)
+    monkeypatch.setattr(simple_mission, "MISSION_RETRY_BACKOFF", 0)
+    context = _context()
+
+    response = await simple_mission._call_agent("flaky", context, {}, "stage", retries=1)
+
+    assert response.result == {"ok": True}
+    assert agent.calls == 2
+    assert agent.pinkas == ["start", "complete"]
+    assert context.history == [{"stage": "stage", "agent": "flaky", "result": {"ok": True}}]
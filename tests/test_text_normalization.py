@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from langgraph_core.text import normalize_search_text, search_text_sql
+
+# Throwaway Postgres 13+ database; the comparison only runs SELECTs.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+SAMPLES = [
+    "שָׁלוֹם עֲלֵיכֶם",
+    "בְּרֵאשִׁ֖ית בָּרָ֣א",
+    "שׁשׂﭏ יִ",  # Hebrew presentation forms and the alef-lamed ligature
+    "ﬁsh Straße",  # Latin ligature and sharp s
+    "Он  СКАЗАЛ:\tמַה־טֹּבוּ",
+    " Ｆｕｌｌ width\n",
+    "",
+]
+
+
+def test_search_text_strips_marks_and_splits_compatibility_forms() -> None:
+    assert normalize_search_text("שָׁלוֹם") == normalize_search_text("שלום") == "שלום"
+    assert normalize_search_text("שׁﭏ") == "שאל"
+    assert normalize_search_text("ﬁsh Straße") == "fish straße"
+    assert normalize_search_text("  Ｆ b־c\n") == "f b c"
+    assert normalize_search_text(None) == ""
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+async def test_sql_expression_matches_python_normalization() -> None:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    statement = text(f"SELECT {search_text_sql('CAST(:value AS text)')}")
+    try:
+        async with engine.connect() as conn:
+            for sample in SAMPLES:
+                result = await conn.execute(statement, {"value": sample})
+                assert result.scalar_one() == normalize_search_text(sample), sample
+    finally:
+        await engine.dispose()